@@ -0,0 +1,7 @@
+"""
+benchmarks
+Reproducible benchmarks of the hot paths of the game (python -m benchmarks)
+"""
+
+from .cases import BENCHMARKS
+from .harness import BenchmarkResult, compare_results, load_results, measure, run_benchmarks, save_results
@@ -0,0 +1,75 @@
+"""
+benchmarks/__main__.py
+Command line of the benchmark suite
+
+    python -m benchmarks run [--output results.json] [--only NAME ...]
+    python -m benchmarks compare base.json current.json [--threshold 0.10]
+    python -m benchmarks list
+"""
+
+import argparse
+import sys
+
+from benchmarks.cases import BENCHMARKS
+from benchmarks.harness import (DEFAULT_THRESHOLD, compare_results, format_comparison, load_results,
+                                run_benchmarks, save_results)
+
+
+def main(argv=None):
+    """
+    Run the command line
+
+    Returns:
+        int: Exit code (1 if the comparison finds a regression)
+    """
+    parser = argparse.ArgumentParser(prog="python -m benchmarks",
+                                     description="Benchmarks of the battle, IA, generator and save hot paths")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    run_parser = commands.add_parser("run", help="run the benchmarks")
+    run_parser.add_argument("--output", help="JSON file of the results")
+    run_parser.add_argument("--only", nargs="+", metavar="NAME", help="benchmarks to run (default: all)")
+    run_parser.add_argument("--repeat", type=int, default=5, help="timed repeats per benchmark")
+    run_parser.add_argument("--min-time", type=float, default=0.1, help="minimum seconds per repeat")
+    run_parser.add_argument("--seed", type=int, default=42)
+
+    compare_parser = commands.add_parser("compare", help="compare two JSON results")
+    compare_parser.add_argument("base", help="reference results")
+    compare_parser.add_argument("current", help="new results")
+    compare_parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD,
+                                help="relative slowdown flagged as a regression (default: 0.10)")
+
+    commands.add_parser("list", help="list the benchmarks")
+
+    args = parser.parse_args(argv)
+
+    if args.command == "list":
+        for name, case in BENCHMARKS.items():
+            print(f"{name:<30}{case.__doc__.strip()}")
+        return 0
+
+    if args.command == "run":
+        try:
+            results = run_benchmarks(args.only, args.repeat, args.min_time, args.seed)
+        except ValueError as e:
+            parser.error(str(e))
+        if args.output:
+            save_results(results, args.output)
+            print(f"\nResults written to {args.output}")
+        return 0
+
+    try:
+        rows = compare_results(load_results(args.base), load_results(args.current), args.threshold)
+    except (OSError, ValueError) as e:
+        parser.error(str(e))
+
+    print(format_comparison(rows))
+    regressions = [row[0] for row in rows if row[4] == 'regression']
+    if regressions:
+        print(f"\n{len(regressions)} regression(s) over {args.threshold:.0%}: {', '.join(regressions)}")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
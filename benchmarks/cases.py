@@ -0,0 +1,165 @@
+"""
+benchmarks/cases.py
+The benchmarked hot paths of the game
+
+A case is a context manager taking a seed: it builds everything the
+measured code needs, yields the function timed by the harness (no
+argument, one call = one operation) and cleans up when the measure ends.
+"""
+
+import contextlib
+import io
+import os
+import random
+import shutil
+import tempfile
+
+from fighting.fighting_system import FightingSystem
+from my_package.models.battle_ai import ExpectimaxAI
+from my_package.models.pokemon import PokemonFactory, PokemonGenerator
+from my_package.models.pokemon_pool import PokemonPool
+from my_package.models.trainer import Champion, Trainer
+from utils.save_system import SaveSystem
+
+
+# Name -> case, in the order of the report
+BENCHMARKS = {}
+
+PLAYER_TEAM = (("Salamèche", 20), ("Carapuce", 20), ("Bulbizarre", 20))
+CHAMPION_TEAM = (("Chétiflor", 21), ("Poissirène", 21), ("Goupix", 21))
+
+
+def benchmark(name):
+    """Register a generator function as the case 'name'"""
+    def register(case):
+        BENCHMARKS[name] = contextlib.contextmanager(case)
+        return case
+    return register
+
+
+def _trainer(name, team, type_affinity=None):
+    trainer = Trainer(name) if type_affinity is None else Champion(name, type_affinity)
+    for species, level in team:
+        trainer.add_pokemon(PokemonFactory.create_species(species, level))
+    return trainer
+
+
+def _reset(trainer):
+    for pokemon in trainer.team:
+        pokemon.heal()
+    trainer.active_pokemon = trainer.team[0]
+
+
+@benchmark("attack_pokemon")
+def attack_pokemon(seed):
+    """One Pokemon.attack_pokemon call (the target is healed when KO)"""
+    rng = random.Random(seed)
+    attacker = PokemonFactory.create_species("Salamèche", 20)
+    target = PokemonFactory.create_species("Chétiflor", 20)
+
+    def run():
+        attacker.attack_pokemon(target, rng)
+        if target.ko:
+            target.heal()
+
+    yield run
+
+
+@benchmark("fight_headless")
+def fight_headless(seed):
+    """A full headless fight of two teams of three Pokemon"""
+    rng = random.Random(seed)
+    player = _trainer("Sacha", PLAYER_TEAM)
+    champion = _trainer("Erika", CHAMPION_TEAM, "Plant")
+
+    def run():
+        _reset(player)
+        _reset(champion)
+        FightingSystem.headless(player, champion, max_turns=200, rng=rng, apply_experience=False).start()
+
+    yield run
+
+
+@benchmark("choose_action_ia")
+def choose_action_ia(seed):
+    """One decision of the simple champion IA, at a type disadvantage"""
+    champion = _trainer("Erika", CHAMPION_TEAM, "Plant")
+    adversary = PokemonFactory.create_species("Salamèche", 20)
+
+    def run():
+        champion.choose_action_ia(adversary)
+
+    yield run
+
+
+@benchmark("choose_action_ia_expectimax")
+def choose_action_ia_expectimax(seed):
+    """One decision of a new ExpectimaxAI (depth 3, no time budget)"""
+    champion = _trainer("Erika", CHAMPION_TEAM, "Plant")
+    adversary = PokemonFactory.create_species("Salamèche", 20)
+
+    def run():
+        # A new IA per decision: the transposition table starts empty
+        champion.ai = ExpectimaxAI(max_depth=3, time_budget=60.0)
+        champion.choose_action_ia(adversary)
+
+    yield run
+
+
+@benchmark("generate_wild_pokemon")
+def generate_wild_pokemon(seed):
+    """One PokemonGenerator.generate_wild_pokemon call"""
+    rng = random.Random(seed)
+
+    def run():
+        PokemonGenerator.generate_wild_pokemon(15, rng)
+
+    yield run
+
+
+@benchmark("generate_wild_pokemon_pooled")
+def generate_wild_pokemon_pooled(seed):
+    """One generate_wild_pokemon call recycling the Pokemon through a PokemonPool"""
+    rng = random.Random(seed)
+    pool = PokemonPool()
+
+    def run():
+        pool.release(PokemonGenerator.generate_wild_pokemon(15, rng, pool=pool))
+
+    yield run
+
+
+@contextlib.contextmanager
+def _save_directory():
+    """Point SaveSystem to a temporary directory and silence its messages"""
+    saved_paths = (SaveSystem.SAVE_DIR, SaveSystem.SAVE_FILE, SaveSystem.JOURNAL_FILE)
+    directory = tempfile.mkdtemp(prefix="pokemon_bench_")
+    SaveSystem.SAVE_DIR = directory
+    SaveSystem.SAVE_FILE = os.path.join(directory, "game_save.json")
+    SaveSystem.JOURNAL_FILE = os.path.join(directory, "game_save.journal")
+    try:
+        with contextlib.redirect_stdout(io.StringIO()):
+            yield
+    finally:
+        SaveSystem.SAVE_DIR, SaveSystem.SAVE_FILE, SaveSystem.JOURNAL_FILE = saved_paths
+        shutil.rmtree(directory, ignore_errors=True)
+
+
+def _full_player():
+    return _trainer("Sacha", PLAYER_TEAM + CHAMPION_TEAM)
+
+
+@benchmark("save_game")
+def save_game(seed):
+    """One SaveSystem.save_game of a team of six (JSON snapshot, atomic write)"""
+    player = _full_player()
+    with _save_directory():
+        yield lambda: SaveSystem.save_game(player, [])
+
+
+@benchmark("load_game")
+def load_game(seed):
+    """One SaveSystem.load_game of a team of six"""
+    with _save_directory():
+        SaveSystem.save_game(_full_player(), [])
+        yield SaveSystem.load_game
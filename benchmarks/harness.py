@@ -0,0 +1,259 @@
+"""
+benchmarks/harness.py
+Timing of the cases, JSON results and comparison of two runs
+
+The measure follows timeit: the garbage collector is disabled while a
+case runs, the number of loops grows until one repeat lasts min_time,
+then several repeats are timed. The best repeat is the reference (the
+least disturbed by the rest of the machine), the median shows the noise.
+"""
+
+import gc
+import json
+import platform
+import statistics
+import sys
+import time
+from datetime import datetime
+
+from benchmarks.cases import BENCHMARKS
+
+
+FORMAT_VERSION = 1
+
+# Relative slowdown of the best time flagged as a regression
+DEFAULT_THRESHOLD = 0.10
+
+
+class BenchmarkResult:
+    """
+    Timings of one case
+
+    Attributes:
+        name (str): Name of the case
+        loops (int): Calls per repeat
+        timings (list): Seconds per call of each repeat
+    """
+
+    def __init__(self, name, loops, timings):
+        self.name = name
+        self.loops = loops
+        self.timings = list(timings)
+
+    @property
+    def best(self):
+        return min(self.timings)
+
+    @property
+    def median(self):
+        return statistics.median(self.timings)
+
+    @property
+    def stdev(self):
+        return statistics.stdev(self.timings) if len(self.timings) > 1 else 0.0
+
+    def to_dict(self):
+        return {
+            'loops': self.loops,
+            'timings': self.timings,
+            'best': self.best,
+            'median': self.median,
+            'stdev': self.stdev
+        }
+
+    @classmethod
+    def from_dict(cls, name, data):
+        return cls(name, data['loops'], data['timings'])
+
+    def __str__(self):
+        return (f"{self.name:<30}{_format_time(self.best):>12}{_format_time(self.median):>12}"
+                f"{_format_time(self.stdev):>12}{self.loops:>10}")
+
+
+def _format_time(seconds):
+    """Time with the unit that fits (ns, us, ms, s)"""
+    for unit, scale in (('ns', 1e9), ('us', 1e6), ('ms', 1e3)):
+        if seconds * scale < 1000:
+            return f"{seconds * scale:.1f} {unit}"
+    return f"{seconds:.2f} s"
+
+
+def _time_loops(function, loops):
+    """Seconds taken by loops calls of function"""
+    start = time.perf_counter()
+    for _ in range(loops):
+        function()
+    return time.perf_counter() - start
+
+
+def measure(name, function, repeat=5, min_time=0.1):
+    """
+    Time a function
+
+    Args:
+        name (str): Name of the result
+        function (callable): Function without arguments, one call = one operation
+        repeat (int): Number of timed repeats
+        min_time (float): Minimum duration of a repeat in seconds
+
+    Returns:
+        BenchmarkResult: Seconds per call of each repeat
+    """
+    gc_enabled = gc.isenabled()
+    gc.disable()
+    try:
+        # Calibration, which also warms up the caches (catalog, tables...)
+        loops = 1
+        while True:
+            elapsed = _time_loops(function, loops)
+            if elapsed >= min_time:
+                break
+            loops = loops * 10 if elapsed < min_time / 10 else loops * 2
+
+        timings = [_time_loops(function, loops) / loops for _ in range(repeat)]
+    finally:
+        if gc_enabled:
+            gc.enable()
+
+    return BenchmarkResult(name, loops, timings)
+
+
+def run_benchmarks(names=None, repeat=5, min_time=0.1, seed=42, verbose=True):
+    """
+    Run cases of the suite
+
+    Args:
+        names (list): Names of the cases to run (default: all of them)
+        repeat (int): Timed repeats per case
+        min_time (float): Minimum duration of a repeat in seconds
+        seed (int): Seed of the random generators of the cases
+        verbose (bool): Print each result when it is measured
+
+    Returns:
+        dict: Results, see save_results
+
+    Raises:
+        ValueError: If a case is unknown
+    """
+    names = list(names or BENCHMARKS)
+    unknown = [name for name in names if name not in BENCHMARKS]
+    if unknown:
+        raise ValueError(f"Unknown benchmarks: {', '.join(unknown)}")
+
+    if verbose:
+        print(f"{'Benchmark':<30}{'Best':>12}{'Median':>12}{'Stdev':>12}{'Loops':>10}")
+        print(f"{'-'*76}")
+
+    results = {}
+    for name in names:
+        with BENCHMARKS[name](seed) as function:
+            result = measure(name, function, repeat, min_time)
+        results[name] = result
+        if verbose:
+            print(result)
+
+    return {
+        'version': FORMAT_VERSION,
+        'metadata': {
+            'python': sys.version.split()[0],
+            'implementation': platform.python_implementation(),
+            'platform': platform.platform(),
+            'timestamp': datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+            'seed': seed,
+            'repeat': repeat,
+            'min_time': min_time
+        },
+        'benchmarks': {name: result.to_dict() for name, result in results.items()}
+    }
+
+
+def save_results(results, path):
+    """
+    Write results in a JSON file
+
+    Args:
+        results (dict): Results of run_benchmarks
+        path (str): JSON file
+    """
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(results, f, indent=2)
+
+
+def load_results(path):
+    """
+    Read results written by save_results
+
+    Args:
+        path (str): JSON file
+
+    Returns:
+        dict: Results
+
+    Raises:
+        ValueError: If the file is not a benchmark result
+    """
+    with open(path, 'r', encoding='utf-8') as f:
+        results = json.load(f)
+    if not isinstance(results, dict) or results.get('version') != FORMAT_VERSION or 'benchmarks' not in results:
+        raise ValueError(f"{path} is not a benchmark result of version {FORMAT_VERSION}")
+    return results
+
+
+def compare_results(base, current, threshold=DEFAULT_THRESHOLD):
+    """
+    Compare the best times of two runs
+
+    Args:
+        base (dict): Reference results
+        current (dict): New results
+        threshold (float): Relative slowdown flagged as a regression (0.10 = 10%)
+
+    Returns:
+        list: Tuples (name, base best, current best, ratio, status), status is
+            'regression', 'improvement', 'same', 'new' or 'missing'. Times are
+            None for a case missing in one of the runs.
+    """
+    rows = []
+    base_cases = base['benchmarks']
+    current_cases = current['benchmarks']
+
+    for name in list(base_cases) + [name for name in current_cases if name not in base_cases]:
+        if name not in current_cases:
+            rows.append((name, base_cases[name]['best'], None, None, 'missing'))
+            continue
+        if name not in base_cases:
+            rows.append((name, None, current_cases[name]['best'], None, 'new'))
+            continue
+
+        base_best = base_cases[name]['best']
+        current_best = current_cases[name]['best']
+        ratio = current_best / base_best
+        if ratio > 1 + threshold:
+            status = 'regression'
+        elif ratio < 1 / (1 + threshold):
+            status = 'improvement'
+        else:
+            status = 'same'
+        rows.append((name, base_best, current_best, ratio, status))
+
+    return rows
+
+
+def format_comparison(rows):
+    """
+    Text table of a comparison
+
+    Args:
+        rows (list): Rows of compare_results
+
+    Returns:
+        str: The table
+    """
+    lines = [f"{'Benchmark':<30}{'Base':>12}{'Current':>12}{'Ratio':>10}  Status",
+             f"{'-'*76}"]
+    for name, base_best, current_best, ratio, status in rows:
+        base_text = _format_time(base_best) if base_best is not None else '-'
+        current_text = _format_time(current_best) if current_best is not None else '-'
+        ratio_text = f"x{ratio:.2f}" if ratio is not None else '-'
+        lines.append(f"{name:<30}{base_text:>12}{current_text:>12}{ratio_text:>10}  {status}")
+    return "\n".join(lines)
@@ -1 +1,7 @@
-from .fighting_system import FightingSystem
\ No newline at end of file
+from .fighting_system import FightingSystem
+from .policies import ConsolePolicy, AttackPolicy, ChampionPolicy
+from .events import ExperienceCalculator, FightEvent, FightStatistics
+from .renderers import ConsoleRenderer, NullRenderer
+from .replay import BattleRecorder, read_fights
+from .training import TrainingReport, auto_train
+from .profiling import FightProfiler
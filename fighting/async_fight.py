@@ -0,0 +1,77 @@
+"""
+fighting/async_fight.py
+Fights whose policies wait for their decisions without blocking (asyncio)
+"""
+
+import inspect
+
+from fighting.fighting_system import FightingSystem
+
+
+async def _decision(value):
+    """Value of a policy method: awaited if the policy is asynchronous"""
+    if inspect.isawaitable(value):
+        return await value
+    return value
+
+
+class AsyncFightingSystem(FightingSystem):
+    """
+    Fight played by a coroutine: the policies may be asynchronous
+
+    The rules are the ones of FightingSystem, only the points where a
+    policy decides (action of each turn, Pokemon sent after a KO) are
+    awaited. A policy method may return a value (ChampionPolicy,
+    AttackPolicy...) or an awaitable, e.g. a policy reading the choice of a
+    player from a network connection: thousands of fights can then wait for
+    their players in one thread.
+
+    Use play() instead of start().
+    """
+
+    async def play(self):
+        """
+        Play the fight until it is over
+
+        Returns:
+            bool: True if trainer1 wins, False otherwise
+        """
+        self._begin()
+
+        while self.ongoing:
+            self.current_turn += 1
+            await self._execute_turn_async()
+            self._check_end()
+
+        return self.winner is self.trainer1
+
+    async def _execute_turn_async(self):
+        """Execute a complete turn of the fight (see FightingSystem._execute_turn)"""
+        self._turn_started()
+
+        action1 = self._action_chosen(
+            await _decision(self.player_policy.choose_action(self, self.trainer1, self.trainer2)))
+        if action1['type'] == 'flee':
+            self._flee_fight(self.trainer1)
+            return
+
+        action2 = self._action_chosen(
+            await _decision(self.adversary_policy.choose_action(self, self.trainer2, self.trainer1)))
+
+        for action in self._order_actions(action1, action2):
+            if not self.ongoing:
+                break
+
+            if action['type'] == 'attack':
+                trainer = action['trainer']
+                adversary = self.trainer2 if trainer == self.trainer1 else self.trainer1
+                result = self._attack(trainer, adversary)
+                if result is None:
+                    continue
+
+                if result.target_knocked_out and not adversary.team_ko():
+                    self._replacement_required(adversary)
+                    index = await _decision(self._policy_of(adversary).choose_replacement(self, adversary))
+                    self._send_replacement(adversary, index)
+
+        self._turn_ended()
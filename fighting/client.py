@@ -0,0 +1,185 @@
+"""
+fighting/client.py
+Client of the battle server: interactive terminal or scripted bots
+
+    python -m fighting.client --port 8765              play in the terminal
+    python -m fighting.client --port 8765 --bots 1000  load test with bots
+"""
+
+import asyncio
+import time
+
+
+class BattleClient:
+    """
+    Connection to a BattleServer speaking its line protocol (see fighting.server)
+
+    Attributes:
+        messages (list): MSG and ERR lines received since the last prompt
+    """
+
+    def __init__(self, reader, writer):
+        self._reader = reader
+        self._writer = writer
+        self.messages = []
+
+    @classmethod
+    async def connect(cls, host='127.0.0.1', port=8765, path=None):
+        """
+        Open a connection to a server
+
+        Args:
+            host (str): Address of the server
+            port (int): TCP port of the server
+            path (str): Unix socket of the server (instead of TCP)
+
+        Returns:
+            BattleClient: The connected client
+        """
+        if path is not None:
+            reader, writer = await asyncio.open_unix_connection(path)
+        else:
+            reader, writer = await asyncio.open_connection(host, port)
+        return cls(reader, writer)
+
+    async def next_prompt(self):
+        """
+        Read the lines of the server until it asks something
+
+        Returns:
+            str: The prompt, None when the server has closed the session
+                (the messages received are in self.messages)
+        """
+        self.messages = []
+        while True:
+            line = await self._reader.readline()
+            if not line:
+                return None
+            kind, _, text = line.decode('utf-8').rstrip('\n').partition(' ')
+            if kind == 'ASK':
+                return text
+            self.messages.append(f"{kind} {text}")
+            if kind == 'BYE':
+                return None
+
+    async def answer(self, line):
+        """Send the answer to the last prompt"""
+        self._writer.write(f"{line}\n".encode('utf-8'))
+        await self._writer.drain()
+
+    async def close(self):
+        self._writer.close()
+        try:
+            await self._writer.wait_closed()
+        except ConnectionError:
+            pass
+
+
+async def play_bot(client, name, challenges=3, wild_fights=2):
+    """
+    Play a scripted game: starter 1, a few wild fights, then the arenas
+
+    The bot attacks every turn and lets the server send the first Pokemon
+    able to fight after a KO.
+
+    Args:
+        client (BattleClient): Connected client
+        name (str): Name of the bot
+        challenges (int): Number of arena challenges
+        wild_fights (int): Number of wild fights before the arenas
+
+    Returns:
+        int: Number of prompts answered
+    """
+    commands = ['train'] * wild_fights + [f"challenge {1 + i % 3}" for i in range(challenges)] + ['quit']
+    answers = 0
+
+    while True:
+        prompt = await client.next_prompt()
+        if prompt is None:
+            return answers
+
+        kind = prompt.split(' ', 1)[0]
+        if kind == 'name':
+            await client.answer(name)
+        elif kind == 'starter':
+            await client.answer('1')
+        elif kind == 'menu':
+            await client.answer(commands.pop(0) if commands else 'quit')
+        elif kind == 'action':
+            await client.answer('attack')
+        elif kind == 'catch':
+            await client.answer('skip')
+        else:
+            await client.answer('')
+        answers += 1
+
+
+async def run_bots(n_bots, host='127.0.0.1', port=8765, path=None, challenges=3, wild_fights=2):
+    """
+    Play n_bots scripted games at the same time against a server
+
+    Args:
+        n_bots (int): Number of concurrent connections
+        host (str): Address of the server
+        port (int): TCP port of the server
+        path (str): Unix socket of the server (instead of TCP)
+        challenges (int): Arena challenges per bot
+        wild_fights (int): Wild fights per bot
+
+    Returns:
+        dict: sessions, answers (prompts answered in total), elapsed (seconds)
+    """
+    async def one_bot(number):
+        client = await BattleClient.connect(host, port, path)
+        try:
+            return await play_bot(client, f"Bot{number}", challenges, wild_fights)
+        finally:
+            await client.close()
+
+    start = time.perf_counter()
+    answers = await asyncio.gather(*(one_bot(number) for number in range(n_bots)))
+    return {'sessions': n_bots, 'answers': sum(answers), 'elapsed': time.perf_counter() - start}
+
+
+async def play_terminal(client):
+    """Play in the terminal: display the messages, ask each prompt with input()"""
+    loop = asyncio.get_running_loop()
+    while True:
+        prompt = await client.next_prompt()
+        for message in client.messages:
+            print(message.partition(' ')[2])
+        if prompt is None:
+            return
+        # input() blocks: it runs in a thread so the connection stays served
+        await client.answer(await loop.run_in_executor(None, input, f"\n➤ {prompt} : "))
+
+
+def main():
+    """Connect to a battle server"""
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Client of the battle server")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--unix", help="path of the Unix socket of the server")
+    parser.add_argument("--bots", type=int, help="play N scripted games at the same time")
+    args = parser.parse_args()
+
+    async def run():
+        if args.bots:
+            result = await run_bots(args.bots, args.host, args.port, args.unix)
+            print(f"{result['sessions']} sessions, {result['answers']} answers in {result['elapsed']:.2f}s")
+            return
+
+        client = await BattleClient.connect(args.host, args.port, args.unix)
+        try:
+            await play_terminal(client)
+        finally:
+            await client.close()
+
+    asyncio.run(run())
+
+
+if __name__ == "__main__":
+    main()
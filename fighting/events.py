@@ -0,0 +1,300 @@
+"""
+fighting/events.py
+Events published by a fight, and the subscribers computing the statistics
+and the experience from them
+
+A subscriber is any object with a handler for some events: on_hit(fight,
+event), on_ko(fight, event)... (see the handler of each event). The fight
+only builds the events that have at least one subscriber, so a headless
+fight without subscriber runs the rules alone.
+"""
+
+
+class FightEvent:
+    """
+    Base class of the events of a fight
+
+    Every event carries the turn it happened in, so a batched subscriber
+    (receiving the events once the fight is over) reads the same values.
+
+    Attributes:
+        handler (str): Name of the method of the subscribers receiving the event
+        turn (int): Turn of the fight, 0 before the first turn
+    """
+
+    __slots__ = ('turn',)
+    handler = None
+
+
+class FightStarted(FightEvent):
+    """The trainers have their first Pokemon out, the fight begins"""
+
+    __slots__ = ()
+    handler = 'on_fight_started'
+
+    def __init__(self, turn):
+        self.turn = turn
+
+
+class TurnStarted(FightEvent):
+    """A new turn begins"""
+
+    __slots__ = ()
+    handler = 'on_turn_started'
+
+    def __init__(self, turn):
+        self.turn = turn
+
+
+class ActionChosen(FightEvent):
+    """
+    A trainer has chosen its action (a change of Pokemon is already made)
+
+    Attributes:
+        trainer (Trainer): Trainer who acts
+        action (dict): Action of the trainer ('type', 'trainer', 'index' for a change)
+    """
+
+    __slots__ = ('trainer', 'action')
+    handler = 'on_action_chosen'
+
+    def __init__(self, turn, trainer, action):
+        self.turn = turn
+        self.trainer = trainer
+        self.action = action
+
+
+class AttackResolved(FightEvent):
+    """
+    Base class of Hit and Miss
+
+    Attributes:
+        attacker_trainer (Trainer): Trainer of the attacker
+        defender_trainer (Trainer): Trainer of the target
+        result (AttackResult): Result of the attack (attacker, target, damage...)
+    """
+
+    __slots__ = ('attacker_trainer', 'defender_trainer', 'result')
+
+    def __init__(self, turn, attacker_trainer, defender_trainer, result):
+        self.turn = turn
+        self.attacker_trainer = attacker_trainer
+        self.defender_trainer = defender_trainer
+        self.result = result
+
+
+class Hit(AttackResolved):
+    """An attack has hit its target"""
+
+    __slots__ = ()
+    handler = 'on_hit'
+
+
+class Miss(AttackResolved):
+    """An attack has missed its target"""
+
+    __slots__ = ()
+    handler = 'on_miss'
+
+
+class KO(FightEvent):
+    """
+    A Pokemon is knocked out
+
+    Attributes:
+        trainer (Trainer): Trainer of the KO Pokemon
+        pokemon (Pokemon): KO Pokemon
+        attacker (Pokemon): Pokemon who knocked it out
+    """
+
+    __slots__ = ('trainer', 'pokemon', 'attacker')
+    handler = 'on_ko'
+
+    def __init__(self, turn, trainer, pokemon, attacker):
+        self.turn = turn
+        self.trainer = trainer
+        self.pokemon = pokemon
+        self.attacker = attacker
+
+
+class ExperienceGained(FightEvent):
+    """
+    A Pokemon has won experience (applied when the fight ends)
+
+    Attributes:
+        pokemon (Pokemon): Pokemon who won the experience
+        experience (int): Experience points won
+    """
+
+    __slots__ = ('pokemon', 'experience')
+    handler = 'on_experience_gained'
+
+    def __init__(self, turn, pokemon, experience):
+        self.turn = turn
+        self.pokemon = pokemon
+        self.experience = experience
+
+
+class ReplacementRequired(FightEvent):
+    """
+    A trainer must send another Pokemon after a KO (before its policy chooses)
+
+    Attributes:
+        trainer (Trainer): Trainer who must change
+    """
+
+    __slots__ = ('trainer',)
+    handler = 'on_replacement_required'
+
+    def __init__(self, turn, trainer):
+        self.turn = turn
+        self.trainer = trainer
+
+
+class Switch(FightEvent):
+    """
+    A trainer has a new active Pokemon
+
+    Attributes:
+        trainer (Trainer): Trainer who changed
+        pokemon (Pokemon): New active Pokemon
+        forced (bool): The change replaces a KO Pokemon
+        automatic (bool): The fight sent the first Pokemon able to fight
+            (the policy chose none or an invalid one)
+    """
+
+    __slots__ = ('trainer', 'pokemon', 'forced', 'automatic')
+    handler = 'on_switch'
+
+    def __init__(self, turn, trainer, pokemon, forced=False, automatic=False):
+        self.turn = turn
+        self.trainer = trainer
+        self.pokemon = pokemon
+        self.forced = forced
+        self.automatic = automatic
+
+
+class TurnEnded(FightEvent):
+    """The actions of the turn are resolved"""
+
+    __slots__ = ()
+    handler = 'on_turn_ended'
+
+    def __init__(self, turn):
+        self.turn = turn
+
+
+class LevelUp(FightEvent):
+    """
+    A Pokemon has grown with the experience of the fight
+
+    Attributes:
+        pokemon (Pokemon): Pokemon who grew
+        levels (int): Levels gained
+    """
+
+    __slots__ = ('pokemon', 'levels')
+    handler = 'on_level_up'
+
+    def __init__(self, turn, pokemon, levels):
+        self.turn = turn
+        self.pokemon = pokemon
+        self.levels = levels
+
+
+class FightEnded(FightEvent):
+    """
+    The fight is over
+
+    Attributes:
+        winner (Trainer): Winner of the fight, None for a draw or a flight
+        fled (Trainer): Trainer who fled, None otherwise
+    """
+
+    __slots__ = ('winner', 'fled')
+    handler = 'on_fight_ended'
+
+    def __init__(self, turn, winner, fled=None):
+        self.turn = turn
+        self.winner = winner
+        self.fled = fled
+
+
+# Every event a fight can publish
+EVENTS = (FightStarted, TurnStarted, ActionChosen, Hit, Miss, KO, ExperienceGained, ReplacementRequired, Switch,
+          TurnEnded, LevelUp, FightEnded)
+
+
+class FightStatistics:
+    """
+    Subscriber counting the damage, hits, misses and KOs of each side
+
+    Attributes:
+        damage (list): Damage inflicted by trainer1 and trainer2
+        hits (list): Attacks of each side that hit
+        misses (list): Attacks of each side that missed
+        knockouts (list): Pokemon knocked out by each side
+    """
+
+    def __init__(self):
+        self.reset()
+
+    def reset(self):
+        self.damage = [0, 0]
+        self.hits = [0, 0]
+        self.misses = [0, 0]
+        self.knockouts = [0, 0]
+
+    def on_fight_started(self, fight, event):
+        self.reset()
+
+    def on_hit(self, fight, event):
+        side = 0 if event.attacker_trainer is fight.trainer1 else 1
+        self.damage[side] += event.result.damage
+        self.hits[side] += 1
+
+    def on_miss(self, fight, event):
+        self.misses[0 if event.attacker_trainer is fight.trainer1 else 1] += 1
+
+    def on_ko(self, fight, event):
+        self.knockouts[1 if event.trainer is fight.trainer1 else 0] += 1
+
+
+class ExperienceCalculator:
+    """
+    Subscriber giving experience for each KO and the levels at the end of the fight
+
+    The experience is counted in fight.experience_gained at each KO and
+    applied once to the team of trainer1 when the fight ends, so every
+    Pokemon levels up (and reads its growth table) once per fight. The
+    levels gained are stored in fight.levels_gained.
+    """
+
+    @staticmethod
+    def experience_for(defeated_pokemon):
+        """
+        Calculate the experience gained after defeating a Pokemon
+
+        Args:
+            defeated_pokemon (Pokemon): Defeated Pokemon
+
+        Returns:
+            int: Experience points gained after defeating a Pokemon
+        """
+        # Simple formula: level of the defeated Pokemon * 10
+        return defeated_pokemon.level * 10
+
+    def on_ko(self, fight, event):
+        experience = self.experience_for(event.pokemon)
+        fight.experience_gained[event.attacker] = fight.experience_gained.get(event.attacker, 0) + experience
+        fight.publish(ExperienceGained(event.turn, event.attacker, experience))
+
+    def on_fight_ended(self, fight, event):
+        for pokemon in fight.trainer1.team:
+            experience = fight.experience_gained.get(pokemon)
+            if not experience:
+                continue
+            levels = pokemon.gain_experience(experience)
+            if levels:
+                fight.levels_gained[pokemon] = levels
+                fight.publish(LevelUp(event.turn, pokemon, levels))
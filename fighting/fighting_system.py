@@ -1,263 +1,347 @@
-import time
 import random
 
+from fighting.events import (EVENTS, KO, ActionChosen, ExperienceCalculator, FightEnded, FightStarted,
+                             FightStatistics, Hit, Miss, ReplacementRequired, Switch, TurnEnded, TurnStarted)
+from fighting.policies import ConsolePolicy, AttackPolicy, ChampionPolicy
+from fighting.renderers import ConsoleRenderer, NullRenderer
+
 
 class FightingSystem:
     """
     Class managing a Pokemon fight turn by turn
-    
+
+    The actions of each trainer come from a policy (stdin, IA, scripted...).
+    The rules publish what happens as events (see fighting.events) and
+    everything else subscribes to them: the renderer, the statistics, the
+    replay recorder and the experience. An event is only built when it has
+    a subscriber, so a headless fight runs the rules alone (no input, no
+    print, no sleep, no bookkeeping).
+
     Attributes:
         trainer1 (Trainer): First trainer (generally the player)
         trainer2 (Trainer): Second trainer (adversary/champion)
+        player_policy: Policy choosing the actions of trainer1
+        adversary_policy: Policy choosing the actions of trainer2
+        renderer: Renderer displaying the fight
+        max_turns (int): Number of turns before a draw, None for no limit
+        rng (random.Random): Random generator of the fight
+        recorder (BattleRecorder): Replay log receiving every step, None for no log
+        statistics (FightStatistics): Damage, hits, misses and KOs of each side, None if not counted
+        profiler (FightProfiler): Profiler timing the phases, None for no profiling
         current_turn (int): Number of the current turn
         ongoing (bool): State of the fight
+        winner (Trainer): Winner once the fight is over, None for a draw
+        experience_gained (dict): Experience won during the fight by each Pokemon
+        apply_experience (bool): Give the experience to the Pokemon of trainer1 at the end
+        levels_gained (dict): Levels gained at the end of the fight by each Pokemon of trainer1
     """
-    
-    def __init__(self, trainer1, trainer2):
+
+    def __init__(self, trainer1, trainer2, player_policy=None, adversary_policy=None,
+                 renderer=None, max_turns=None, rng=None, recorder=None, apply_experience=True, profiler=None,
+                 statistics=True):
         """
         Initialize a fight between two trainers
-        
+
         Args:
             trainer1 (Trainer): First trainer (player)
             trainer2 (Trainer): Second trainer (adversary)
+            player_policy: Policy of trainer1 (default: ConsolePolicy)
+            adversary_policy: Policy of trainer2 (default: ChampionPolicy)
+            renderer: Renderer of the fight (default: ConsoleRenderer)
+            max_turns (int): Number of turns before a draw, None for no limit
+            rng (random.Random): Random generator of the fight, give a seeded one
+                to replay a fight (default: random module)
+            recorder (BattleRecorder): Replay log of the fight (see fighting.replay)
+            apply_experience (bool): Count the experience won and give it to the
+                Pokemon of trainer1 when the fight ends (False to replay the same
+                team several times)
+            profiler (FightProfiler): Time the phases of the fight (see fighting.profiling)
+            statistics (bool): Count the damage, hits, misses and KOs of each side
         """
         self.trainer1 = trainer1
         self.trainer2 = trainer2
+        self.player_policy = player_policy or ConsolePolicy()
+        self.adversary_policy = adversary_policy or ChampionPolicy()
+        self.renderer = renderer or ConsoleRenderer()
+        self.max_turns = max_turns
+        self.rng = rng or random
+        self.recorder = recorder
         self.current_turn = 0
         self.ongoing = False
-        
-        # Fight statistics
-        self.total_damage_trainer1 = 0
-        self.total_damage_trainer2 = 0
+        self.winner = None
+        self.experience_gained = {}
+        self.apply_experience = apply_experience
+        self.levels_gained = {}
+
+        # Handlers of each event type, and the events kept for the batched subscribers
+        self._handlers = {event_type: [] for event_type in EVENTS}
+        self._subscriptions = {}
+        self._batches = {}
+
+        # The handlers run in the order of subscription: the renderer displays
+        # a KO before the experience it gives
+        self.subscribe(self.renderer)
+        self.statistics = FightStatistics() if statistics else None
+        if self.statistics is not None:
+            self.subscribe(self.statistics)
+        if recorder is not None:
+            self.subscribe(recorder)
+        if apply_experience:
+            self.subscribe(ExperienceCalculator())
+
+        # The profiler replaces the phases of this fight only, a fight without
+        # profiler calls the plain methods
+        self.profiler = profiler
+        if profiler is not None:
+            profiler.instrument(self)
+
+    @classmethod
+    def headless(cls, trainer1, trainer2, player_policy=None, adversary_policy=None, max_turns=None, rng=None,
+                 recorder=None, apply_experience=True, profiler=None, statistics=False):
+        """
+        Create a fight without any input, display or pause
+
+        Args:
+            trainer1 (Trainer): First trainer (player)
+            trainer2 (Trainer): Second trainer (adversary)
+            player_policy: Policy of trainer1 (default: AttackPolicy)
+            adversary_policy: Policy of trainer2 (default: ChampionPolicy)
+            max_turns (int): Number of turns before a draw, None for no limit
+            rng (random.Random): Random generator of the fight
+            recorder (BattleRecorder): Replay log of the fight
+            apply_experience (bool): Give the experience won to the Pokemon of trainer1
+            profiler (FightProfiler): Time the phases of the fight
+            statistics (bool): Count the damage of each side (total_damage_trainer1/2)
+
+        Returns:
+            FightingSystem: Fight ready to be started
+        """
+        return cls(trainer1, trainer2,
+                   player_policy=player_policy or AttackPolicy(),
+                   adversary_policy=adversary_policy,
+                   renderer=NullRenderer(),
+                   max_turns=max_turns,
+                   rng=rng,
+                   recorder=recorder,
+                   apply_experience=apply_experience,
+                   profiler=profiler,
+                   statistics=statistics)
+
+    @property
+    def total_damage_trainer1(self):
+        """Damage inflicted by trainer1, 0 if the statistics are not counted"""
+        return self.statistics.damage[0] if self.statistics is not None else 0
+
+    @property
+    def total_damage_trainer2(self):
+        """Damage inflicted by trainer2, 0 if the statistics are not counted"""
+        return self.statistics.damage[1] if self.statistics is not None else 0
+
+    def subscribe(self, subscriber, batched=False):
+        """
+        Send the events of the fight to a subscriber
+
+        The subscriber receives the events it has a handler for (on_hit(fight,
+        event), on_ko(fight, event)... see fighting.events).
+
+        Args:
+            subscriber: Object with event handlers
+            batched (bool): Keep the events and call the handlers in one go once
+                the fight is over (the handlers must read the events, not the
+                state of the fight, e.g. a writer to a slow storage)
+        """
+        subscriptions = self._subscriptions.setdefault(subscriber, [])
+        if batched:
+            batch = self._batches.setdefault(subscriber, [])
+
+            def handler(fight, event):
+                batch.append(event)
+
+        for event_type in EVENTS:
+            if not hasattr(subscriber, event_type.handler):
+                continue
+            if not batched:
+                handler = getattr(subscriber, event_type.handler)
+            self._handlers[event_type].append(handler)
+            subscriptions.append((event_type, handler))
+
+    def unsubscribe(self, subscriber):
+        """Stop sending the events to a subscriber (the events kept for a batched one are dropped)"""
+        for event_type, handler in self._subscriptions.pop(subscriber, ()):
+            self._handlers[event_type].remove(handler)
+        self._batches.pop(subscriber, None)
+
+    def publish(self, event):
+        """
+        Send an event to the subscribers of its type
+
+        Args:
+            event (FightEvent): Event of the fight
+        """
+        for handler in self._handlers[type(event)]:
+            handler(self, event)
+
+    def _deliver_batches(self):
+        """Call the handlers of the batched subscribers with the events of the fight"""
+        for subscriber, events in self._batches.items():
+            for event in events:
+                getattr(subscriber, event.handler)(self, event)
+            events.clear()
 
     def start(self):
         """
         Start the fight and manage the main loop
-        
+
         Returns:
             bool: True if trainer1 wins, False otherwise
         """
+        self._begin()
+
+        # Main loop of the fight
+        while self.ongoing:
+            self.current_turn += 1
+            self._execute_turn()
+            self._check_end()
+
+        return self.winner is self.trainer1
+
+    def _begin(self):
+        """Reset the state of the fight and send the first Pokemon"""
         self.ongoing = True
         self.current_turn = 0
-        
-        # Introduction message
-        self._display_introduction()
+        self.winner = None
+        self.experience_gained = {}
+        self.levels_gained = {}
 
         # Ensure each trainer has an active Pokemon
         if not self.trainer1.active_pokemon:
             self.trainer1.choose_available_pokemon()
         if not self.trainer2.active_pokemon:
             self.trainer2.choose_available_pokemon()
-        
-        # Main loop of the fight
-        while self.ongoing:
-            self.current_turn += 1
-            self._execute_turn()
-            
-            # Check if the fight is over
-            if self.trainer1.team_ko():
-                self._end_fight(winner=self.trainer2)
-                return False
-            
-            if self.trainer2.team_ko():
-                self._end_fight(winner=self.trainer1)
-                return True
-        
-        return False
-    
-    def _display_introduction(self):
-        """Display the introduction of the fight"""
-        print(f"\n{'='*70}")
-        print(f"FIGHT POKEMON")
-        print(f"{'='*70}")
-        print(f"{self.trainer1.name} VS {self.trainer2.name}")
-        print(f"{'='*70}\n")
-        
-        input("Press Enter to start the fight...")
-        self._pause()
-    
+
+        if self._handlers[FightStarted]:
+            self.publish(FightStarted(self.current_turn))
+
+    def _check_end(self):
+        """End the fight if a team is KO or the limit of turns is reached"""
+        if self.trainer1.team_ko():
+            self._end_fight(winner=self.trainer2)
+        elif self.trainer2.team_ko():
+            self._end_fight(winner=self.trainer1)
+        elif self.ongoing and self.max_turns is not None and self.current_turn >= self.max_turns:
+            self._end_fight(winner=None)
+
     def _execute_turn(self):
         """Execute a complete turn of the fight"""
-        print(f"\n{'='*70}")
-        print(f"TURN {self.current_turn}")
-        print(f"{'='*70}")
-        
-        # Display the current state
-        self._display_fight_state()
-        
+        self._turn_started()
+
         # Phase 1 : Actions of trainer 1 (player)
         action1 = self._phase_action_player(self.trainer1)
-        
+
         # Check if the player has fled
-        if action1 == 'flee':
-            self._flee_fight()
+        if action1['type'] == 'flee':
+            self._flee_fight(self.trainer1)
             return
-        
+
         # Phase 2 : Actions of trainer 2 (adversary/IA)
         action2 = self._phase_action_ia(self.trainer2, self.trainer1)
-        
+
         # Phase 3 : Resolution of actions (speed order)
         self._resolve_actions(action1, action2)
-        
-        # Pause between turns
-        input("\nPress Enter to continue...")
-    
-    def _display_fight_state(self):
-        """Display the current state of the fight"""
-        print(f"\n--- Fight State ---")
-        
-
-        # Player's Pokemon
-        p1 = self.trainer1.active_pokemon
-        if p1:
-            percentage = int((p1.hp_actuals / p1.hp_max) * 100)
-            bar = self._display_hp_bar(percentage)
-            print(f"👤 {self.trainer1.name}: {p1.name} (Lvl.{p1.level})")
-            print(f"   {bar} {p1.hp_actuals}/{p1.hp_max} HP ({percentage}%)")
-        
-        print()
-        
-        # Adversary's Pokemon
-        p2 = self.trainer2.active_pokemon
-        if p2:
-            percentage = int((p2.hp_actuals / p2.hp_max) * 100)
-            bar = self._display_hp_bar(percentage)
-            print(f"👤 {self.trainer2.name}: {p2.name} (Lvl.{p2.level})")
-            print(f"   {bar} {p2.hp_actuals}/{p2.hp_max} HP ({percentage}%)")
-        
-        print(f"\n{'='*70}")
-
-    def _display_hp_bar(self, percentage):
-        """
-        Create a visual HP bar
-        
-        Args:
-            percentage (int): Percentage of HP (0-100)
-            
-        Returns:
-            str: Formatted HP bar
-        """
-        length = 20
-        filled = int((percentage / 100) * length)
-        empty = length - filled
-        
-        # Color according to the HP
-        if percentage > 50:
-            symbol = "█"
-        elif percentage > 20:
-            symbol = "▓"
-        else:
-            symbol = "░"
-        
-        bar = symbol * filled + "·" * empty
-        return f"[{bar}]"
-    
+
+        self._turn_ended()
+
+    def _turn_started(self):
+        if self._handlers[TurnStarted]:
+            self.publish(TurnStarted(self.current_turn))
+
+    def _turn_ended(self):
+        if self._handlers[TurnEnded]:
+            self.publish(TurnEnded(self.current_turn))
+
     def _phase_action_player(self, player):
         """
         Phase where the player chooses his action
-        
+
         Args:
             player (Trainer): The player trainer
-            
+
         Returns:
             dict: Chosen action
         """
-        print(f"\n--- Turn of {player.name} ---")
-        print("What do you want to do?")
-        print("1. ⚔️  Attack")
-        print("2. 🔄 Change Pokemon")
-        print("3. 🏃 Flee (only against wild Pokemon)")
-        
-        choice = input("\n➤ Your choice (1-3) : ").strip()
-        
-        if choice == '1':
-            return {'type': 'attack', 'trainer': player}
-        
-        elif choice == '2':
-            return self._menu_change_pokemon(player)
-        
-        elif choice == '3':
-            return 'flee'
-        
-        else:
-            print("Invalid choice, default attack")
-            return {'type': 'attack', 'trainer': player}
-
-    def _menu_change_pokemon(self, trainer):
-        """
-        Menu to change Pokemon
-        
-        Args:
-            trainer (Trainer): Trainer who changes Pokemon
-            
-        Returns:
-            dict: Change action
-        """
-        print(f"\n--- Team of {trainer.name} ---")
-        
-        # Display the team
-        for i, pokemon in enumerate(trainer.team, 1):
-            marker = "VS" if pokemon == trainer.active_pokemon else "  "
-            state = "KO" if pokemon.ko else f"{pokemon.hp_actuals}/{pokemon.hp_max} HP"
-            print(f"{marker} {i}. {pokemon.name} (Lvl.{pokemon.level}) - {state}")
-        
-        print(f"{len(trainer.team) + 1}. ← Cancel")
-        
-        choice = input(f"\n➤ Choose a Pokemon (1-{len(trainer.team)}) : ").strip()
-        
-        try:
-            index = int(choice) - 1
-            
-            if index == len(trainer.team):
-                # Cancel
-                return {'type': 'attack', 'trainer': trainer}
-            
-            if 0 <= index < len(trainer.team):
-                if trainer.choose_pokemon(index):
-                    return {'type': 'change', 'trainer': trainer, 'index': index}
-                else:
-                    # Change failed, default attack
-                    return {'type': 'attack', 'trainer': trainer}
-        except ValueError:
-            pass
-        
-        print("Invalid choice")
-        return {'type': 'attack', 'trainer': trainer}
+        return self._action_chosen(self.player_policy.choose_action(self, player, self.trainer2))
 
     def _phase_action_ia(self, adversary, player):
         """
         Phase where the IA decides its action
-        
+
         Args:
             adversary (Champion): Adversary controlled by the IA
             player (Trainer): Player trainer
-            
+
         Returns:
             dict: Action chosen by the IA
         """
-        # Vérifier si l'adversaire a une méthode IA (Champion)
-        if hasattr(adversary, 'choose_action_ia'):
-            decision = adversary.choose_action_ia(player.active_pokemon)
-            
-            if decision['action'] == 'change':
-                adversary.choose_pokemon(decision['index'])
-                return {'type': 'change', 'trainer': adversary}
-        
-        # Default : attack
-        return {'type': 'attack', 'trainer': adversary}
-    
+        return self._action_chosen(self.adversary_policy.choose_action(self, adversary, player))
+
+    def _action_chosen(self, action):
+        """Make the change of an action chosen by a policy and publish it"""
+        action = self._apply_change(action)
+        if self._handlers[ActionChosen]:
+            self.publish(ActionChosen(self.current_turn, action['trainer'], action))
+        return action
+
+    def _apply_change(self, action):
+        """
+        Make the change of Pokemon of an action (changes happen before attacks)
+
+        Args:
+            action (dict): Action chosen by a policy
+
+        Returns:
+            dict: The action, or an attack if the change is impossible
+        """
+        if action['type'] != 'change':
+            return action
+
+        trainer = action['trainer']
+        if trainer.choose_pokemon(action['index'], verbose=self.renderer.verbose):
+            if self._handlers[Switch]:
+                self.publish(Switch(self.current_turn, trainer, trainer.active_pokemon))
+            return action
+
+        # Change failed, default attack
+        return {'type': 'attack', 'trainer': trainer}
+
     def _resolve_actions(self, action1, action2):
         """
         Resolve the actions in order of priority
-        
+
         Args:
             action1 (dict): Action of the first trainer
             action2 (dict): Action of the second trainer
         """
-        # Priority 1 : The changes of Pokemon are made first
+        for action in self._order_actions(action1, action2):
+            if not self.ongoing:
+                break
+
+            trainer = action['trainer']
+            adversary = self.trainer2 if trainer == self.trainer1 else self.trainer1
+
+            if action['type'] == 'attack':
+                self._execute_attack(trainer, adversary)
+
+            # The changes have already been made in the previous phases
+
+    def _order_actions(self, action1, action2):
+        """
+        Sort the actions of a turn: changes first, then attacks by speed order
+
+        Returns:
+            list: The two actions in the order of execution
+        """
         actions = [action1, action2]
-        
-        # Sort : changes first, then attacks by speed order
+
         def priority_action(action):
             if action['type'] == 'change':
                 return (0, 0)  # Maximum priority
@@ -265,150 +349,129 @@ class FightingSystem:
                 # Speed order for attacks
                 speed = action['trainer'].active_pokemon.speed
                 return (1, -speed)  # Negative for decreasing order
-        
-        actions.sort(key=priority_action)
-        
-        # Execute the actions
-        for action in actions:
-            if not self.ongoing:
-                break
-            
-            trainer = action['trainer']
-            adversary = self.trainer2 if trainer == self.trainer1 else self.trainer1
-            
-            if action['type'] == 'attack':
-                self._execute_attack(trainer, adversary)
-            
-            # The changes have already been made in the previous phases
 
+        actions.sort(key=priority_action)
+        return actions
 
     def _execute_attack(self, attacker_trainer, defender_trainer):
         """
         Execute an attack
-        
+
         Args:
             attacker_trainer (Trainer): Trainer who attacks
             defender_trainer (Trainer): Trainer who defends
         """
+        result = self._attack(attacker_trainer, defender_trainer)
+
+        # The defender must change of Pokemon
+        if result is not None and result.target_knocked_out and not defender_trainer.team_ko():
+            self._force_change_pokemon(defender_trainer)
+
+    def _attack(self, attacker_trainer, defender_trainer):
+        """
+        Make the active Pokemon of a trainer attack and publish the hit or the miss, and the KO
+
+        Args:
+            attacker_trainer (Trainer): Trainer who attacks
+            defender_trainer (Trainer): Trainer who defends
+
+        Returns:
+            AttackResult: Result of the attack, None if a Pokemon cannot fight
+        """
         attacker = attacker_trainer.active_pokemon
         defender = defender_trainer.active_pokemon
-        
+
         if not attacker or attacker.ko:
-            return
-        
+            return None
+
         if not defender or defender.ko:
-            return
-        
-        # Execute the attack
-        print()
-        result = attacker.attack_pokemon(defender)
-        
-        if result['success']:
-            print(result['message'])
-            
-            # Update the statistics
-            if attacker_trainer == self.trainer1:
-                    self.total_damage_trainer1 += result['damage']
-            else:
-                self.total_damage_trainer2 += result['damage']
-            
-            # Check if the defender is KO
-            if result.get('target_knocked_out', False):
-                print(f"\n{defender.name} is KO !")
-                
-                # Gain experience
-                exp_gained = self._calculate_experience(defender)
-                self._gain_experience(attacker, exp_gained)
-                
-                # The defender must change of Pokemon
-                if not defender_trainer.team_ko():
-                    self._force_change_pokemon(defender_trainer)
-        else:
-            print(result['message'])
-        
-        self._pause(1)
-    
+            return None
+
+        # Execute the attack (the message of the result is only built by a verbose renderer)
+        result = self._attack_pokemon(attacker, defender)
+
+        if result.success:
+            if self._handlers[Hit]:
+                self.publish(Hit(self.current_turn, attacker_trainer, defender_trainer, result))
+            if result.target_knocked_out and self._handlers[KO]:
+                self.publish(KO(self.current_turn, defender_trainer, defender, attacker))
+        elif self._handlers[Miss]:
+            self.publish(Miss(self.current_turn, attacker_trainer, defender_trainer, result))
+
+        return result
+
+    def _attack_pokemon(self, attacker, defender):
+        """
+        Make a Pokemon attack another with the random generator of the fight
+
+        Args:
+            attacker (Pokemon): Pokemon who attacks
+            defender (Pokemon): Pokemon attacked
+
+        Returns:
+            AttackResult: Result of the attack
+        """
+        return attacker.attack_pokemon(defender, self.rng)
+
     def _force_change_pokemon(self, trainer):
         """
         Force a trainer to change of Pokemon (after a KO)
-        
+
         Args:
             trainer (Trainer): Trainer who must change
         """
-        print(f"\n{trainer.name} must send another Pokemon !")
-        
-        if trainer == self.trainer1:
-            # The player chooses
-            self._menu_change_pokemon(trainer)
-        else:
-            # The IA chooses automatically
-            trainer.choose_available_pokemon()
-            if trainer.active_pokemon:
-                print(f" {trainer.name} sends {trainer.active_pokemon.name} !")
-        
-        self._pause(1)
+        self._replacement_required(trainer)
+        self._send_replacement(trainer, self._policy_of(trainer).choose_replacement(self, trainer))
+
+    def _policy_of(self, trainer):
+        return self.player_policy if trainer == self.trainer1 else self.adversary_policy
 
+    def _replacement_required(self, trainer):
+        if self._handlers[ReplacementRequired]:
+            self.publish(ReplacementRequired(self.current_turn, trainer))
 
-    def _calculate_experience(self, defeated_pokemon):
+    def _send_replacement(self, trainer, index):
         """
-        Calculate the experience gained after defeating a Pokemon
-        
+        Send the Pokemon chosen to replace a KO one
+
         Args:
-            defeated_pokemon (Pokemon): Defeated Pokemon
-            
-        Returns:
-            int: Experience points gained after defeating a Pokemon
+            trainer (Trainer): Trainer who must change
+            index (int): Index chosen by the policy, None for the first Pokemon able to fight
         """
-        # Simple formula: level of the defeated Pokemon * 10
-        return defeated_pokemon.level * 10
-    
-    def _gain_experience(self, pokemon, experience):
+        automatic = index is None or not trainer.choose_pokemon(index, verbose=self.renderer.verbose)
+        if automatic:
+            # The first Pokemon able to fight is sent automatically
+            trainer.choose_available_pokemon()
+
+        if self._handlers[Switch]:
+            self.publish(Switch(self.current_turn, trainer, trainer.active_pokemon, forced=True,
+                                automatic=automatic))
+
+    def _flee_fight(self, trainer):
         """
-        Gain experience to a Pokemon
-        
+        Stop the fight because a trainer has fled
+
         Args:
-            pokemon (Pokemon): Pokemon who gains experience
-            experience (int): Experience points gained
+            trainer (Trainer): Trainer who flees
         """
-        print(f"\n{pokemon.name} gains {experience} experience points !")
-
+        self.ongoing = False
+        self.winner = None
+        self._fight_ended(None, fled=trainer)
 
     def _end_fight(self, winner):
         """
         Manage the end of the fight
-        
+
         Args:
             winner (Trainer): Winner of the fight
         """
         self.ongoing = False
-        
-        print(f"\n{'='*70}")
-        print(f"END OF FIGHT")
-        print(f"{'='*70}")
-        
-        if winner == self.trainer1:
-            print(f"VICTORY !")
-            print(f"{self.trainer1.name} has won the fight !")
-        
-        elif winner == self.trainer2:
-            print(f"DEFEAT...")
-            print(f"{self.trainer2.name} has lost the fight...")
-        else:
-            print(f"DRAW...")
-            print(f"The fight is a draw...")
-        
-        # Display the statistics
-        print(f"\n--- Fight statistics ---")
-        print(f"Turns: {self.current_turn}")
-        print(f"Damage inflicted by {self.trainer1.name}: {self.total_damage_trainer1}")
-        print(f"Damage inflicted by {self.trainer2.name}: {self.total_damage_trainer2}")
-        print(f"{'='*70}\n")
-
-    def _pause(self, seconds=0.5):
-        """
-        Pause to make the fight more readable
-        
-        Args:
-            seconds (float): Duration of the pause
-        """
-        time.sleep(seconds)
\ No newline at end of file
+        self.winner = winner
+        self._fight_ended(winner)
+
+    def _fight_ended(self, winner, fled=None):
+        """Publish the end of the fight, then deliver the events kept for the batched subscribers"""
+        if self._handlers[FightEnded]:
+            self.publish(FightEnded(self.current_turn, winner, fled))
+        if self._batches:
+            self._deliver_batches()
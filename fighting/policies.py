@@ -0,0 +1,128 @@
+class ConsolePolicy:
+    """
+    Policy asking the human player for his actions on stdin
+
+    A policy decides the action of a trainer each turn and the Pokemon
+    to send after a KO. Actions are dicts:
+        {'type': 'attack', 'trainer': trainer}
+        {'type': 'change', 'trainer': trainer, 'index': int}
+        {'type': 'flee', 'trainer': trainer}
+    """
+
+    def choose_action(self, fight, trainer, adversary):
+        """
+        Ask the player which action to perform
+
+        Args:
+            fight (FightingSystem): Running fight
+            trainer (Trainer): Trainer who acts
+            adversary (Trainer): Adversary trainer
+
+        Returns:
+            dict: Chosen action
+        """
+        print(f"\n--- Turn of {trainer.name} ---")
+        print("What do you want to do?")
+        print("1. ⚔️  Attack")
+        print("2. 🔄 Change Pokemon")
+        print("3. 🏃 Flee (only against wild Pokemon)")
+
+        choice = input("\n➤ Your choice (1-3) : ").strip()
+
+        if choice == '1':
+            return {'type': 'attack', 'trainer': trainer}
+
+        elif choice == '2':
+            index = self._menu_change_pokemon(trainer)
+            if index is None:
+                return {'type': 'attack', 'trainer': trainer}
+            return {'type': 'change', 'trainer': trainer, 'index': index}
+
+        elif choice == '3':
+            return {'type': 'flee', 'trainer': trainer}
+
+        else:
+            print("Invalid choice, default attack")
+            return {'type': 'attack', 'trainer': trainer}
+
+    def choose_replacement(self, fight, trainer):
+        """
+        Ask the player which Pokemon to send after a KO
+
+        Args:
+            fight (FightingSystem): Running fight
+            trainer (Trainer): Trainer who must change
+
+        Returns:
+            int: Index of the chosen Pokemon, or None
+        """
+        return self._menu_change_pokemon(trainer)
+
+    def _menu_change_pokemon(self, trainer):
+        """
+        Menu to change Pokemon
+
+        Args:
+            trainer (Trainer): Trainer who changes Pokemon
+
+        Returns:
+            int: Index of the chosen Pokemon, or None if cancelled
+        """
+        print(f"\n--- Team of {trainer.name} ---")
+
+        # Display the team
+        for i, pokemon in enumerate(trainer.team, 1):
+            marker = "VS" if pokemon == trainer.active_pokemon else "  "
+            state = "KO" if pokemon.ko else f"{pokemon.hp_actuals}/{pokemon.hp_max} HP"
+            print(f"{marker} {i}. {pokemon.name} (Lvl.{pokemon.level}) - {state}")
+
+        print(f"{len(trainer.team) + 1}. ← Cancel")
+
+        choice = input(f"\n➤ Choose a Pokemon (1-{len(trainer.team)}) : ").strip()
+
+        try:
+            index = int(choice) - 1
+
+            if index == len(trainer.team):
+                # Cancel
+                return None
+
+            if 0 <= index < len(trainer.team):
+                return index
+        except ValueError:
+            pass
+
+        print("Invalid choice")
+        return None
+
+
+class AttackPolicy:
+    """Policy always attacking, the first Pokemon able to fight replaces a KO one"""
+
+    def choose_action(self, fight, trainer, adversary):
+        return {'type': 'attack', 'trainer': trainer}
+
+    def choose_replacement(self, fight, trainer):
+        return None
+
+
+class ChampionPolicy:
+    """
+    Policy delegating to the IA of the trainer (Champion.choose_action_ia)
+
+    Trainers without IA always attack.
+    """
+
+    def choose_action(self, fight, trainer, adversary):
+        # Check if the trainer has an IA method (Champion)
+        if hasattr(trainer, 'choose_action_ia'):
+            decision = trainer.choose_action_ia(adversary.active_pokemon)
+
+            if decision['action'] == 'change':
+                return {'type': 'change', 'trainer': trainer, 'index': decision['index']}
+
+        # Default : attack
+        return {'type': 'attack', 'trainer': trainer}
+
+    def choose_replacement(self, fight, trainer):
+        return None
@@ -0,0 +1,173 @@
+"""
+fighting/profiling.py
+Time spent in each phase of the fights, exported as a dict or Prometheus text
+
+Give a FightProfiler to FightingSystem (profiler=...): the profiler
+replaces the phase methods of that fight only with timed wrappers. A fight
+without a profiler runs the plain methods and pays nothing, so the
+profiling can stay in production code and be enabled per fight.
+"""
+
+import time
+
+
+# Methods of FightingSystem timed by the profiler, and the name of their phase
+PHASES = {
+    'start': 'fight',
+    '_phase_action_player': 'phase_action_player',
+    '_phase_action_ia': 'phase_action_ia',
+    '_resolve_actions': 'resolve_actions',
+    '_execute_attack': 'execute_attack',
+    '_attack_pokemon': 'attack_pokemon',
+    '_force_change_pokemon': 'force_change_pokemon'
+}
+
+
+class PhaseStats:
+    """
+    Counters of one phase
+
+    The times are inclusive: the time of resolve_actions contains the time
+    of the attacks it executes.
+
+    Attributes:
+        calls (int): Number of calls
+        wall (float): Total wall time in seconds
+        cpu (float): Total CPU time of the process in seconds
+        max_wall (float): Longest call in seconds
+    """
+
+    __slots__ = ('calls', 'wall', 'cpu', 'max_wall')
+
+    def __init__(self):
+        self.calls = 0
+        self.wall = 0.0
+        self.cpu = 0.0
+        self.max_wall = 0.0
+
+    def add(self, wall, cpu):
+        """Count one call"""
+        self.calls += 1
+        self.wall += wall
+        self.cpu += cpu
+        if wall > self.max_wall:
+            self.max_wall = wall
+
+    def to_dict(self):
+        return {
+            'calls': self.calls,
+            'wall': self.wall,
+            'cpu': self.cpu,
+            'max_wall': self.max_wall,
+            'mean_wall': self.wall / self.calls if self.calls else 0.0
+        }
+
+
+class FightProfiler:
+    """
+    Wall and CPU time of every phase of the fights it instruments
+
+    One profiler can be shared by any number of fights (one matchmaking
+    server, one simulation...): the counters add up until reset().
+
+    Attributes:
+        cpu (bool): Measure the CPU time too (one more clock read per call)
+        phases (dict): PhaseStats by phase name
+    """
+
+    def __init__(self, cpu=True):
+        """
+        Args:
+            cpu (bool): Measure the CPU time of the phases
+        """
+        self.cpu = cpu
+        self.phases = {phase: PhaseStats() for phase in PHASES.values()}
+
+    def instrument(self, fight):
+        """
+        Time the phases of a fight (called by FightingSystem)
+
+        Args:
+            fight (FightingSystem): Fight to instrument
+        """
+        for method_name, phase in PHASES.items():
+            setattr(fight, method_name, self._timed(getattr(fight, method_name), self.phases[phase]))
+
+    def _timed(self, method, stats):
+        """Wrap a bound method to count its calls and time"""
+        wall_clock = time.perf_counter
+        cpu_clock = time.process_time if self.cpu else None
+
+        if cpu_clock is None:
+            def timed(*args, **kwargs):
+                start = wall_clock()
+                try:
+                    return method(*args, **kwargs)
+                finally:
+                    stats.add(wall_clock() - start, 0.0)
+        else:
+            def timed(*args, **kwargs):
+                start = wall_clock()
+                start_cpu = cpu_clock()
+                try:
+                    return method(*args, **kwargs)
+                finally:
+                    stats.add(wall_clock() - start, cpu_clock() - start_cpu)
+
+        return timed
+
+    def reset(self):
+        """Set every counter back to zero"""
+        for stats in self.phases.values():
+            stats.__init__()
+
+    def to_dict(self):
+        """
+        Export the counters
+
+        Returns:
+            dict: {phase: {'calls', 'wall', 'cpu', 'max_wall', 'mean_wall'}}, times in seconds
+        """
+        return {phase: stats.to_dict() for phase, stats in self.phases.items()}
+
+    def to_prometheus(self, prefix='pokemon_fight'):
+        """
+        Export the counters in the text format of Prometheus
+
+        Args:
+            prefix (str): Prefix of the metric names
+
+        Returns:
+            str: Metrics, one sample per phase (label 'phase')
+        """
+        metrics = (
+            ('phase_calls_total', 'counter', 'Calls of each phase of the fights', 'calls'),
+            ('phase_wall_seconds_total', 'counter', 'Wall time spent in each phase', 'wall'),
+            ('phase_cpu_seconds_total', 'counter', 'CPU time spent in each phase', 'cpu'),
+            ('phase_max_wall_seconds', 'gauge', 'Longest call of each phase', 'max_wall')
+        )
+
+        lines = []
+        for name, kind, description, field in metrics:
+            if field == 'cpu' and not self.cpu:
+                continue
+            lines.append(f"# HELP {prefix}_{name} {description}")
+            lines.append(f"# TYPE {prefix}_{name} {kind}")
+            for phase, stats in self.phases.items():
+                lines.append(f'{prefix}_{name}{{phase="{phase}"}} {getattr(stats, field)!r}')
+        return "\n".join(lines) + "\n"
+
+    def summary(self):
+        """
+        Text table of the phases
+
+        Returns:
+            str: Calls, total and mean wall time, CPU time of each phase
+        """
+        lines = [f"{'Phase':<22}{'Calls':>10}{'Wall (ms)':>12}{'Mean (us)':>12}{'CPU (ms)':>12}",
+                 f"{'-'*68}"]
+        for phase, stats in self.phases.items():
+            mean = stats.wall / stats.calls * 1e6 if stats.calls else 0.0
+            lines.append(f"{phase:<22}{stats.calls:>10}{stats.wall * 1e3:>12.2f}{mean:>12.2f}"
+                         f"{stats.cpu * 1e3:>12.2f}")
+        return "\n".join(lines)
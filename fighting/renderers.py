@@ -0,0 +1,222 @@
+import time
+
+
+class ConsoleRenderer:
+    """
+    Renderer displaying a fight in the terminal
+
+    The renderer subscribes to the events of the fight (see
+    fighting.events): each handler calls the display method of its event.
+    Every method receives the running FightingSystem so the renderer can
+    read the trainers, the turn number and the statistics.
+
+    Attributes:
+        verbose (bool): True, the renderer displays the fight
+    """
+
+    verbose = True
+
+    def on_fight_started(self, fight, event):
+        self.introduction(fight)
+
+    def on_turn_started(self, fight, event):
+        self.turn_started(fight)
+
+    def on_hit(self, fight, event):
+        self.attack_resolved(fight, event.result.attacker, event.result.target, event.result)
+        self.pause(1)
+
+    def on_miss(self, fight, event):
+        self.attack_resolved(fight, event.result.attacker, event.result.target, event.result)
+        self.pause(1)
+
+    def on_ko(self, fight, event):
+        self.pokemon_ko(fight, event.pokemon)
+
+    def on_experience_gained(self, fight, event):
+        self.experience_gained(fight, event.pokemon, event.experience)
+
+    def on_replacement_required(self, fight, event):
+        self.replacement_required(fight, event.trainer)
+
+    def on_switch(self, fight, event):
+        # A change chosen by the trainer is displayed by Trainer.choose_pokemon
+        if event.automatic:
+            self.pokemon_sent(fight, event.trainer)
+        if event.forced:
+            self.pause(1)
+
+    def on_turn_ended(self, fight, event):
+        self.turn_ended(fight)
+
+    def on_level_up(self, fight, event):
+        self.level_up(fight, event.pokemon, event.levels)
+
+    def on_fight_ended(self, fight, event):
+        if event.fled is not None:
+            self.fled(fight, event.fled)
+        else:
+            self.fight_ended(fight, event.winner)
+
+    def introduction(self, fight):
+        """Display the introduction of the fight"""
+        print(f"\n{'='*70}")
+        print(f"FIGHT POKEMON")
+        print(f"{'='*70}")
+        print(f"{fight.trainer1.name} VS {fight.trainer2.name}")
+        print(f"{'='*70}\n")
+
+        self.wait_player("Press Enter to start the fight...")
+        self.pause()
+
+    def turn_started(self, fight):
+        """Display the header of a turn and the current state of the fight"""
+        print(f"\n{'='*70}")
+        print(f"TURN {fight.current_turn}")
+        print(f"{'='*70}")
+
+        self._display_fight_state(fight)
+
+    def _display_fight_state(self, fight):
+        """Display the current state of the fight"""
+        print(f"\n--- Fight State ---")
+
+        # Player's Pokemon
+        self._display_active_pokemon(fight.trainer1)
+
+        print()
+
+        # Adversary's Pokemon
+        self._display_active_pokemon(fight.trainer2)
+
+        print(f"\n{'='*70}")
+
+    def _display_active_pokemon(self, trainer):
+        """
+        Display the active Pokemon of a trainer with its HP bar
+
+        Args:
+            trainer (Trainer): Trainer whose active Pokemon is displayed
+        """
+        pokemon = trainer.active_pokemon
+        if pokemon:
+            percentage = int((pokemon.hp_actuals / pokemon.hp_max) * 100)
+            bar = self._display_hp_bar(percentage)
+            print(f"👤 {trainer.name}: {pokemon.name} (Lvl.{pokemon.level})")
+            print(f"   {bar} {pokemon.hp_actuals}/{pokemon.hp_max} HP ({percentage}%)")
+
+    def _display_hp_bar(self, percentage):
+        """
+        Create a visual HP bar
+
+        Args:
+            percentage (int): Percentage of HP (0-100)
+
+        Returns:
+            str: Formatted HP bar
+        """
+        length = 20
+        filled = int((percentage / 100) * length)
+        empty = length - filled
+
+        # Color according to the HP
+        if percentage > 50:
+            symbol = "█"
+        elif percentage > 20:
+            symbol = "▓"
+        else:
+            symbol = "░"
+
+        bar = symbol * filled + "·" * empty
+        return f"[{bar}]"
+
+    def attack_resolved(self, fight, attacker, defender, result):
+        """Display the result of an attack"""
+        print()
+        print(result.message)
+
+    def pokemon_ko(self, fight, pokemon):
+        """Display that a Pokemon is KO"""
+        print(f"\n{pokemon.name} is KO !")
+
+    def experience_gained(self, fight, pokemon, experience):
+        """Display the experience gained by a Pokemon"""
+        print(f"\n{pokemon.name} gains {experience} experience points !")
+
+    def level_up(self, fight, pokemon, levels):
+        """Display the new level of a Pokemon at the end of the fight"""
+        print(f"{pokemon.name} grows to level {pokemon.level} !")
+
+    def replacement_required(self, fight, trainer):
+        """Display that a trainer must send another Pokemon"""
+        print(f"\n{trainer.name} must send another Pokemon !")
+
+    def pokemon_sent(self, fight, trainer):
+        """Display the Pokemon sent automatically by a trainer"""
+        if trainer.active_pokemon:
+            print(f" {trainer.name} sends {trainer.active_pokemon.name} !")
+
+    def fled(self, fight, trainer):
+        """Display that a trainer has fled the fight"""
+        print(f"\n{trainer.name} flees the fight !")
+
+    def turn_ended(self, fight):
+        """Pause between turns"""
+        self.wait_player("\nPress Enter to continue...")
+
+    def fight_ended(self, fight, winner):
+        """
+        Display the end of the fight and its statistics
+
+        Args:
+            fight (FightingSystem): Finished fight
+            winner (Trainer): Winner of the fight, None for a draw
+        """
+        print(f"\n{'='*70}")
+        print(f"END OF FIGHT")
+        print(f"{'='*70}")
+
+        if winner == fight.trainer1:
+            print(f"VICTORY !")
+            print(f"{fight.trainer1.name} has won the fight !")
+
+        elif winner == fight.trainer2:
+            print(f"DEFEAT...")
+            print(f"{fight.trainer2.name} has lost the fight...")
+        else:
+            print(f"DRAW...")
+            print(f"The fight is a draw...")
+
+        # Display the statistics
+        print(f"\n--- Fight statistics ---")
+        print(f"Turns: {fight.current_turn}")
+        print(f"Damage inflicted by {fight.trainer1.name}: {fight.total_damage_trainer1}")
+        print(f"Damage inflicted by {fight.trainer2.name}: {fight.total_damage_trainer2}")
+        print(f"{'='*70}\n")
+
+    def wait_player(self, prompt):
+        """Wait until the player presses Enter"""
+        input(prompt)
+
+    def pause(self, seconds=0.5):
+        """
+        Pause to make the fight more readable
+
+        Args:
+            seconds (float): Duration of the pause
+        """
+        time.sleep(seconds)
+
+
+class NullRenderer:
+    """
+    Renderer for headless fights: displays nothing, never waits
+
+    It has no event handler, so the fight does not even build the events
+    for it.
+
+    Attributes:
+        verbose (bool): False, nothing is displayed
+    """
+
+    verbose = False
@@ -0,0 +1,377 @@
+"""
+fighting/replay.py
+Compact binary log of fights and replayer
+
+A log file starts with a header (magic + version) followed by fixed-width
+records of RECORD_SIZE bytes, appended fight after fight:
+
+    FIGHT_START, TRAINER x2, POKEMON x team sizes, SWITCH x2 (active Pokemon),
+    then per turn: TURN, ACTION x2, HIT/MISS, KO, SWITCH..., and FIGHT_END
+
+Every record starts with: kind, side (0 trainer1, 1 trainer2), slot
+(index in the team), flag, turn, and three 16-bit values. The last 16 bytes
+hold either two doubles (the random draws of an attack) or a name.
+"""
+
+import os
+import struct
+
+
+MAGIC = b'PKRL'
+VERSION = 1
+HEADER = struct.Struct('<4sH')
+
+# kind, side, slot, flag, turn, value1, value2, value3, roll1, roll2
+RECORD = struct.Struct('<BBBBHHHHdd')
+# kind, side, slot, flag, turn, value1, value2, value3, name
+NAMED_RECORD = struct.Struct('<BBBBHHHH16s')
+RECORD_SIZE = RECORD.size
+
+# Number of records read at once by read_fights
+READ_BLOCK = 4096
+
+# Kinds of record
+FIGHT_START = 1
+TRAINER = 2
+POKEMON = 3
+TURN = 4
+ACTION = 5
+HIT = 6
+MISS = 7
+KO = 8
+SWITCH = 9
+FIGHT_END = 10
+
+NAMED_KINDS = (TRAINER, POKEMON)
+
+# Flag of an ACTION record
+ACTION_TYPES = ('attack', 'change', 'flee')
+
+# Flag of a FIGHT_END record
+WINNER_TRAINER1 = 0
+WINNER_TRAINER2 = 1
+NO_WINNER = 2
+
+
+def _encode_name(name):
+    return name.encode('utf-8')[:16]
+
+
+def _decode_name(raw):
+    return raw.rstrip(b'\0').decode('utf-8', errors='ignore')
+
+
+class BattleRecorder:
+    """
+    Record fights in an append-only binary log
+
+    Give the recorder to FightingSystem (recorder=...): it subscribes to
+    the events of the fight (see fighting.events). The records of a fight
+    are kept in memory and appended to the file in one write when the
+    fight ends. A fight cut by a crash (or any stray bytes at the end) is
+    removed when the log is opened again, so the next fights stay aligned
+    on RECORD_SIZE.
+
+    Attributes:
+        path (str): Path of the log file
+        fights_recorded (int): Number of fights written by this recorder
+    """
+
+    def __init__(self, path):
+        """
+        Open (or create) a log file
+
+        Args:
+            path (str): Path of the log file
+
+        Raises:
+            ValueError: If the file exists and is not a fight log
+        """
+        self.path = path
+        self.fights_recorded = 0
+        self._buffer = bytearray()
+
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        if os.path.exists(path) and os.path.getsize(path) > 0:
+            with open(path, 'rb+') as f:
+                _check_header(f.read(HEADER.size))
+                f.truncate(_end_of_last_fight(f))
+            self._file = open(path, 'ab')
+        else:
+            self._file = open(path, 'wb')
+            self._file.write(HEADER.pack(MAGIC, VERSION))
+            self._file.flush()
+
+    def close(self):
+        """Close the log file"""
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def _record(self, kind, side=0, slot=0, flag=0, turn=0, value1=0, value2=0, value3=0,
+                roll1=0.0, roll2=0.0):
+        self._buffer += RECORD.pack(kind, side, slot, flag, turn, value1, value2, value3, roll1, roll2)
+
+    def _record_named(self, kind, name, side=0, slot=0, flag=0, turn=0, value1=0, value2=0, value3=0):
+        self._buffer += NAMED_RECORD.pack(kind, side, slot, flag, turn, value1, value2, value3,
+                                          _encode_name(name))
+
+    @staticmethod
+    def _side(fight, trainer):
+        return 0 if trainer == fight.trainer1 else 1
+
+    def on_fight_started(self, fight, event):
+        """Record the trainers and their teams at the start of a fight"""
+        self._buffer.clear()
+        self._record(FIGHT_START)
+
+        for side, trainer in enumerate((fight.trainer1, fight.trainer2)):
+            self._record_named(TRAINER, trainer.name, side=side, value1=len(trainer.team))
+
+            for slot, pokemon in enumerate(trainer.team):
+                self._record_named(POKEMON, pokemon.name, side=side, slot=slot, flag=pokemon.type_id,
+                                   value1=pokemon.level, value2=pokemon.hp_max, value3=pokemon.hp_actuals)
+
+            if trainer.active_pokemon in trainer.team:
+                self._record(SWITCH, side=side, slot=trainer.team.index(trainer.active_pokemon))
+
+    def on_turn_started(self, fight, event):
+        self._record(TURN, turn=event.turn)
+
+    def on_action_chosen(self, fight, event):
+        """Record the action of a trainer (after the change of Pokemon is made)"""
+        action = event.action
+        flag = ACTION_TYPES.index(action['type'])
+        slot = action.get('index', 0) if action['type'] == 'change' else 0
+        self._record(ACTION, side=self._side(fight, event.trainer), slot=slot, flag=flag, turn=event.turn)
+
+    def on_hit(self, fight, event):
+        """Record the damage and the random draws of a hit"""
+        result = event.result
+        self._record(HIT, side=self._side(fight, event.attacker_trainer),
+                     slot=event.defender_trainer.team.index(result.target), turn=event.turn,
+                     value1=result.damage, value2=result.target.hp_actuals,
+                     value3=int(round(result.type_multiplier * 100)),
+                     roll1=result.accuracy_roll, roll2=result.variability)
+
+    def on_miss(self, fight, event):
+        """Record the accuracy draw of a miss"""
+        result = event.result
+        if result.accuracy_roll is not None:
+            self._record(MISS, side=self._side(fight, event.attacker_trainer),
+                         slot=event.defender_trainer.team.index(result.target), turn=event.turn,
+                         roll1=result.accuracy_roll)
+
+    def on_ko(self, fight, event):
+        self._record(KO, side=self._side(fight, event.trainer), slot=event.trainer.team.index(event.pokemon),
+                     turn=event.turn)
+
+    def on_switch(self, fight, event):
+        """Record the new active Pokemon of a trainer"""
+        if event.pokemon in event.trainer.team:
+            self._record(SWITCH, side=self._side(fight, event.trainer),
+                         slot=event.trainer.team.index(event.pokemon), turn=event.turn)
+
+    def on_fight_ended(self, fight, event):
+        """Record the end of the fight and append the fight to the log"""
+        if event.winner is None:
+            flag = NO_WINNER
+        else:
+            flag = self._side(fight, event.winner)
+
+        self._record(FIGHT_END, flag=flag, turn=event.turn)
+
+        self._file.write(self._buffer)
+        self._file.flush()
+        self._buffer.clear()
+        self.fights_recorded += 1
+
+
+def _check_header(raw):
+    if len(raw) != HEADER.size:
+        raise ValueError("Not a fight log: file too short")
+
+    magic, version = HEADER.unpack(raw)
+    if magic != MAGIC:
+        raise ValueError("Not a fight log: bad magic")
+    if version != VERSION:
+        raise ValueError(f"Unsupported fight log version {version}")
+
+
+def _end_of_last_fight(f):
+    """
+    Find the end of the last complete fight of a log
+
+    The records are read backwards from the last whole record, so only
+    the end of a long log is read.
+
+    Args:
+        f (file): Log file opened in binary mode, header checked
+
+    Returns:
+        int: Offset just after the last FIGHT_END record (after the header if none)
+    """
+    f.seek(0, os.SEEK_END)
+    end = HEADER.size + (f.tell() - HEADER.size) // RECORD_SIZE * RECORD_SIZE
+
+    while end > HEADER.size:
+        start = max(HEADER.size, end - RECORD_SIZE * READ_BLOCK)
+        f.seek(start)
+        block = f.read(end - start)
+        for offset in range(len(block) - RECORD_SIZE, -1, -RECORD_SIZE):
+            if block[offset] == FIGHT_END:
+                return start + offset + RECORD_SIZE
+        end = start
+
+    return HEADER.size
+
+
+def _unpack(raw):
+    """Decode one record as a tuple, the name (or the two rolls) last"""
+    if raw[0] in NAMED_KINDS:
+        record = NAMED_RECORD.unpack(raw)
+        return record[:-1] + (_decode_name(record[-1]),)
+    return RECORD.unpack(raw)
+
+
+class FightState:
+    """
+    State of a recorded fight at a given turn
+
+    Attributes:
+        turn (int): Turn of the state
+        trainers (list): Name of trainer1 and trainer2
+        teams (list): For each side, list of dicts (name, type_id, level, hp, hp_max, ko)
+        active (list): Slot of the active Pokemon of each side
+        total_damage (list): Damage inflicted by each side
+        finished (bool): True if the fight is over at this turn
+        winner (int): Side of the winner (0 or 1), None if no winner (yet)
+    """
+
+    def __init__(self):
+        self.turn = 0
+        self.trainers = ['', '']
+        self.teams = [[], []]
+        self.active = [None, None]
+        self.total_damage = [0, 0]
+        self.finished = False
+        self.winner = None
+
+    def __str__(self):
+        lines = [f"Turn {self.turn}" + (" (finished)" if self.finished else "")]
+        for side in (0, 1):
+            lines.append(f"{self.trainers[side]} - damage inflicted: {self.total_damage[side]}")
+            for slot, pokemon in enumerate(self.teams[side]):
+                marker = "VS" if slot == self.active[side] else "  "
+                status = "KO" if pokemon['ko'] else f"{pokemon['hp']}/{pokemon['hp_max']} HP"
+                lines.append(f"  {marker} {pokemon['name']} (Lvl.{pokemon['level']}) - {status}")
+        return "\n".join(lines)
+
+
+class RecordedFight:
+    """
+    A fight read from a log
+
+    Attributes:
+        records (list): Decoded records of the fight
+    """
+
+    def __init__(self, records):
+        self.records = records
+
+        # Index of the first record of each turn, to stop the replay early
+        self._turn_index = {}
+        for i, record in enumerate(records):
+            if record[0] == TURN:
+                self._turn_index[record[4]] = i
+
+    @property
+    def turns(self):
+        """Number of turns played"""
+        return len(self._turn_index)
+
+    def state_at(self, turn=None):
+        """
+        Rebuild the state of the fight at the end of a turn
+
+        The recorded damage is applied directly, the random generator is
+        never run again.
+
+        Args:
+            turn (int): Turn to reach (0 = before the first turn, None = end of the fight)
+
+        Returns:
+            FightState: State of the fight
+        """
+        state = FightState()
+
+        stop = len(self.records)
+        if turn is not None and turn + 1 in self._turn_index:
+            stop = self._turn_index[turn + 1]
+
+        for record in self.records[:stop]:
+            kind, side, slot = record[0], record[1], record[2]
+
+            if kind == TRAINER:
+                state.trainers[side] = record[-1]
+            elif kind == POKEMON:
+                state.teams[side].append({
+                    'name': record[-1],
+                    'type_id': record[3],
+                    'level': record[5],
+                    'hp_max': record[6],
+                    'hp': record[7],
+                    'ko': record[7] == 0
+                })
+            elif kind == TURN:
+                state.turn = record[4]
+            elif kind == SWITCH:
+                state.active[side] = slot
+            elif kind == HIT:
+                target = state.teams[1 - side][slot]
+                target['hp'] = record[6]
+                state.total_damage[side] += record[5]
+            elif kind == KO:
+                state.teams[side][slot]['ko'] = True
+            elif kind == FIGHT_END:
+                state.finished = True
+                state.winner = None if record[3] == NO_WINNER else record[3]
+
+        return state
+
+
+def read_fights(path):
+    """
+    Read the fights of a log one by one
+
+    Args:
+        path (str): Path of the log file
+
+    Yields:
+        RecordedFight: Each fight of the log, in order
+    """
+    with open(path, 'rb') as f:
+        _check_header(f.read(HEADER.size))
+
+        records = []
+        while True:
+            block = f.read(RECORD_SIZE * READ_BLOCK)
+            if len(block) < RECORD_SIZE:
+                break
+
+            for start in range(0, len(block) - RECORD_SIZE + 1, RECORD_SIZE):
+                record = _unpack(block[start:start + RECORD_SIZE])
+                if record[0] == FIGHT_START:
+                    records = []
+                records.append(record)
+
+                if record[0] == FIGHT_END:
+                    yield RecordedFight(records)
+                    records = []
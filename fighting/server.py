@@ -0,0 +1,547 @@
+"""
+fighting/server.py
+Asyncio server: every connection plays its own game through a line protocol
+
+One process serves many players in one thread: a session waiting for its
+player only waits on its socket, the fights are AsyncFightingSystem
+fights whose player policy reads the choices from the connection.
+
+Protocol (UTF-8, one message per line):
+
+    server -> client:  MSG <text>     text to display
+                       ASK <prompt>   the server waits for one line
+                       ERR <text>     the last line was not understood
+                       BYE <text>     the session is over, the server closes
+    client -> server:  one line after each ASK
+
+The prompts are: 'name', 'starter', 'menu', 'action', 'replacement' and
+'catch', followed by the accepted answers.
+
+    python -m fighting.server --port 8765 [--store saves/server.db]
+    python -m fighting.server --unix /tmp/pokemon.sock
+"""
+
+import asyncio
+import contextlib
+import io
+
+from fighting.async_fight import AsyncFightingSystem
+from fighting.renderers import ConsoleRenderer
+from fighting.training import auto_train, team_level, wild_trainer
+from my_package.models.pokemon import FirePokemon, WaterPokemon, PlantPokemon, PokemonGenerator
+from my_package.models.trainer import Trainer
+from utils.game_serializer import GameSerializer
+
+
+# Seconds without any line from the player before the session is closed
+IDLE_TIMEOUT = 600.0
+
+# Most fights of one auto-battle (they run in the thread of the server)
+MAX_AUTO_FIGHTS = 1000
+
+# Connections waiting to be accepted (capped by net.core.somaxconn)
+BACKLOG = 1024
+
+MAX_NAME_LENGTH = 32
+
+STARTERS = {
+    '1': (FirePokemon, "Salamèche"),
+    '2': (WaterPokemon, "Carapuce"),
+    '3': (PlantPokemon, "Bulbizarre")
+}
+
+
+class SessionClosed(Exception):
+    """The player left, or was idle for too long"""
+
+
+class LineConnection:
+    """
+    Connection of a player: lines of the protocol over an asyncio stream
+
+    Attributes:
+        idle_timeout (float): Seconds to wait for an answer, None to wait forever
+    """
+
+    def __init__(self, reader, writer, idle_timeout=IDLE_TIMEOUT):
+        self._reader = reader
+        self._writer = writer
+        self.idle_timeout = idle_timeout
+
+    def send(self, kind, text=""):
+        """Queue a message (sent when the session next waits)"""
+        self._writer.write(f"{kind} {text}\n".encode('utf-8'))
+
+    def send_text(self, text):
+        """Queue a text of several lines, one MSG per line"""
+        for line in text.splitlines():
+            self.send("MSG", line)
+
+    async def ask(self, prompt):
+        """
+        Ask the player and wait for the answer without blocking the other sessions
+
+        Args:
+            prompt (str): Prompt and accepted answers
+
+        Returns:
+            str: The answer, stripped
+
+        Raises:
+            SessionClosed: If the connection is closed or idle for too long
+        """
+        self.send("ASK", prompt)
+        try:
+            await self._writer.drain()
+            line = await asyncio.wait_for(self._reader.readline(), self.idle_timeout)
+        except asyncio.TimeoutError:
+            self.send("BYE", "idle for too long")
+            raise SessionClosed("idle")
+        except (ConnectionError, asyncio.IncompleteReadError, ValueError) as e:
+            raise SessionClosed(str(e))
+
+        if not line:
+            raise SessionClosed("connection closed")
+        return line.decode('utf-8', errors='replace').strip()
+
+    async def close(self, message=None):
+        """Say goodbye and close the connection"""
+        try:
+            if message is not None:
+                self.send("BYE", message)
+            await self._writer.drain()
+            self._writer.close()
+            await self._writer.wait_closed()
+        except ConnectionError:
+            pass
+
+
+def captured(connection, function, *args):
+    """
+    Call a function of the game and send what it prints to the player
+
+    The functions of the models print to stdout. They never wait, so the
+    redirection only covers this call, not the other sessions.
+
+    Returns:
+        The value returned by the function
+    """
+    with contextlib.redirect_stdout(io.StringIO()) as output:
+        value = function(*args)
+    connection.send_text(output.getvalue())
+    return value
+
+
+class StreamRenderer(ConsoleRenderer):
+    """
+    Renderer sending the texts of ConsoleRenderer to the connection of a player
+
+    It never waits: no pause, no "Press Enter" between turns.
+    """
+
+    verbose = False
+
+    def __init__(self, connection):
+        """
+        Args:
+            connection (LineConnection): Connection of the player
+        """
+        self.connection = connection
+
+    def introduction(self, fight):
+        captured(self.connection, super().introduction, fight)
+
+    def turn_started(self, fight):
+        captured(self.connection, super().turn_started, fight)
+
+    def attack_resolved(self, fight, attacker, defender, result):
+        captured(self.connection, super().attack_resolved, fight, attacker, defender, result)
+
+    def pokemon_ko(self, fight, pokemon):
+        captured(self.connection, super().pokemon_ko, fight, pokemon)
+
+    def experience_gained(self, fight, pokemon, experience):
+        captured(self.connection, super().experience_gained, fight, pokemon, experience)
+
+    def level_up(self, fight, pokemon, levels):
+        captured(self.connection, super().level_up, fight, pokemon, levels)
+
+    def replacement_required(self, fight, trainer):
+        captured(self.connection, super().replacement_required, fight, trainer)
+
+    def pokemon_sent(self, fight, trainer):
+        captured(self.connection, super().pokemon_sent, fight, trainer)
+
+    def fled(self, fight, trainer):
+        captured(self.connection, super().fled, fight, trainer)
+
+    def fight_ended(self, fight, winner):
+        captured(self.connection, super().fight_ended, fight, winner)
+
+    def wait_player(self, prompt):
+        pass
+
+    def pause(self, seconds=0.5):
+        pass
+
+
+def _team_lines(trainer):
+    """Team of a trainer with the slot numbers used by the answers"""
+    lines = []
+    for i, pokemon in enumerate(trainer.team, 1):
+        marker = "VS" if pokemon is trainer.active_pokemon else "  "
+        state = "KO" if pokemon.ko else f"{pokemon.hp_actuals}/{pokemon.hp_max} HP"
+        lines.append(f"{marker} {i}. {pokemon.name} (Lvl.{pokemon.level}) - {state}")
+    return "\n".join(lines)
+
+
+class LinePolicy:
+    """Asynchronous policy of the player: the choices are read from the connection"""
+
+    def __init__(self, connection):
+        """
+        Args:
+            connection (LineConnection): Connection of the player
+        """
+        self.connection = connection
+
+    async def choose_action(self, fight, trainer, adversary):
+        """
+        Ask the action of the turn
+
+        Returns:
+            dict: Chosen action
+        """
+        self.connection.send_text(_team_lines(trainer))
+        while True:
+            words = (await self.connection.ask("action attack | change <n> | flee")).lower().split()
+            if not words or words[0] == 'attack':
+                return {'type': 'attack', 'trainer': trainer}
+            if words[0] == 'flee':
+                return {'type': 'flee', 'trainer': trainer}
+            if words[0] == 'change' and len(words) == 2 and words[1].isdigit():
+                return {'type': 'change', 'trainer': trainer, 'index': int(words[1]) - 1}
+            self.connection.send("ERR", "expected: attack, change <n> or flee")
+
+    async def choose_replacement(self, fight, trainer):
+        """
+        Ask the Pokemon sent after a KO
+
+        Returns:
+            int: Index of the chosen Pokemon, None for the first one able to fight
+        """
+        self.connection.send_text(_team_lines(trainer))
+        answer = await self.connection.ask(f"replacement <1-{len(trainer.team)}> (empty: first able to fight)")
+        if answer.isdigit():
+            return int(answer) - 1
+        return None
+
+
+class Session:
+    """
+    Game of one connected player
+
+    Same game as main.Game (the Game object holds the player, the arenas
+    and the random generator), with the menus read from the connection.
+
+    Attributes:
+        server (BattleServer): Server of the session
+        connection (LineConnection): Connection of the player
+        game (Game): State of the game
+        name (str): Name of the player once logged in
+        ready (bool): The game is loaded or the new team is complete (only then it is saved)
+    """
+
+    def __init__(self, server, connection, seed=None):
+        from main import Game
+
+        self.server = server
+        self.connection = connection
+        self.game = Game(seed)
+        self.name = None
+        self.ready = False
+
+    @property
+    def player(self):
+        return self.game.player
+
+    async def run(self):
+        """Play until the player quits or leaves"""
+        self.connection.send("MSG", "WELCOME TO THE THREE ARENAS CHALLENGE")
+        await self._login()
+
+        commands = {
+            'team': self._show_team,
+            'arenas': self._show_arenas,
+            'challenge': self._challenge,
+            'catch': self._catch,
+            'train': self._train,
+            'auto': self._auto_train
+        }
+
+        while True:
+            self.connection.send("MSG", f"Trainer: {self.player.name} | "
+                                        f"Badges obtained: {len(self.game.defeated_arenas)}/3")
+            words = (await self.connection.ask(
+                "menu team | arenas | challenge <n> | catch | train | auto <n> | quit")).lower().split()
+            if not words:
+                continue
+            if words[0] == 'quit':
+                self.save()
+                return
+            command = commands.get(words[0])
+            if command is None:
+                self.connection.send("ERR", f"unknown command '{words[0]}'")
+                continue
+            await command(*words[1:2])
+
+    async def _login(self):
+        """Ask the name of the player, resume the saved game or start a new one"""
+        while True:
+            name = await self.connection.ask("name")
+            if not name or len(name) > MAX_NAME_LENGTH:
+                self.connection.send("ERR", f"a name of 1 to {MAX_NAME_LENGTH} characters is needed")
+            elif name in self.server.sessions:
+                self.connection.send("ERR", f"{name} is already playing")
+            else:
+                break
+        self.name = name
+        self.server.sessions[name] = self
+
+        self.game.create_arenas()
+        save_data = self._load(name)
+        # A save without Pokemon cannot be played (written by an older server when a
+        # player left at the starter prompt): a new game replaces it
+        if save_data is not None and save_data['team']:
+            self.game.player, self.game.defeated_arenas = GameSerializer.deserialize(
+                save_data, self.game.arenas, trusted=True)
+            self.ready = True
+            self.connection.send("MSG", f"Welcome back, {name} !")
+            return
+
+        self.game.player = Trainer(name)
+        self.connection.send_text("1. Salamèche (Fire)\n2. Carapuce (Water)\n3. Bulbizarre (Plant)")
+        choice = await self.connection.ask("starter 1 | 2 | 3")
+        pokemon_class, starter_name = STARTERS.get(choice, STARTERS['1'])
+        self.player.add_pokemon(pokemon_class(starter_name, level=5))
+        self.connection.send("MSG", f"You have chosen {starter_name} !")
+
+        # The team is completed like Game.fill_team_randomly
+        while len(self.player.team) < 6:
+            pokemon = PokemonGenerator.generate_wild_pokemon(5, self.game.rng)
+            self.player.add_pokemon(pokemon)
+            self.connection.send("MSG", f"   ✓ {pokemon.name} joined your team!")
+        self.ready = True
+        self.save()
+
+    def _load(self, name):
+        if self.server.store is None:
+            return None
+        try:
+            return captured(self.connection, self.server.store.load_game, name)
+        except (ValueError, KeyError) as e:
+            self.connection.send("ERR", f"The save cannot be restored: {e}")
+            return None
+
+    def save(self):
+        """Save the game in the store of the server (if any) once the login is over"""
+        if self.server.store is not None and self.ready:
+            self.server.store.save_game(self.player, self.game.defeated_arenas, self.game.arenas)
+
+    async def _fight(self, opponent):
+        fight = AsyncFightingSystem(self.player, opponent, player_policy=LinePolicy(self.connection),
+                                    renderer=StreamRenderer(self.connection), rng=self.game.rng)
+        return await fight.play()
+
+    async def _show_team(self, *args):
+        for i, pokemon in enumerate(self.player.team, 1):
+            self.connection.send("MSG", f"{i}. {pokemon}")
+            self.connection.send("MSG", f"   XP: {pokemon.experience} | "
+                                        f"Next level in {pokemon.experience_to_next_level()} XP")
+
+    async def _show_arenas(self, *args):
+        for i, arena in enumerate(self.game.arenas, 1):
+            status = "**DEFEATED**" if arena in self.game.defeated_arenas else "**TO CHALLENGE**"
+            self.connection.send("MSG", f"{i}. {status} - {arena.name} ({arena.type_arena}, "
+                                        f"champion {arena.champion_name})")
+
+    async def _challenge(self, number=None):
+        """Fight the floors of an arena (same rules as Game.challenge_arena_with_floors)"""
+        arenas = self.game.arenas
+        if number is None or not number.isdigit() or not 1 <= int(number) <= len(arenas):
+            self.connection.send("ERR", f"expected: challenge <1-{len(arenas)}>")
+            return
+        arena = arenas[int(number) - 1]
+        if arena in self.game.defeated_arenas:
+            self.connection.send("ERR", f"{arena.name} is already defeated")
+            return
+
+        captured(self.connection, arena.challenge)
+        for floor_num in range(1, 4):
+            if not arena.is_floor_accessible(floor_num):
+                continue
+
+            floor = arena.floors[floor_num - 1]
+            self.connection.send("MSG", f"CHALLENGE: FLOOR {floor_num} - {floor.description}")
+            if await self._fight(floor.trainer):
+                captured(self.connection, floor.player_victory_floor)
+                captured(self.connection, arena.player_victory_floor, floor_num)
+                if floor_num == 3:
+                    captured(self.connection, arena.player_victory)
+                    self.game.defeated_arenas.append(arena)
+                    self.save()
+                    break
+            else:
+                captured(self.connection, arena.player_defeat_floor, floor_num)
+                for floor_to_reset in arena.floors:
+                    captured(self.connection, floor_to_reset.reset_floor)
+                self.save()
+                break
+
+            captured(self.connection, self.player.heal_team)
+            self.save()
+
+    async def _catch(self, *args):
+        """Catch one of three wild Pokemon (team of 6 at most)"""
+        if len(self.player.team) >= 6:
+            self.connection.send("ERR", "Your team is full (6/6 Pokemon)!")
+            return
+
+        options = PokemonGenerator.generate_many(3, 5, self.game.rng)
+        for i, pokemon in enumerate(options, 1):
+            self.connection.send("MSG", f"{i}. {pokemon.name} ({pokemon.type_pokemon}) - Lvl.{pokemon.level} | "
+                                        f"HP: {pokemon.hp_max} | Attack: {pokemon.attack} | "
+                                        f"Defense: {pokemon.defense}")
+        answer = await self.connection.ask("catch 1 | 2 | 3 | skip")
+        if answer in ('1', '2', '3'):
+            pokemon = options[int(answer) - 1].to_pokemon()
+            self.player.add_pokemon(pokemon)
+            self.connection.send("MSG", f"✓ You caught {pokemon.name}!")
+            self.save()
+        else:
+            self.connection.send("MSG", "You left the Pokemon alone.")
+
+    async def _train(self, *args):
+        """One fight against a wild Pokemon"""
+        opponent = wild_trainer(team_level(self.player), self.game.rng)
+        self.connection.send("MSG", f"A wild {opponent.active_pokemon.name} appears!")
+        await self._fight(opponent)
+        captured(self.connection, self.player.heal_team)
+        self.save()
+
+    async def _auto_train(self, number=None):
+        """Auto-battle of several fights (see fighting.training.auto_train)"""
+        n_fights = int(number) if number is not None and number.isdigit() else 50
+        n_fights = min(n_fights, MAX_AUTO_FIGHTS)
+        report = auto_train(self.player, n_fights, self.game.rng, pool=self.game.pokemon_pool)
+        self.connection.send_text(report.summary(self.player))
+        self.save()
+
+
+class BattleServer:
+    """
+    Server of the game sessions, one per connection, in one asyncio loop
+
+    Attributes:
+        store (SaveStore): Saves of the players, None to keep nothing
+        seed (int): Seed of the first session (the next ones use seed + 1...), None for random games
+        idle_timeout (float): Seconds without answer before a session is closed
+        sessions (dict): Sessions of the connected players by name
+        sessions_served (int): Connections handled since the start
+    """
+
+    def __init__(self, store=None, seed=None, idle_timeout=IDLE_TIMEOUT):
+        self.store = store
+        self.seed = seed
+        self.idle_timeout = idle_timeout
+        self.sessions = {}
+        self.sessions_served = 0
+        self._server = None
+
+    async def start(self, host='127.0.0.1', port=0, path=None, backlog=BACKLOG):
+        """
+        Listen on a local TCP port or a Unix socket
+
+        Args:
+            host (str): Address to listen on
+            port (int): TCP port, 0 for any free port
+            path (str): Path of a Unix socket (instead of TCP)
+            backlog (int): Connections waiting to be accepted; with the
+                default of asyncio (100) a burst of clients overflows the
+                queue and the extra connections stall
+
+        Returns:
+            BattleServer: The server, listening
+        """
+        if path is not None:
+            self._server = await asyncio.start_unix_server(self._handle, path=path, backlog=backlog)
+        else:
+            self._server = await asyncio.start_server(self._handle, host, port, backlog=backlog)
+        return self
+
+    @property
+    def address(self):
+        """Address listened on: (host, port) or the path of the Unix socket"""
+        return self._server.sockets[0].getsockname()
+
+    async def serve_forever(self):
+        await self._server.serve_forever()
+
+    async def close(self):
+        """Stop listening (the sessions in progress are cancelled by the loop)"""
+        self._server.close()
+        await self._server.wait_closed()
+
+    async def _handle(self, reader, writer):
+        """Play the session of a new connection"""
+        seed = None if self.seed is None else self.seed + self.sessions_served
+        self.sessions_served += 1
+
+        connection = LineConnection(reader, writer, self.idle_timeout)
+        session = Session(self, connection, seed)
+        try:
+            await session.run()
+            await connection.close("See you soon !")
+        except SessionClosed:
+            session.save()
+            await connection.close()
+        except Exception:
+            await connection.close("server error")
+            raise
+        finally:
+            if session.name is not None and self.sessions.get(session.name) is session:
+                del self.sessions[session.name]
+
+
+def main():
+    """Run the server until interrupted"""
+    import argparse
+    from utils.save_store import SaveStore
+
+    parser = argparse.ArgumentParser(description="Battle server of the three arenas challenge")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--unix", help="path of a Unix socket (instead of TCP)")
+    parser.add_argument("--store", help="SQLite file of the saves (default: no saves)")
+    parser.add_argument("--seed", type=int, default=None)
+    parser.add_argument("--idle-timeout", type=float, default=IDLE_TIMEOUT)
+    args = parser.parse_args()
+
+    store = SaveStore(args.store) if args.store else None
+
+    async def serve():
+        server = await BattleServer(store, args.seed, args.idle_timeout).start(args.host, args.port, args.unix)
+        print(f"Battle server listening on {server.address}")
+        await server.serve_forever()
+
+    try:
+        asyncio.run(serve())
+    except KeyboardInterrupt:
+        pass
+    finally:
+        if store is not None:
+            store.close()
+
+
+if __name__ == "__main__":
+    main()
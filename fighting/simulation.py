@@ -0,0 +1,396 @@
+"""
+fighting/simulation.py
+Monte Carlo simulation of headless fights against the floors of the arenas
+"""
+
+import math
+import os
+import random
+from collections import Counter
+from multiprocessing import Pool
+
+from fighting.fighting_system import FightingSystem
+from my_package.models.battle_ai import ExpectimaxAI
+from my_package.models.pokemon import PokemonFactory
+from my_package.models.trainer import Trainer, Champion
+from utils.rng import make_rng, spawn_seeds
+
+
+# Number of fights played by a worker task
+CHUNK_SIZE = 2000
+
+# Turns before a simulated fight is declared a draw
+MAX_TURNS = 500
+
+
+def team_spec(trainer):
+    """
+    Describe the team of a trainer as picklable tuples
+
+    Args:
+        trainer (Trainer): Trainer to describe
+
+    Returns:
+        list: List of tuples (name, type, level), see PokemonFactory.create_team
+    """
+    return [(pokemon.name, pokemon.type_pokemon, pokemon.level) for pokemon in trainer.team]
+
+
+def opponent_spec(trainer):
+    """
+    Describe an adversary trainer as picklable tuples
+
+    Args:
+        trainer (Trainer): Trainer of a floor (generally a Champion)
+
+    Returns:
+        tuple: (name, type_affinity, team spec, ai config), type_affinity is None for a
+            Trainer, ai config is None for the simple IA (see ExpectimaxAI.config)
+    """
+    ai = getattr(trainer, 'ai', None)
+    return (trainer.name, getattr(trainer, 'type_affinity', None), team_spec(trainer),
+            None if ai is None else ai.config())
+
+
+def _build_trainer(name, list_pokemon, type_affinity=None, ai_config=None):
+    """Create a Trainer (or a Champion if a type affinity is given, with its IA) with its team"""
+    if type_affinity is None:
+        trainer = Trainer(name)
+    else:
+        trainer = Champion(name, type_affinity, ai=None if ai_config is None else ExpectimaxAI(**ai_config))
+    for pokemon in PokemonFactory.create_team(list_pokemon):
+        trainer.add_pokemon(pokemon)
+    return trainer
+
+
+def _reset_trainer(trainer):
+    """Heal the team silently and send the first Pokemon again"""
+    for pokemon in trainer.team:
+        pokemon.heal()
+    trainer.active_pokemon = trainer.team[0] if trainer.team else None
+
+
+def _simulate_chunk(task):
+    """
+    Play a chunk of fights in a worker
+
+    Every chunk has its own random generator created from its seed, so
+    it is reproducible and independent from the other workers.
+
+    Args:
+        task (tuple): (key, player spec, opponent spec, number of fights, seed, use_numpy)
+
+    Returns:
+        tuple: (key, wins, draws, turns Counter, damage dealt Counter, damage taken Counter)
+    """
+    key, player_list, (opponent_name, type_affinity, opponent_list, ai_config), n_fights, seed, use_numpy = task
+    rng = make_rng(seed, use_numpy)
+
+    player = _build_trainer("Player", player_list)
+    opponent = _build_trainer(opponent_name, opponent_list, type_affinity, ai_config)
+
+    wins = 0
+    draws = 0
+    turns = Counter()
+    damage_dealt = Counter()
+    damage_taken = Counter()
+
+    for _ in range(n_fights):
+        _reset_trainer(player)
+        _reset_trainer(opponent)
+
+        fight = FightingSystem.headless(player, opponent, max_turns=MAX_TURNS, rng=rng, apply_experience=False,
+                                        statistics=True)
+        if fight.start():
+            wins += 1
+        elif fight.winner is None:
+            draws += 1
+
+        turns[fight.current_turn] += 1
+        damage_dealt[fight.total_damage_trainer1] += 1
+        damage_taken[fight.total_damage_trainer2] += 1
+
+    return key, wins, draws, turns, damage_dealt, damage_taken
+
+
+def _chunk_seeds(seed, n_fights, chunk_size):
+    """Split n_fights into chunks, each with its own seed derived from seed"""
+    n_chunks = -(-n_fights // chunk_size)  # Rounded up
+    sizes = [min(chunk_size, n_fights - i * chunk_size) for i in range(n_chunks)]
+    return list(zip(sizes, spawn_seeds(seed, n_chunks)))
+
+
+class Distribution:
+    """
+    Summary of an integer distribution stored as a Counter {value: count}
+
+    Attributes:
+        counts (Counter): Number of occurrences of each value
+        total (int): Number of samples
+        mean (float): Mean value
+        stdev (float): Standard deviation
+    """
+
+    def __init__(self, counts):
+        self.counts = counts
+        self.total = sum(counts.values())
+
+        if self.total:
+            self.mean = sum(value * count for value, count in counts.items()) / self.total
+            variance = sum(count * (value - self.mean) ** 2 for value, count in counts.items()) / self.total
+            self.stdev = math.sqrt(variance)
+        else:
+            self.mean = 0.0
+            self.stdev = 0.0
+
+    def percentile(self, p):
+        """
+        Value below which p percent of the samples fall
+
+        Args:
+            p (float): Percentage (0-100)
+
+        Returns:
+            int: Percentile value, 0 if there is no sample
+        """
+        if not self.total:
+            return 0
+
+        threshold = p / 100 * self.total
+        seen = 0
+        for value in sorted(self.counts):
+            seen += self.counts[value]
+            if seen >= threshold:
+                return value
+        return max(self.counts)
+
+    def to_dict(self):
+        return {
+            'mean': self.mean,
+            'stdev': self.stdev,
+            'min': min(self.counts) if self.total else 0,
+            'p50': self.percentile(50),
+            'p90': self.percentile(90),
+            'max': max(self.counts) if self.total else 0
+        }
+
+    def __str__(self):
+        return (f"mean {self.mean:.1f} ± {self.stdev:.1f} "
+                f"(p50 {self.percentile(50)}, p90 {self.percentile(90)})")
+
+
+class SimulationReport:
+    """
+    Result of the simulated fights against one trainer
+
+    Attributes:
+        opponent (str): Name of the adversary trainer
+        floor (int): Floor number of the adversary, None outside an arena
+        fights (int): Number of fights played
+        wins (int): Number of fights won by the player
+        draws (int): Number of fights stopped after MAX_TURNS
+        turns (Distribution): Number of turns per fight
+        damage_dealt (Distribution): Damage inflicted by the player per fight
+        damage_taken (Distribution): Damage inflicted by the adversary per fight
+    """
+
+    def __init__(self, opponent, floor=None):
+        self.opponent = opponent
+        self.floor = floor
+        self.fights = 0
+        self.wins = 0
+        self.draws = 0
+        self._turns = Counter()
+        self._damage_dealt = Counter()
+        self._damage_taken = Counter()
+
+    def add_chunk(self, wins, draws, turns, damage_dealt, damage_taken):
+        """Merge the result of a worker chunk into the report"""
+        self.fights += sum(turns.values())
+        self.wins += wins
+        self.draws += draws
+        self._turns.update(turns)
+        self._damage_dealt.update(damage_dealt)
+        self._damage_taken.update(damage_taken)
+
+    @property
+    def win_rate(self):
+        return self.wins / self.fights if self.fights else 0.0
+
+    def confidence_interval(self, z=1.96):
+        """
+        Wilson score interval of the win rate
+
+        Args:
+            z (float): Normal quantile (1.96 for 95%)
+
+        Returns:
+            tuple: (lower bound, upper bound)
+        """
+        if not self.fights:
+            return (0.0, 0.0)
+
+        n = self.fights
+        p = self.win_rate
+        denominator = 1 + z * z / n
+        center = (p + z * z / (2 * n)) / denominator
+        margin = z * math.sqrt(p * (1 - p) / n + z * z / (4 * n * n)) / denominator
+        return (max(0.0, center - margin), min(1.0, center + margin))
+
+    @property
+    def turns(self):
+        return Distribution(self._turns)
+
+    @property
+    def damage_dealt(self):
+        return Distribution(self._damage_dealt)
+
+    @property
+    def damage_taken(self):
+        return Distribution(self._damage_taken)
+
+    def to_dict(self):
+        low, high = self.confidence_interval()
+        return {
+            'opponent': self.opponent,
+            'floor': self.floor,
+            'fights': self.fights,
+            'wins': self.wins,
+            'draws': self.draws,
+            'win_rate': self.win_rate,
+            'confidence_interval': [low, high],
+            'turns': self.turns.to_dict(),
+            'damage_dealt': self.damage_dealt.to_dict(),
+            'damage_taken': self.damage_taken.to_dict()
+        }
+
+    def __str__(self):
+        low, high = self.confidence_interval()
+        where = f"Floor {self.floor} - " if self.floor else ""
+        return (f"{where}{self.opponent}: {self.win_rate:.1%} wins "
+                f"[{low:.1%}, {high:.1%}] over {self.fights} fights\n"
+                f"   Turns: {self.turns}\n"
+                f"   Damage dealt: {self.damage_dealt}\n"
+                f"   Damage taken: {self.damage_taken}")
+
+
+def _run_tasks(tasks, reports, processes):
+    """Play the tasks in a pool (or in process if processes == 1) and fill the reports"""
+    if processes == 1:
+        results = map(_simulate_chunk, tasks)
+        for key, *chunk in results:
+            reports[key].add_chunk(*chunk)
+        return
+
+    with Pool(processes) as pool:
+        for key, *chunk in pool.imap_unordered(_simulate_chunk, tasks):
+            reports[key].add_chunk(*chunk)
+
+
+def simulate_arenas(player, arenas, n_fights, seed=None, processes=None, chunk_size=CHUNK_SIZE,
+                    use_numpy=False):
+    """
+    Simulate n_fights fights of the player team against every floor of the arenas
+
+    All the floors share the same pool so the workers stay busy.
+    The same seed gives the same reports whatever the number of processes,
+    except against a champion with an ExpectimaxAI: the time budget of the
+    IA makes its decisions depend on the speed of the machine.
+
+    Args:
+        player (Trainer or list): Player trainer, or its team spec
+        arenas (list): Arenas to simulate
+        n_fights (int): Number of fights per floor
+        seed (int): Seed of the simulation, None for a random one
+        processes (int): Number of worker processes (default: number of CPUs)
+        chunk_size (int): Number of fights per worker task
+        use_numpy (bool): Draw the random numbers with NumpyRandom (faster, other stream)
+
+    Returns:
+        dict: {arena name: [SimulationReport of each floor]}
+    """
+    player_list = player if isinstance(player, list) else team_spec(player)
+    seeder = random.Random(seed)
+    processes = processes or os.cpu_count() or 1
+
+    reports = {}
+    tasks = []
+    for arena in arenas:
+        for floor in arena.floors:
+            key = (arena.name, floor.number)
+            reports[key] = SimulationReport(floor.trainer.name, floor.number)
+            spec = opponent_spec(floor.trainer)
+            for size, chunk_seed in _chunk_seeds(seeder.getrandbits(64), n_fights, chunk_size):
+                tasks.append((key, player_list, spec, size, chunk_seed, use_numpy))
+
+    _run_tasks(tasks, reports, processes)
+
+    results = {}
+    for (arena_name, _), report in reports.items():
+        results.setdefault(arena_name, []).append(report)
+    return results
+
+
+def simulate_arena(player, arena, n_fights, seed=None, processes=None, chunk_size=CHUNK_SIZE,
+                   use_numpy=False):
+    """
+    Simulate n_fights fights of the player team against each floor of an arena
+
+    Returns:
+        list: SimulationReport of each floor
+    """
+    return simulate_arenas(player, [arena], n_fights, seed, processes, chunk_size, use_numpy)[arena.name]
+
+
+def simulate_fights(player, opponent, n_fights, seed=None, processes=None, chunk_size=CHUNK_SIZE,
+                    use_numpy=False):
+    """
+    Simulate n_fights fights of the player team against one trainer
+
+    Returns:
+        SimulationReport: Result of the fights
+    """
+    player_list = player if isinstance(player, list) else team_spec(player)
+    processes = processes or os.cpu_count() or 1
+
+    reports = {opponent.name: SimulationReport(opponent.name)}
+    spec = opponent_spec(opponent)
+    tasks = [(opponent.name, player_list, spec, size, chunk_seed, use_numpy)
+             for size, chunk_seed in _chunk_seeds(seed, n_fights, chunk_size)]
+
+    _run_tasks(tasks, reports, processes)
+    return reports[opponent.name]
+
+
+def main():
+    """Simulate a starter team against the arenas of the game"""
+    import argparse
+    from main import Game
+
+    parser = argparse.ArgumentParser(description="Monte Carlo simulation of the arena floors")
+    parser.add_argument("--fights", type=int, default=10000, help="fights per floor")
+    parser.add_argument("--level", type=int, default=12, help="level of the player team")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--processes", type=int, default=None)
+    parser.add_argument("--numpy", action="store_true", help="use the NumPy random generator")
+    args = parser.parse_args()
+
+    player_list = [("Salamèche", "Fire", args.level),
+                   ("Carapuce", "Water", args.level),
+                   ("Bulbizarre", "Plant", args.level)]
+
+    game = Game()
+    game.create_arenas()
+
+    results = simulate_arenas(player_list, game.arenas, args.fights, args.seed, args.processes,
+                              use_numpy=args.numpy)
+    for arena_name, reports in results.items():
+        print(f"\n{'='*70}")
+        print(arena_name)
+        print(f"{'='*70}")
+        for report in reports:
+            print(report)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,743 @@
+"""
+fighting/tournament.py
+Tournaments between registered teams (round-robin, single or double elimination)
+played in a process pool, ranked with Elo ratings
+
+    python -m fighting.tournament --teams 64 --format double --games 3
+"""
+
+import json
+import math
+import os
+import time
+from collections import Counter
+from concurrent.futures import FIRST_COMPLETED, Future, ProcessPoolExecutor, wait
+
+from fighting.fighting_system import FightingSystem
+from fighting.policies import ChampionPolicy
+from fighting.simulation import MAX_TURNS, _build_trainer, _reset_trainer, opponent_spec
+from utils.rng import make_rng, spawn_seeds
+
+
+FORMATS = ('round_robin', 'single_elimination', 'double_elimination')
+
+# Matches played by a worker task (the matches of a bracket round are
+# grouped the same way when they are ready at the same time)
+TASK_SIZE = 128
+
+# Elo parameters: rating of a new team and maximum change per match
+DEFAULT_RATING = 1500.0
+K_FACTOR = 32.0
+
+
+# Teams of the tournament in a worker, sent once by the pool initializer
+_worker_specs = None
+_worker_trainers = {}
+_worker_games = 1
+_worker_use_numpy = False
+
+
+def _init_worker(specs, games, use_numpy):
+    """Receive the teams and the rules of the tournament in a worker"""
+    global _worker_specs, _worker_trainers, _worker_games, _worker_use_numpy
+    _worker_specs = specs
+    _worker_trainers = {}
+    _worker_games = games
+    _worker_use_numpy = use_numpy
+
+
+def _worker_trainer(index):
+    """Trainer of a registered team, built once per worker then healed before each fight"""
+    trainer = _worker_trainers.get(index)
+    if trainer is None:
+        name, type_affinity, list_pokemon, ai_config = _worker_specs[index]
+        trainer = _worker_trainers[index] = _build_trainer(name, list_pokemon, type_affinity, ai_config)
+    return trainer
+
+
+def _play_match(a, b, seed):
+    """
+    Play the games of a match between two registered teams
+
+    Both teams are played by ChampionPolicy and change side every game,
+    the first trainer acting first when the speeds are equal.
+
+    Returns:
+        tuple: (wins of a, wins of b, draws)
+    """
+    rng = make_rng(seed, _worker_use_numpy)
+    trainer_a = _worker_trainer(a)
+    trainer_b = _worker_trainer(b)
+    wins_a = wins_b = draws = 0
+
+    for game in range(_worker_games):
+        first, second = (trainer_a, trainer_b) if game % 2 == 0 else (trainer_b, trainer_a)
+        _reset_trainer(first)
+        _reset_trainer(second)
+
+        fight = FightingSystem.headless(first, second, ChampionPolicy(), ChampionPolicy(),
+                                        max_turns=MAX_TURNS, rng=rng, apply_experience=False)
+        fight.start()
+        if fight.winner is None:
+            draws += 1
+        elif fight.winner is trainer_a:
+            wins_a += 1
+        else:
+            wins_b += 1
+
+    return wins_a, wins_b, draws
+
+
+def _play_matches(batch):
+    """
+    Play a task of matches in a worker
+
+    Args:
+        batch (list): Tuples (match id, team a, team b, seed)
+
+    Returns:
+        list: Tuples (match id, wins of a, wins of b, draws)
+    """
+    return [(match_id, *_play_match(a, b, seed)) for match_id, a, b, seed in batch]
+
+
+class Match:
+    """
+    Match of a tournament, a node of the dependency graph of the event
+
+    Each side of a match comes from a source: ('team', index) for a team
+    known from the start, ('winner', match) or ('loser', match) for the
+    result of an earlier match. A match is played as soon as both of its
+    sources are decided; a side without team (bye) lets the other side
+    through without playing.
+
+    Attributes:
+        id (int): Number of the match, in the order of the rounds
+        round (str): Round of the match ('R3', 'W1', 'L2', 'GF'...)
+        sources (tuple): Sources of the two sides
+        teams (list): Index of the team of each side, None for a bye
+        wins (list): Games won by each side
+        draws (int): Games stopped after MAX_TURNS
+        winner (int): Index of the winning team, None for a draw or a double bye
+        loser (int): Index of the losing team, None for a draw or a bye
+        played (bool): The games have been played
+        decided (bool): The result is known (played, bye or not needed)
+        reset (bool): Bracket reset of a double elimination: played only if
+            the team coming from the losers bracket wins the grand final
+    """
+
+    __slots__ = ('id', 'round', 'sources', 'teams', 'wins', 'draws', 'winner', 'loser', 'played', 'decided',
+                 'reset')
+
+    def __init__(self, match_id, round_name, source1, source2, reset=False):
+        self.id = match_id
+        self.round = round_name
+        self.sources = (source1, source2)
+        self.teams = [None, None]
+        self.wins = [0, 0]
+        self.draws = 0
+        self.winner = None
+        self.loser = None
+        self.played = False
+        self.decided = False
+        self.reset = reset
+
+    def dependencies(self):
+        """Matches whose result decides a side of this one"""
+        return [source for kind, source in self.sources if kind != 'team']
+
+    def _resolve_teams(self):
+        """Teams of both sides, once the sources are decided"""
+        for side, (kind, source) in enumerate(self.sources):
+            if kind == 'team':
+                self.teams[side] = source
+            elif kind == 'winner':
+                self.teams[side] = source.winner
+            else:
+                self.teams[side] = source.loser
+
+    def prepare(self):
+        """
+        Settle the match without playing it when possible
+
+        Returns:
+            bool: True if the match must be played
+        """
+        self._resolve_teams()
+        team1, team2 = self.teams
+
+        if self.reset:
+            grand_final = self.sources[0][1]
+            if grand_final.winner == grand_final.teams[0]:
+                # The unbeaten team won the grand final: no reset
+                self.winner, self.loser = grand_final.winner, grand_final.loser
+                self.decided = True
+                return False
+
+        if team1 is None or team2 is None:
+            self.winner = team1 if team2 is None else team2
+            self.decided = True
+            return False
+
+        return True
+
+    def record(self, wins1, wins2, draws, tie_break=False):
+        """
+        Store the result of the games
+
+        Args:
+            wins1 (int): Games won by the first side
+            wins2 (int): Games won by the second side
+            draws (int): Games stopped after MAX_TURNS
+            tie_break (bool): A tie goes to the first side (the better seed)
+                instead of being a draw
+        """
+        self.wins = [wins1, wins2]
+        self.draws = draws
+        self.played = True
+        self.decided = True
+
+        if wins1 > wins2 or (wins1 == wins2 and tie_break):
+            self.winner, self.loser = self.teams
+        elif wins2 > wins1:
+            self.loser, self.winner = self.teams
+
+    @property
+    def score(self):
+        """Elo score of the first side: 1 win, 0.5 draw, 0 loss"""
+        if self.wins[0] == self.wins[1]:
+            return 0.5
+        return 1.0 if self.wins[0] > self.wins[1] else 0.0
+
+
+class EloRatings:
+    """
+    Elo rating of every team, kept from one tournament to the next
+
+    Attributes:
+        ratings (dict): Rating of each team name
+        matches (Counter): Rated matches of each team name
+        k_factor (float): Maximum change of a rating per match
+    """
+
+    def __init__(self, k_factor=K_FACTOR):
+        self.ratings = {}
+        self.matches = Counter()
+        self.k_factor = k_factor
+
+    def rating(self, name):
+        return self.ratings.get(name, DEFAULT_RATING)
+
+    def expected(self, name1, name2):
+        """
+        Expected score of name1 against name2
+
+        Returns:
+            float: Probability of a win of name1 (a draw counting half)
+        """
+        return 1.0 / (1.0 + math.pow(10.0, (self.rating(name2) - self.rating(name1)) / 400.0))
+
+    def record(self, name1, name2, score):
+        """
+        Update the ratings after a match
+
+        Args:
+            name1 (str): First team
+            name2 (str): Second team
+            score (float): Score of name1 (1 win, 0.5 draw, 0 loss)
+        """
+        change = self.k_factor * (score - self.expected(name1, name2))
+        self.ratings[name1] = self.rating(name1) + change
+        self.ratings[name2] = self.rating(name2) - change
+        self.matches[name1] += 1
+        self.matches[name2] += 1
+
+    def ranking(self):
+        """
+        Teams sorted by rating
+
+        Returns:
+            list: Tuples (name, rating, matches), best rating first
+        """
+        return sorted(((name, rating, self.matches[name]) for name, rating in self.ratings.items()),
+                      key=lambda row: (-row[1], row[0]))
+
+    def to_dict(self):
+        return {
+            'k_factor': self.k_factor,
+            'ratings': {name: {'rating': rating, 'matches': self.matches[name]}
+                        for name, rating in self.ratings.items()}
+        }
+
+    @classmethod
+    def from_dict(cls, data):
+        """
+        Rebuild the ratings from to_dict()
+
+        Raises:
+            ValueError: If the data are not ratings
+        """
+        try:
+            ratings = cls(float(data.get('k_factor', K_FACTOR)))
+            for name, entry in data['ratings'].items():
+                ratings.ratings[name] = float(entry['rating'])
+                ratings.matches[name] = int(entry['matches'])
+        except (AttributeError, KeyError, TypeError, ValueError) as e:
+            raise ValueError(f"Invalid ratings: {e}") from e
+        return ratings
+
+    def save(self, path):
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(self.to_dict(), f, indent=2, ensure_ascii=False)
+
+    @classmethod
+    def load(cls, path):
+        """
+        Read ratings written by save()
+
+        Raises:
+            OSError: If the file cannot be read
+            ValueError: If the file does not contain ratings
+        """
+        with open(path, encoding='utf-8') as f:
+            try:
+                data = json.load(f)
+            except json.JSONDecodeError as e:
+                raise ValueError(f"Invalid ratings file {path}: {e}") from e
+        return cls.from_dict(data)
+
+
+def round_robin_rounds(n_teams):
+    """
+    Pair every team with every other one, round by round (circle method)
+
+    Args:
+        n_teams (int): Number of teams
+
+    Returns:
+        list: One list of pairs (team index, team index) per round, a team
+            plays at most once per round
+    """
+    slots = list(range(n_teams))
+    if n_teams % 2:
+        slots.append(None)  # The team facing None rests this round
+
+    rounds = []
+    for _ in range(len(slots) - 1):
+        half = len(slots) // 2
+        pairs = [(slots[i], slots[-1 - i]) for i in range(half)]
+        rounds.append([pair for pair in pairs if None not in pair])
+        # The first slot stays, the others turn
+        slots = [slots[0], slots[-1]] + slots[1:-1]
+    return rounds
+
+
+def bracket_order(size):
+    """
+    Order of the seeds on the first round of a bracket
+
+    The best seeds only meet in the last rounds: with 8 places the order is
+    [0, 7, 3, 4, 1, 6, 2, 5] (0 is the best seed).
+
+    Args:
+        size (int): Number of places, a power of 2
+
+    Returns:
+        list: Seed of each place
+    """
+    order = [0]
+    while len(order) < size:
+        total = 2 * len(order) - 1
+        order = [seed for top in order for seed in (top, total - top)]
+    return order
+
+
+class TournamentResult:
+    """
+    Result of a tournament
+
+    Attributes:
+        format (str): One of FORMATS
+        names (list): Name of each team, by index
+        matches (list): Match of the event, by id
+        elapsed (float): Duration of the event in seconds
+    """
+
+    def __init__(self, tournament_format, names, matches, elapsed):
+        self.format = tournament_format
+        self.names = names
+        self.matches = matches
+        self.elapsed = elapsed
+
+    @property
+    def played(self):
+        """Matches actually played (without byes and skipped resets)"""
+        return [match for match in self.matches if match.played]
+
+    @property
+    def champion(self):
+        """Name of the winner of the event, None if a round-robin ends tied"""
+        if self.format == 'round_robin':
+            table = self.table()
+            if not table or (len(table) > 1 and table[0]['points'] == table[1]['points']):
+                return None
+            return table[0]['name']
+
+        winner = self.matches[-1].winner if self.matches else None
+        return None if winner is None else self.names[winner]
+
+    def table(self):
+        """
+        Standings of the teams: 1 point a win, 0.5 a draw
+
+        Returns:
+            list: Dicts name, played, wins, draws, losses, points, best first
+        """
+        rows = [{'name': name, 'played': 0, 'wins': 0, 'draws': 0, 'losses': 0, 'points': 0.0}
+                for name in self.names]
+
+        for match in self.played:
+            score = match.score
+            for side, team in enumerate(match.teams):
+                row = rows[team]
+                side_score = score if side == 0 else 1.0 - score
+                row['played'] += 1
+                row['points'] += side_score
+                if side_score == 1.0:
+                    row['wins'] += 1
+                elif side_score == 0.0:
+                    row['losses'] += 1
+                else:
+                    row['draws'] += 1
+
+        return sorted(rows, key=lambda row: (-row['points'], -row['wins'], row['name']))
+
+    def to_dict(self):
+        return {
+            'format': self.format,
+            'champion': self.champion,
+            'elapsed': self.elapsed,
+            'table': self.table(),
+            'matches': [{'id': match.id,
+                         'round': match.round,
+                         'teams': [None if team is None else self.names[team] for team in match.teams],
+                         'wins': match.wins,
+                         'draws': match.draws,
+                         'winner': None if match.winner is None else self.names[match.winner]}
+                        for match in self.played]
+        }
+
+    def __str__(self):
+        champion = self.champion or "no champion (tie)"
+        lines = [f"{self.format.replace('_', ' ').capitalize()}: {len(self.names)} teams, "
+                 f"{len(self.played)} matches in {self.elapsed:.2f}s - champion: {champion}"]
+        for rank, row in enumerate(self.table()[:10], 1):
+            lines.append(f"{rank:>4}. {row['name']:<24}{row['points']:>6.1f} pts "
+                         f"({row['wins']}W {row['draws']}D {row['losses']}L)")
+        return "\n".join(lines)
+
+
+class Tournament:
+    """
+    Tournaments between registered trainers, played with the FightingSystem rules
+
+    The matches are played in a ProcessPoolExecutor. A match is sent to
+    the pool as soon as the matches deciding its two teams are over, so
+    a bracket round starts while the rest of the previous round is still
+    being played. The same seed gives the same results whatever the number
+    of processes: every match has its own seed, and the ratings are updated
+    in the order of the matches once the event is over. A champion keeps
+    its ExpectimaxAI in the workers; the time budget of the IA makes its
+    decisions depend on the speed of the machine.
+
+    Attributes:
+        names (list): Name of each registered team, by index
+        specs (list): Picklable spec of each team (see simulation.opponent_spec)
+        ratings (EloRatings): Ratings updated by every event
+        games_per_match (int): Games of a match, the teams changing side every game
+        seed (int): Seed of the tournament, None for a random one
+        processes (int): Number of worker processes, 1 to play in process
+        use_numpy (bool): Draw the random numbers with NumpyRandom
+    """
+
+    def __init__(self, ratings=None, games_per_match=1, seed=None, processes=None, use_numpy=False):
+        if games_per_match < 1:
+            raise ValueError("A match needs at least one game")
+
+        self.names = []
+        self.specs = []
+        self.ratings = ratings if ratings is not None else EloRatings()
+        self.games_per_match = games_per_match
+        self.seed = seed
+        self.processes = processes or os.cpu_count() or 1
+        self.use_numpy = use_numpy
+        self._events = 0
+
+    def register(self, trainer):
+        """
+        Register the team of a trainer (copied: later changes are ignored)
+
+        Args:
+            trainer (Trainer): Trainer with at least one Pokemon
+
+        Raises:
+            ValueError: If the trainer has no Pokemon or its name is already registered
+        """
+        if not trainer.team:
+            raise ValueError(f"{trainer.name} has no Pokemon")
+        if trainer.name in self.names:
+            raise ValueError(f"{trainer.name} is already registered")
+
+        self.names.append(trainer.name)
+        self.specs.append(opponent_spec(trainer))
+
+    def run(self, tournament_format):
+        """
+        Play an event
+
+        Args:
+            tournament_format (str): One of FORMATS
+
+        Returns:
+            TournamentResult: Result of the event
+
+        Raises:
+            ValueError: If the format is unknown or less than 2 teams are registered
+        """
+        builders = {'round_robin': self._round_robin_matches,
+                    'single_elimination': self._single_elimination_matches,
+                    'double_elimination': self._double_elimination_matches}
+        if tournament_format not in builders:
+            raise ValueError(f"Unknown format {tournament_format!r}, expected one of {', '.join(FORMATS)}")
+        if len(self.names) < 2:
+            raise ValueError("A tournament needs at least 2 teams")
+
+        start = time.perf_counter()
+        matches = builders[tournament_format]()
+        self._play(matches, tie_break=tournament_format != 'round_robin')
+
+        for match in matches:
+            if match.played:
+                team1, team2 = match.teams
+                self.ratings.record(self.names[team1], self.names[team2], match.score)
+
+        return TournamentResult(tournament_format, list(self.names), matches, time.perf_counter() - start)
+
+    def round_robin(self):
+        return self.run('round_robin')
+
+    def single_elimination(self):
+        return self.run('single_elimination')
+
+    def double_elimination(self):
+        return self.run('double_elimination')
+
+    def _seeding(self):
+        """Team indexes by rating, the best first (registration order between equal ratings)"""
+        return sorted(range(len(self.names)), key=lambda index: -self.ratings.rating(self.names[index]))
+
+    def _round_robin_matches(self):
+        matches = []
+        for number, pairs in enumerate(round_robin_rounds(len(self.names)), 1):
+            for a, b in pairs:
+                matches.append(Match(len(matches), f"R{number}", ('team', a), ('team', b)))
+        return matches
+
+    def _first_round(self, matches, prefix):
+        """Matches of the first round of a bracket, byes for the missing places"""
+        seeding = self._seeding()
+        size = 1 << (len(seeding) - 1).bit_length()
+        places = [('team', seeding[seed]) if seed < len(seeding) else ('team', None)
+                  for seed in bracket_order(size)]
+
+        first = []
+        for i in range(0, size, 2):
+            first.append(Match(len(matches), f"{prefix}1", places[i], places[i + 1]))
+            matches.append(first[-1])
+        return first
+
+    @staticmethod
+    def _next_round(matches, previous, name, kind='winner'):
+        """Pair the results of the matches of a round into the next one"""
+        current = []
+        for i in range(0, len(previous), 2):
+            current.append(Match(len(matches), name, (kind, previous[i]), (kind, previous[i + 1])))
+            matches.append(current[-1])
+        return current
+
+    def _single_elimination_matches(self):
+        matches = []
+        current = self._first_round(matches, 'R')
+        number = 1
+        while len(current) > 1:
+            number += 1
+            current = self._next_round(matches, current, f"R{number}")
+        return matches
+
+    def _double_elimination_matches(self):
+        """
+        Winners bracket, losers bracket and grand final
+
+        The losers of the first round play each other, then every round
+        of the losers bracket alternates between the survivors meeting the
+        teams dropping from the winners bracket and the survivors meeting
+        each other. The winner of the losers bracket must beat the unbeaten
+        team twice.
+        """
+        matches = []
+        winners = [self._first_round(matches, 'W')]
+        while len(winners[-1]) > 1:
+            winners.append(self._next_round(matches, winners[-1], f"W{len(winners) + 1}"))
+
+        if len(winners) == 1:
+            # Two teams: the loser of the final gets a second chance at once
+            losers_final = winners[0][0]
+            grand_final = Match(len(matches), "GF", ('winner', losers_final), ('loser', losers_final))
+            matches.append(grand_final)
+        else:
+            losers = self._next_round(matches, winners[0], "L1", kind='loser')
+            number = 1
+            for depth, dropped in enumerate(winners[1:], 1):
+                # Reversed every other round so the teams do not meet again at once
+                dropped = dropped[::-1] if depth % 2 else dropped
+                number += 1
+                round_matches = []
+                for survivor, loser in zip(losers, dropped):
+                    round_matches.append(Match(len(matches), f"L{number}", ('winner', survivor), ('loser', loser)))
+                    matches.append(round_matches[-1])
+                losers = round_matches
+
+                if len(losers) > 1:
+                    number += 1
+                    losers = self._next_round(matches, losers, f"L{number}")
+
+            grand_final = Match(len(matches), "GF", ('winner', winners[-1][0]), ('winner', losers[0]))
+            matches.append(grand_final)
+
+        matches.append(Match(len(matches), "GF2", ('winner', grand_final), ('loser', grand_final), reset=True))
+        return matches
+
+    def _play(self, matches, tie_break):
+        """
+        Play the matches in dependency order, each as soon as its teams are known
+
+        Args:
+            matches (list): Matches of the event, by id
+            tie_break (bool): A tied match goes to the better seed (elimination)
+        """
+        seeds = spawn_seeds(self.seed if self.seed is None else self.seed + self._events, len(matches))
+        self._events += 1
+
+        dependents = {match.id: [] for match in matches}
+        waiting = {}
+        for match in matches:
+            dependencies = match.dependencies()
+            waiting[match.id] = len(dependencies)
+            for dependency in dependencies:
+                dependents[dependency.id].append(match)
+
+        ready = [match for match in matches if not waiting[match.id]]
+
+        def settle(match):
+            """Unlock the matches waiting for a decided match"""
+            for dependent in dependents[match.id]:
+                waiting[dependent.id] -= 1
+                if not waiting[dependent.id]:
+                    ready.append(dependent)
+
+        executor = None
+        if self.processes > 1:
+            executor = ProcessPoolExecutor(self.processes, initializer=_init_worker,
+                                           initargs=(self.specs, self.games_per_match, self.use_numpy))
+        else:
+            _init_worker(self.specs, self.games_per_match, self.use_numpy)
+
+        try:
+            running = set()
+            while ready or running:
+                batch = []
+                while ready:
+                    match = ready.pop()
+                    if match.prepare():
+                        batch.append((match.id, match.teams[0], match.teams[1], seeds[match.id]))
+                    else:
+                        settle(match)
+
+                for i in range(0, len(batch), TASK_SIZE):
+                    task = batch[i:i + TASK_SIZE]
+                    if executor is None:
+                        future = Future()
+                        future.set_result(_play_matches(task))
+                    else:
+                        future = executor.submit(_play_matches, task)
+                    running.add(future)
+
+                if not running:
+                    continue
+
+                done, running = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    for match_id, wins1, wins2, draws in future.result():
+                        match = matches[match_id]
+                        match.record(wins1, wins2, draws, tie_break)
+                        settle(match)
+        finally:
+            if executor is not None:
+                executor.shutdown(cancel_futures=True)
+
+
+def main():
+    """Play a tournament between random teams"""
+    import argparse
+    import random
+
+    from my_package.models.pokemon import PokemonGenerator
+    from my_package.models.trainer import Trainer
+
+    parser = argparse.ArgumentParser(description="Tournament between random teams")
+    parser.add_argument("--teams", type=int, default=32)
+    parser.add_argument("--format", choices=['round', 'single', 'double'], default='single')
+    parser.add_argument("--games", type=int, default=1, help="games per match")
+    parser.add_argument("--level", type=int, default=15, help="mean level of the teams")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--processes", type=int, default=None)
+    parser.add_argument("--ratings", help="JSON file of the ratings, read then updated")
+    args = parser.parse_args()
+
+    ratings = None
+    if args.ratings and os.path.exists(args.ratings):
+        try:
+            ratings = EloRatings.load(args.ratings)
+        except (OSError, ValueError) as e:
+            parser.error(str(e))
+
+    try:
+        tournament = Tournament(ratings, args.games, args.seed, args.processes)
+    except ValueError as e:
+        parser.error(str(e))
+
+    rng = random.Random(args.seed)
+    for number in range(args.teams):
+        trainer = Trainer(f"Team{number + 1}")
+        for candidate in PokemonGenerator.generate_many(3, args.level, rng):
+            trainer.add_pokemon(candidate.to_pokemon())
+        tournament.register(trainer)
+
+    tournament_format = {'round': 'round_robin', 'single': 'single_elimination',
+                         'double': 'double_elimination'}[args.format]
+    try:
+        result = tournament.run(tournament_format)
+    except ValueError as e:
+        parser.error(str(e))
+
+    print(result)
+    print("\nRatings:")
+    for rank, (name, rating, matches) in enumerate(tournament.ratings.ranking()[:10], 1):
+        print(f"{rank:>4}. {name:<24}{rating:>7.1f} ({matches} matches)")
+
+    if args.ratings:
+        tournament.ratings.save(args.ratings)
+
+
+if __name__ == "__main__":
+    main()
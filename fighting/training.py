@@ -0,0 +1,192 @@
+"""
+fighting/training.py
+Training of the player team against wild Pokemon, interactive or automatic
+"""
+
+import random
+import time
+from collections import Counter
+
+from fighting.fighting_system import FightingSystem
+from my_package.models.pokemon import PokemonGenerator
+from my_package.models.pokemon_pool import PokemonPool
+from my_package.models.trainer import Trainer
+
+
+# Turns before an automatic training fight is declared a draw
+MAX_TURNS = 200
+
+
+def team_level(trainer):
+    """
+    Level used to generate the wild Pokemon met by a trainer
+
+    Args:
+        trainer (Trainer): Trainer who trains
+
+    Returns:
+        int: Rounded mean level of the team (1 if the team is empty)
+    """
+    if not trainer.team:
+        return 1
+    return max(1, round(sum(pokemon.level for pokemon in trainer.team) / len(trainer.team)))
+
+
+def wild_trainer(player_level, rng=None, route='default', pool=None):
+    """
+    Create the "trainer" of a wild Pokemon
+
+    Args:
+        player_level (int): Level of the player
+        rng (random.Random): Random generator
+        route (str): Route of the encounter
+        pool (PokemonPool): Pool recycling the wild Pokemon
+
+    Returns:
+        Trainer: Trainer with one wild Pokemon
+    """
+    wild = Trainer("Wild Pokemon")
+    wild.add_pokemon(PokemonGenerator.generate_wild_pokemon(player_level, rng, route, pool))
+    return wild
+
+
+class TrainingReport:
+    """
+    Result of an automatic training
+
+    Attributes:
+        fights (int): Number of fights played
+        wins (int): Fights won by the player
+        losses (int): Fights lost by the player
+        draws (int): Fights stopped after MAX_TURNS
+        turns (int): Turns played in all the fights
+        experience (Counter): Experience gained by each Pokemon of the team (by slot)
+        levels (Counter): Levels gained by each Pokemon of the team (by slot)
+        opponents (Counter): Number of fights against each species
+        elapsed (float): Duration of the training in seconds
+    """
+
+    def __init__(self):
+        self.fights = 0
+        self.wins = 0
+        self.losses = 0
+        self.draws = 0
+        self.turns = 0
+        self.experience = Counter()
+        self.levels = Counter()
+        self.opponents = Counter()
+        self.elapsed = 0.0
+
+    @property
+    def total_experience(self):
+        return sum(self.experience.values())
+
+    def add_fight(self, fight, player, opponent_name):
+        """Count the result and the experience of a finished fight"""
+        self.fights += 1
+        self.turns += fight.current_turn
+        self.opponents[opponent_name] += 1
+
+        if fight.winner is player:
+            self.wins += 1
+        elif fight.winner is None:
+            self.draws += 1
+        else:
+            self.losses += 1
+
+        for slot, pokemon in enumerate(player.team):
+            experience = fight.experience_gained.get(pokemon)
+            if experience:
+                self.experience[slot] += experience
+            levels = fight.levels_gained.get(pokemon)
+            if levels:
+                self.levels[slot] += levels
+
+    def to_dict(self):
+        return {
+            'fights': self.fights,
+            'wins': self.wins,
+            'losses': self.losses,
+            'draws': self.draws,
+            'turns': self.turns,
+            'experience': dict(self.experience),
+            'total_experience': self.total_experience,
+            'levels': dict(self.levels),
+            'opponents': dict(self.opponents),
+            'elapsed': self.elapsed
+        }
+
+    def summary(self, player):
+        """
+        Text summary of the training
+
+        Args:
+            player (Trainer): Trainer who trained (names of the Pokemon)
+
+        Returns:
+            str: Summary
+        """
+        lines = [f"{'='*70}",
+                 f"TRAINING SUMMARY - {self.fights} fights in {self.elapsed:.2f}s",
+                 f"{'='*70}",
+                 f"Victories: {self.wins} | Defeats: {self.losses} | Draws: {self.draws}",
+                 f"Turns played: {self.turns}",
+                 f"Experience gained: {self.total_experience} XP"]
+        for slot, pokemon in enumerate(player.team):
+            if self.experience[slot]:
+                levels = f" (+{self.levels[slot]} levels, now Lvl.{pokemon.level})" if self.levels[slot] else ""
+                lines.append(f"   {pokemon.name}: +{self.experience[slot]} XP{levels}")
+        if self.opponents:
+            most_met = ", ".join(f"{name} x{count}" for name, count in self.opponents.most_common(3))
+            lines.append(f"Most met: {most_met}")
+        lines.append(f"{'='*70}")
+        return "\n".join(lines)
+
+
+def auto_train(player, n_fights, rng=None, route='default', pool=None, heal=True, max_turns=MAX_TURNS):
+    """
+    Play wild fights back to back without any input, display or pause
+
+    The player always attacks and sends the first Pokemon able to fight
+    after a KO. The wild Pokemon are generated at the level of the team and
+    recycled through a PokemonPool.
+
+    Args:
+        player (Trainer): Trainer who trains
+        n_fights (int): Number of fights
+        rng (random.Random): Random generator (fights and encounters)
+        route (str): Route of the wild Pokemon
+        pool (PokemonPool): Pool recycling the wild Pokemon (default: a new pool)
+        heal (bool): Heal the team after each fight
+        max_turns (int): Turns before a fight is a draw
+
+    Returns:
+        TrainingReport: Results of the training
+    """
+    rng = rng or random
+    if pool is None:
+        pool = PokemonPool()
+    report = TrainingReport()
+    start = time.perf_counter()
+
+    for _ in range(n_fights):
+        if player.team_ko():
+            break
+
+        opponent = wild_trainer(team_level(player), rng, route, pool)
+        opponent_name = opponent.active_pokemon.name
+
+        if player.active_pokemon is None or player.active_pokemon.ko:
+            player.choose_available_pokemon()
+
+        fight = FightingSystem.headless(player, opponent, max_turns=max_turns, rng=rng)
+        fight.start()
+        report.add_fight(fight, player, opponent_name)
+
+        pool.release_team(opponent)
+        if heal:
+            for pokemon in player.team:
+                pokemon.heal()
+
+    report.elapsed = time.perf_counter() - start
+    return report
@@ -1,31 +1,45 @@
 from my_package.models.pokemon import FirePokemon, WaterPokemon, PlantPokemon
-from my_package.models.trainer import Trainer, Champion
-from my_package.models.arena import Arena
+from my_package.models.trainer import Trainer
+from my_package.models.arena_data import load_arenas
 from fighting.fighting_system import FightingSystem
+from fighting.training import auto_train, team_level, wild_trainer
 from utils.display import display_title, display_menu, clear_screen, display_separator
 from my_package.models.pokemon import PokemonGenerator, PokemonFactory
+from my_package.models.pokemon_pool import PokemonPool
 from utils.save_system import SaveSystem
-import random
+from utils.game_serializer import GameSerializer
+from utils.rng import make_rng
 import json
 import os
 
-random.seed(42)
-
 
 class Game:
     """Main class managing the game flow"""
     
-    def __init__(self):
+    def __init__(self, seed=42):
+        """
+        Args:
+            seed (int): Seed of the random generator of the game, None for a random one
+        """
+        self.rng = make_rng(seed)
+        self.pokemon_pool = PokemonPool()
         self.player = None
         self.arenas = []
         self.defeated_arenas = []
         self.ongoing = True
+        # Autosave only writes over a save resumed by this game (or that the player agreed to replace)
+        self.owns_save = False
         
     def initialize_game(self):
         """Initialize the player and the arenas"""
         clear_screen()
         display_title("WELCOME TO THE THREE ARENAS CHALLENGE")
         
+        if self.resume_game():
+            print(f"\nWelcome back, {self.player.name} !")
+            input("\nPress Enter to continue...")
+            return
+        
         # Creation of the player
         player_name = input("\nEnter your name, young trainer : ").strip()
         if not player_name:
@@ -42,9 +56,65 @@ class Game:
         # Creation of the arenas
         self.create_arenas()
         
+        self.owns_save = self.confirm_new_save()
+        
         print(f"\nGood luck, {self.player.name} !")
         input("\nPress Enter to continue...")
     
+    def resume_game(self):
+        """
+        Offer to continue the saved game
+
+        Returns:
+            bool: True if the saved game has been restored
+        """
+        if not os.path.exists(SaveSystem.SAVE_FILE):
+            return False
+        
+        choice = input("\nA saved game was found. Continue it? (y/n): ").strip().lower()
+        if choice != 'y':
+            return False
+        
+        save_data = SaveSystem.load_game()
+        if save_data is None:
+            return False
+        
+        self.create_arenas()
+        try:
+            # The save was written by this game: no validation needed
+            self.player, self.defeated_arenas = GameSerializer.deserialize(save_data, self.arenas, trusted=True)
+        except (ValueError, KeyError, IndexError) as e:
+            print(f"\n✗ The save cannot be restored: {e}")
+            self.arenas = []
+            self.defeated_arenas = []
+            return False
+        
+        self.owns_save = True
+        return True
+    
+    def confirm_new_save(self):
+        """
+        Ask whether the progress of a new game replaces the saved game (if any)
+
+        Returns:
+            bool: True if the new game can be autosaved
+        """
+        if not os.path.exists(SaveSystem.SAVE_FILE):
+            return True
+        
+        choice = input("\nAutosave your progress? It replaces the saved game. (y/n): ").strip().lower()
+        if choice != 'y':
+            print("\nThe saved game is kept, your progress is only saved if you ask when quitting.")
+            return False
+        return True
+    
+    def autosave(self):
+        """Save the progress in the journal if this game owns the save"""
+        if not self.owns_save:
+            return
+        if not SaveSystem.autosave(self.player, self.defeated_arenas, self.arenas):
+            print("\n✗ Autosave failed, your progress will be saved again at the next step.")
+    
     def choose_starter(self):
         """Allow the player to choose his starter Pokemon"""
         clear_screen()
@@ -97,7 +167,7 @@ class Game:
         """Fill the remaining team slots with random Pokemon (up to 6 total)"""
         print("\nFilling your team with random Pokemon...")
         while len(self.player.team) < 6:
-            pokemon = PokemonGenerator.generate_wild_pokemon(5)
+            pokemon = PokemonGenerator.generate_wild_pokemon(5, self.rng)
             self.player.add_pokemon(pokemon)
             print(f"   ✓ {pokemon.name} joined your team!")
         
@@ -117,11 +187,8 @@ class Game:
             print(f"Your starter: {starter.name}")
             print(f"Current team: {slots_filled}/6 Pokemon\n")
             
-            # Generate 3 random Pokemon options
-            options = []
-            for _ in range(3):
-                pokemon = PokemonGenerator.generate_wild_pokemon(5)
-                options.append(pokemon)
+            # Generate 3 random Pokemon options (created only when chosen)
+            options = PokemonGenerator.generate_many(3, 5, self.rng)
             
             print(f"Choose one of these Pokemon:")
             for i, pokemon in enumerate(options, 1):
@@ -133,7 +200,7 @@ class Game:
             try:
                 choice_index = int(choice) - 1
                 if 0 <= choice_index < 3:
-                    selected_pokemon = options[choice_index]
+                    selected_pokemon = options[choice_index].to_pokemon()
                     self.player.add_pokemon(selected_pokemon)
                     print(f"\n✓ {selected_pokemon.name} added to your team!")
                     input("\nPress Enter to continue...")
@@ -165,11 +232,8 @@ class Game:
             clear_screen()
             display_title(f"POKEMON {pokemon_count + 1}/6")
             
-            # Generate 3 random Pokemon options
-            options = []
-            for _ in range(3):
-                pokemon = PokemonGenerator.generate_wild_pokemon(5)
-                options.append(pokemon)
+            # Generate 3 random Pokemon options (created only when chosen)
+            options = PokemonGenerator.generate_many(3, 5, self.rng)
             
             print(f"\nChoose one of these Pokemon:")
             for i, pokemon in enumerate(options, 1):
@@ -181,7 +245,7 @@ class Game:
             try:
                 choice_index = int(choice) - 1
                 if 0 <= choice_index < 3:
-                    selected_pokemon = options[choice_index]
+                    selected_pokemon = options[choice_index].to_pokemon()
                     self.player.add_pokemon(selected_pokemon)
                     print(f"\n✓ {selected_pokemon.name} added to your team!")
                     pokemon_count += 1
@@ -209,6 +273,7 @@ class Game:
         else:
             for i, pokemon in enumerate(self.player.team, 1):
                 print(f"\n{i}. {pokemon}")
+                print(f"   XP: {pokemon.experience} | Next level in {pokemon.experience_to_next_level()} XP")
         
         input("\nPress Enter to return...")
 
@@ -220,11 +285,20 @@ class Game:
         print(f"\nSee you soon, {self.player.name} !")
         print(f"Badges obtained: {len(self.defeated_arenas)}/3")
         
+        if self.owns_save:
+            # Everything is already in the journal, write a full snapshot
+            SaveSystem.save_game(self.player, self.defeated_arenas, self.arenas)
+            self.ongoing = False
+            return
+        
         # Ask to save before quitting
         while True:
-            choice = input("\nSave your progress before quitting? (y/n): ").strip().lower()
+            prompt = "Save your progress before quitting?"
+            if os.path.exists(SaveSystem.SAVE_FILE):
+                prompt += " It replaces the saved game."
+            choice = input(f"\n{prompt} (y/n): ").strip().lower()
             if choice == 'y':
-                SaveSystem.save_game(self.player, self.defeated_arenas)
+                SaveSystem.save_game(self.player, self.defeated_arenas, self.arenas)
                 break
             elif choice == 'n':
                 print("\nProgress not saved.")
@@ -235,57 +309,8 @@ class Game:
         self.ongoing = False
 
     def create_arenas(self):
-        """Create the three arenas with their champions and floors"""
-
-        # Fire Arena
-        fire_champion = Champion("Pierre", "Fire")
-        fire_champion.add_pokemon(FirePokemon("Ponyta", level=8))
-        fire_champion.add_pokemon(FirePokemon("Goupix", level=10))
-        
-        fire_floor1_trainer = Champion("Eric", "Fire")
-        fire_floor1_trainer.add_pokemon(FirePokemon("Charmander", level=5))
-        fire_floor1_trainer.add_pokemon(FirePokemon("Vulpix", level=6))
-        
-        fire_floor2_trainer = Champion("Megan", "Fire")
-        fire_floor2_trainer.add_pokemon(FirePokemon("Ponyta", level=7))
-        fire_floor2_trainer.add_pokemon(FirePokemon("Growlithe", level=8))
-        
-        fire_arena = Arena("Fire Arena", "Fire", fire_champion, "Badge Volcan")
-        fire_arena.add_floors(fire_floor1_trainer, fire_floor2_trainer)
-
-        # Water Arena  
-        water_champion = Champion("Ondine", "Water")
-        water_champion.add_pokemon(WaterPokemon("Stari", level=12))
-        water_champion.add_pokemon(WaterPokemon("Psykokwak", level=14))
-        
-        water_floor1_trainer = Champion("Sandy", "Water")
-        water_floor1_trainer.add_pokemon(WaterPokemon("Squirtle", level=11))
-        water_floor1_trainer.add_pokemon(WaterPokemon("Staryu", level=12))
-        
-        water_floor2_trainer = Champion("Gerald", "Water")
-        water_floor2_trainer.add_pokemon(WaterPokemon("Poliwag", level=13))
-        water_floor2_trainer.add_pokemon(WaterPokemon("Slowbro", level=14))
-        
-        water_arena = Arena("Water Arena", "Water", water_champion, "Badge Marine")
-        water_arena.add_floors(water_floor1_trainer, water_floor2_trainer)
-
-        # Plant Arena
-        plant_champion = Champion("Erika", "Plant")
-        plant_champion.add_pokemon(PlantPokemon("Mystherbe", level=16))
-        plant_champion.add_pokemon(PlantPokemon("Chétiflor", level=18))
-        
-        plant_floor1_trainer = Champion("John", "Plant")
-        plant_floor1_trainer.add_pokemon(PlantPokemon("Bulbasaur", level=14))
-        plant_floor1_trainer.add_pokemon(PlantPokemon("Oddish", level=15))
-        
-        plant_floor2_trainer = Champion("Bill", "Plant")
-        plant_floor2_trainer.add_pokemon(PlantPokemon("Exeggcute", level=15))
-        plant_floor2_trainer.add_pokemon(PlantPokemon("Bellsprout", level=16))
-        
-        plant_arena = Arena("Plant Arena", "Plant", plant_champion, "Badge Vert")
-        plant_arena.add_floors(plant_floor1_trainer, plant_floor2_trainer)
-
-        self.arenas.extend([fire_arena, water_arena, plant_arena])
+        """Create the arenas of data/arenas.json (their trainers are built on first challenge)"""
+        self.arenas.extend(load_arenas())
 
     # Challenge an arena
     def choose_and_challenge_arena(self):
@@ -303,7 +328,7 @@ class Game:
         for i, arena in enumerate(available_arenas, 1):
             print(f"\n{i}. {arena.name}")
             print(f"   Type: {arena.type_arena}")
-            print(f"   Champion: {arena.champion.name}")
+            print(f"   Champion: {arena.champion_name}")
         
         choice = input("\nChoose an arena (number) : ").strip()
         
@@ -338,7 +363,7 @@ class Game:
             print(f"\nTrainer: {floor.trainer.name}")
             
             # Fight the trainer
-            fight = FightingSystem(self.player, floor.trainer)
+            fight = FightingSystem(self.player, floor.trainer, rng=self.rng)
             victory = fight.start()
             
             if victory:
@@ -352,6 +377,7 @@ class Game:
                     # Victory at floor 3 (champion)
                     arena.player_victory()
                     self.defeated_arenas.append(arena)
+                    self.autosave()
                     input("\nPress Enter to continue...")
                     break
             else:
@@ -359,11 +385,13 @@ class Game:
                 # Reset floors
                 for floor_to_reset in arena.floors:
                     floor_to_reset.reset_floor()
+                self.autosave()
                 input("\nPress Enter to continue...")
                 break
             
             # Heal team for next floor
             self.player.heal_team()
+            self.autosave()
     
     
 
@@ -385,11 +413,8 @@ class Game:
             clear_screen()
             display_title(f"CATCH POKEMON - {len(self.player.team)}/6")
             
-            # Generate 3 random Pokemon options
-            options = []
-            for _ in range(3):
-                pokemon = PokemonGenerator.generate_wild_pokemon(5)
-                options.append(pokemon)
+            # Generate 3 random Pokemon options (created only when chosen)
+            options = PokemonGenerator.generate_many(3, 5, self.rng)
             
             print(f"\nWild Pokemon appeared! Choose one to catch:")
             for i, pokemon in enumerate(options, 1):
@@ -407,10 +432,11 @@ class Game:
                     input("\nPress Enter to continue...")
                     break
                 elif 0 <= choice_index < 3:
-                    selected_pokemon = options[choice_index]
+                    selected_pokemon = options[choice_index].to_pokemon()
                     if self.player.add_pokemon(selected_pokemon):
                         print(f"\n✓ You caught {selected_pokemon.name}!")
                         print(f"   {selected_pokemon.name} was added to your team!")
+                        self.autosave()
                         
                         if len(self.player.team) < 6:
                             continue_catching = input("\nCatch another Pokemon? (y/n): ").strip().lower()
@@ -430,6 +456,42 @@ class Game:
                 print("\nPlease enter a valid number!")
                 input("\nPress Enter to try again...")
 
+    def train_randomly(self):
+        """Train the team against wild Pokemon: one fight, or many fights in auto-battle"""
+        clear_screen()
+        display_title("TRAINING")
+        
+        print(f"\nWild Pokemon around level {team_level(self.player)} are waiting for you!")
+        display_menu([
+            "Fight a wild Pokemon",
+            "Auto-battle (several fights, no pause)",
+            "Return"
+        ])
+        
+        choice = input("\nYour choice : ").strip()
+        
+        if choice == '1':
+            opponent = wild_trainer(team_level(self.player), self.rng)
+            print(f"\nA wild {opponent.active_pokemon.name} appears!")
+            fight = FightingSystem(self.player, opponent, rng=self.rng)
+            fight.start()
+            self.player.heal_team()
+            self.autosave()
+            input("\nPress Enter to continue...")
+        elif choice == '2':
+            answer = input("\nNumber of fights (default 50) : ").strip()
+            try:
+                n_fights = int(answer) if answer else 50
+            except ValueError:
+                print("\nPlease enter a valid number!")
+                input("\nPress Enter...")
+                return
+            
+            report = auto_train(self.player, max(0, n_fights), self.rng, pool=self.pokemon_pool)
+            print(f"\n{report.summary(self.player)}")
+            self.autosave()
+            input("\nPress Enter to continue...")
+    
     def display_arenas(self):
         """Display the status of all arenas"""
         clear_screen()
@@ -439,7 +501,7 @@ class Game:
             status = "**DEFEATED**" if arena in self.defeated_arenas else "**TO CHALLENGE**"
             print(f"\n{status} - {arena.name}")
             print(f"   Type: {arena.type_arena}")
-            print(f"   Champion: {arena.champion.name}")
+            print(f"   Champion: {arena.champion_name}")
         input("\nPress Enter to return...")
 
     def main_menu(self):
@@ -1,3 +1,6 @@
 from .pokemon import Pokemon, FirePokemon, WaterPokemon, PlantPokemon
+from .type_chart import PokemonType, TYPE_CHART
+from .species import Species, SpeciesCatalog, get_catalog
+from .attack_result import AttackEvent, AttackResult
 from .trainer import Trainer, Champion
 from .arena import Arena
\ No newline at end of file
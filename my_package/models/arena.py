@@ -15,12 +15,25 @@ class Arena:
         champion (Champion): Champion who defends the arena
         badge (str): Badge name obtained after victory
         defeated (bool): True if the player has already defeated this arena
+        champion_name (str): Name of the champion (known before the champion is built)
+    
+    An arena can be created without its champion and floors, with a loader
+    called on first access to champion or floors (see arena_data.load_arenas):
+    listing hundreds of arenas costs only their name and type.
     """
 
-    def __init__(self, name, type_arena, champion, badge=None):
+    def __init__(self, name, type_arena, champion=None, badge=None, loader=None, champion_name=None):
+        """
+        Args:
+            name (str): Arena name
+            type_arena (str): Arena type
+            champion (Champion): Champion of the arena, None if built by the loader
+            badge (str): Badge name
+            loader (callable): Function loader(arena) giving the champion and floors on first use
+            champion_name (str): Name of the champion when it is built by the loader
+        """
         self.name = name
         self.type_arena = type_arena
-        self.champion = champion
         self.badge = badge or f"Badge of {self.type_arena} Arena"
         self.defeated = False
 
@@ -29,10 +42,43 @@ class Arena:
         self.nb_victories = 0
 
         # Floors will be added with add_floors
-        self.floors = []
+        self._floors = []
         
         # The champion is always at the floor 3
-        self.champion = champion
+        self._champion = champion
+        self.champion_name = champion.name if champion is not None else champion_name
+        self._loader = loader
+    
+    def _load(self):
+        """Build the champion and the floors if they are not built yet"""
+        if self._loader is not None:
+            loader = self._loader
+            self._loader = None
+            loader(self)
+    
+    @property
+    def is_loaded(self):
+        """True if the champion and the floors are built"""
+        return self._loader is None
+    
+    @property
+    def champion(self):
+        self._load()
+        return self._champion
+    
+    @champion.setter
+    def champion(self, champion):
+        self._champion = champion
+        self.champion_name = champion.name
+    
+    @property
+    def floors(self):
+        self._load()
+        return self._floors
+    
+    @floors.setter
+    def floors(self, floors):
+        self._floors = floors
     
     def add_floors(self, trainer_floor1, trainer_floor2):
         """
@@ -256,8 +302,8 @@ class Arena:
     def __str__(self):
         """Textual representation of the arena"""
         statut = "OK" if self.defeated else "KO"
-        return f"{statut} {self.name} - Champion {self.champion.name} ({self.type_arena})"
+        return f"{statut} {self.name} - Champion {self.champion_name} ({self.type_arena})"
 
     def __repr__(self):
         """Technical representation of the arena"""
-        return f"Arena(name='{self.name}', type='{self.type_arena}', champion='{self.champion.name}', defeated={self.defeated})"
+        return f"Arena(name='{self.name}', type='{self.type_arena}', champion='{self.champion_name}', defeated={self.defeated})"
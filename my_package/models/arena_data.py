@@ -0,0 +1,107 @@
+"""
+my_package/models/arena_data.py
+Arenas, floors and trainers defined in data/arenas.json
+"""
+
+import json
+import os
+
+from my_package.models.arena import Arena
+from my_package.models.battle_ai import ExpectimaxAI
+from my_package.models.pokemon import PokemonFactory
+from my_package.models.species import get_catalog
+from my_package.models.trainer import Champion
+from my_package.models.type_chart import TYPE_IDS
+
+
+ARENAS_FILE = os.path.join(os.path.dirname(__file__), '..', '..', 'data', 'arenas.json')
+
+# Number of floors defended by trainers, the champion holds the last one
+NB_TRAINER_FLOORS = 2
+
+
+def build_trainer(definition, type_affinity):
+    """
+    Build a trainer of an arena from its definition
+
+    Args:
+        definition (dict): {'name', 'team': [{'species', 'level'}], optional 'type' and 'ai'}
+        type_affinity (str): Type of the arena, used when the trainer has no 'type'
+
+    Returns:
+        Champion: The trainer with its team
+
+    Raises:
+        ValueError: If a species is unknown
+    """
+    ai = None
+    if 'ai' in definition:
+        ai = ExpectimaxAI(**definition['ai'])
+
+    trainer = Champion(definition['name'], definition.get('type', type_affinity), ai=ai)
+
+    catalog = get_catalog()
+    for member in definition['team']:
+        species = catalog.get(member['species'])
+        if species is None:
+            raise ValueError(f"Trainer '{definition['name']}': species '{member['species']}' unknown")
+        trainer.add_pokemon(PokemonFactory.create_pokemon(species.name, species.type_pokemon, member['level']))
+
+    return trainer
+
+
+def _loader(definition):
+    """Loader of a lazy arena: build its champion and floors from the definition"""
+    def load(arena):
+        arena.champion = build_trainer(definition['champion'], arena.type_arena)
+        arena.add_floors(*(build_trainer(floor, arena.type_arena) for floor in definition['floors']))
+    return load
+
+
+def arena_from_definition(definition):
+    """
+    Create an arena whose champion and floors are built on first use
+
+    Args:
+        definition (dict): Definition of the arena (see data/arenas.json)
+
+    Returns:
+        Arena: The lazy arena
+
+    Raises:
+        ValueError: If the definition is not valid
+    """
+    for key in ('name', 'type', 'champion', 'floors'):
+        if key not in definition:
+            raise ValueError(f"Arena definition without '{key}': {definition.get('name', definition)!r}")
+
+    if definition['type'] not in TYPE_IDS:
+        raise ValueError(f"Arena '{definition['name']}': type {definition['type']!r} unknown")
+
+    if len(definition['floors']) != NB_TRAINER_FLOORS:
+        raise ValueError(f"Arena '{definition['name']}' must have {NB_TRAINER_FLOORS} floor trainers")
+
+    return Arena(definition['name'], definition['type'], badge=definition.get('badge'),
+                 loader=_loader(definition), champion_name=definition['champion']['name'])
+
+
+def load_arenas(path=ARENAS_FILE):
+    """
+    Load the arenas of a data file
+
+    Only the names and types are read: the trainers and their Pokemon are
+    built when an arena is first challenged (or its floors are read).
+
+    Args:
+        path (str): JSON data file
+
+    Returns:
+        list: Arenas in the order of the file
+
+    Raises:
+        ValueError: If a definition is not valid
+    """
+    with open(path, 'r', encoding='utf-8') as f:
+        data = json.load(f)
+
+    return [arena_from_definition(definition) for definition in data.get('arenas', [])]
@@ -0,0 +1,94 @@
+"""
+my_package/models/attack_result.py
+Result of an attack, with a message built only when it is displayed
+"""
+
+from enum import Enum
+
+
+class AttackEvent(Enum):
+    """What happened during an attack"""
+
+    HIT = 'hit'
+    MISS = 'miss'
+    ATTACKER_KO = 'attacker_ko'
+    TARGET_ALREADY_KO = 'target_already_ko'
+
+
+class AttackResult:
+    """
+    Result of Pokemon.attack_pokemon
+
+    The message is formatted on access only, so headless fights never pay
+    for the strings. The result can still be read like the dict returned
+    before: result['damage'], result.get('target_knocked_out', False)...
+
+    Attributes:
+        event (AttackEvent): What happened
+        attacker (Pokemon): Attacking Pokemon
+        target (Pokemon): Pokemon receiving the attack
+        damage (int): Damage inflicted (0 if the attack failed)
+        type_multiplier (float): Type multiplier of the attack
+        target_knocked_out (bool): True if the attack knocked out the target
+        accuracy_roll (float): Random draw of the accuracy test, None if not drawn
+        variability (float): Random variability of the damage, None if not drawn
+    """
+
+    __slots__ = ('event', 'attacker', 'target', 'damage', 'type_multiplier', 'target_knocked_out',
+                 'accuracy_roll', 'variability')
+
+    # Keys available through the dict interface
+    KEYS = ('success', 'message', 'damage', 'type_multiplier', 'target_knocked_out')
+
+    def __init__(self, event, attacker, target, damage=0, type_multiplier=1.0, target_knocked_out=False,
+                 accuracy_roll=None, variability=None):
+        self.event = event
+        self.attacker = attacker
+        self.target = target
+        self.damage = damage
+        self.type_multiplier = type_multiplier
+        self.target_knocked_out = target_knocked_out
+        self.accuracy_roll = accuracy_roll
+        self.variability = variability
+
+    @property
+    def success(self):
+        """True if the attack hit the target"""
+        return self.event is AttackEvent.HIT
+
+    @property
+    def message(self):
+        """Text describing the attack"""
+        if self.event is AttackEvent.ATTACKER_KO:
+            return f"{self.attacker.name} is KO and cannot attack!"
+
+        if self.event is AttackEvent.TARGET_ALREADY_KO:
+            return f"{self.target.name} is already KO!"
+
+        if self.event is AttackEvent.MISS:
+            return f"{self.attacker.name} missed their attack!"
+
+        messages = [f"{self.attacker.name} attacks {self.target.name}!"]
+
+        # Determine effectiveness message
+        if self.type_multiplier > 1.0:
+            messages.append("   It's super effective!")
+        elif self.type_multiplier < 1.0:
+            messages.append("   It's not very effective...")
+
+        messages.append(f"→ {self.damage} damage points inflicted")
+        return '\n'.join(messages)
+
+    def __getitem__(self, key):
+        if key not in self.KEYS:
+            raise KeyError(key)
+        return getattr(self, key)
+
+    def get(self, key, default=None):
+        if key not in self.KEYS:
+            return default
+        return getattr(self, key)
+
+    def __repr__(self):
+        return (f"AttackResult({self.event.name}, damage={self.damage}, "
+                f"type_multiplier={self.type_multiplier}, target_knocked_out={self.target_knocked_out})")
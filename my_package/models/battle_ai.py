@@ -0,0 +1,226 @@
+"""
+my_package/models/battle_ai.py
+Search-based IA for the champions
+"""
+
+import time
+
+from my_package.models.type_chart import TYPE_CHART
+
+
+# Same constants as Pokemon.attack_pokemon
+ACCURACY = 0.95
+MEAN_VARIABILITY = (0.85 + 1.0) / 2
+
+# Values of the end of a fight, far above any evaluation
+WIN = 1000.0
+LOSS = -1000.0
+
+
+class _SearchTimeout(Exception):
+    """Raised inside the search when the time budget is spent"""
+
+
+def expected_damage(attacker, defender):
+    """
+    Damage of a hit with the mean variability
+
+    Args:
+        attacker (Pokemon): Attacking Pokemon
+        defender (Pokemon): Defending Pokemon
+
+    Returns:
+        int: Damage of the hit (same formula as Pokemon.attack_pokemon)
+    """
+    base_damage = max(1, (attacker.attack * attacker.level / 5) - (defender.defense / 2))
+    type_multiplier = TYPE_CHART[attacker.type_id][defender.type_id]
+    return max(1, int(base_damage * type_multiplier * MEAN_VARIABILITY))
+
+
+class ExpectimaxAI:
+    """
+    IA exploring the sequences of attacks and changes of Pokemon
+
+    The search alternates the decision of the champion (attack or change)
+    and the chance of the hits (ACCURACY), the adversary is expected to
+    attack every turn. Damage is the expected damage from the type chart.
+    Iterative deepening stops when the time budget of the turn is spent and
+    plays the best action of the last finished depth. Visited states are
+    kept in a transposition table keyed on a packed integer of the HP.
+
+    Attributes:
+        max_depth (int): Maximum number of turns explored
+        time_budget (float): Seconds allowed per decision
+        max_table_size (int): Entries of the transposition table before it is cleared
+        last_depth (int): Depth reached by the last decision
+        nodes (int): Nodes explored by the last decision
+    """
+
+    # Number of nodes explored between two checks of the clock
+    CLOCK_CHECK = 256
+
+    def __init__(self, max_depth=4, time_budget=0.01, max_table_size=200000):
+        self.max_depth = max_depth
+        self.time_budget = time_budget
+        self.max_table_size = max_table_size
+        self.last_depth = 0
+        self.nodes = 0
+
+        self._table = {}
+        self._matchup = None
+        self._deadline = None
+
+    def config(self):
+        """
+        Settings of the IA, to build the same IA in another process
+
+        Returns:
+            dict: Arguments of ExpectimaxAI (same keys as the 'ai' block of an arena trainer)
+        """
+        return {'max_depth': self.max_depth, 'time_budget': self.time_budget,
+                'max_table_size': self.max_table_size}
+
+    def choose_action(self, champion, adversary_pokemon):
+        """
+        Decide the action of the champion
+
+        Args:
+            champion (Champion): Champion controlled by the IA
+            adversary_pokemon (Pokemon): Adversary Pokemon currently in combat
+
+        Returns:
+            dict: Action to perform {'action': 'attack'/'change', 'index': int}
+        """
+        team = champion.team
+        active = team.index(champion.active_pokemon)
+
+        self._prepare(team, adversary_pokemon)
+        own_hps = tuple(pokemon.hp_actuals for pokemon in team)
+        adv_hp = adversary_pokemon.hp_actuals
+
+        self.nodes = 0
+        self._deadline = time.perf_counter() + self.time_budget
+        best_action = None
+
+        for depth in range(1, self.max_depth + 1):
+            try:
+                best_action = self._best_action(own_hps, active, adv_hp, depth, check_clock=depth > 1)
+            except _SearchTimeout:
+                break
+            self.last_depth = depth
+
+        if best_action is None or best_action == active:
+            return {'action': 'attack'}
+        return {'action': 'change', 'index': best_action}
+
+    def _prepare(self, team, adversary):
+        """Precompute the damage and speed order of every matchup against the adversary"""
+        matchup = (adversary.name, adversary.level, adversary.type_id, adversary.hp_max,
+                   tuple((pokemon.name, pokemon.level) for pokemon in team))
+
+        if matchup != self._matchup or len(self._table) > self.max_table_size:
+            self._table = {}
+            self._matchup = matchup
+
+        self._hp_max = [pokemon.hp_max for pokemon in team]
+        self._adv_hp_max = adversary.hp_max
+        self._damage_dealt = [expected_damage(pokemon, adversary) for pokemon in team]
+        self._damage_taken = [expected_damage(adversary, pokemon) for pokemon in team]
+        # On a speed tie the adversary (trainer1) attacks first
+        self._attacks_first = [pokemon.speed > adversary.speed for pokemon in team]
+
+    def _best_action(self, own_hps, active, adv_hp, depth, check_clock):
+        """Root of the search: slot to play (active slot = attack)"""
+        best_value = None
+        best_action = None
+
+        for action in self._actions(own_hps, active):
+            value = self._expect(own_hps, active, adv_hp, action, depth, check_clock)
+            if best_value is None or value > best_value:
+                best_value = value
+                best_action = action
+
+        return best_action
+
+    def _actions(self, own_hps, active):
+        """Attack (the active slot) first, then the changes to every other Pokemon able to fight"""
+        yield active
+        for slot, hp in enumerate(own_hps):
+            if hp > 0 and slot != active:
+                yield slot
+
+    def _value(self, own_hps, active, adv_hp, depth, check_clock):
+        """Decision node: best expected value of the champion"""
+        key = self._key(own_hps, active, adv_hp)
+        entry = self._table.get(key)
+        if entry is not None and entry[0] >= depth:
+            return entry[1]
+
+        self.nodes += 1
+        if check_clock and self.nodes % self.CLOCK_CHECK == 0 and time.perf_counter() > self._deadline:
+            raise _SearchTimeout()
+
+        value = max(self._expect(own_hps, active, adv_hp, action, depth, check_clock)
+                    for action in self._actions(own_hps, active))
+
+        self._table[key] = (depth, value)
+        return value
+
+    def _expect(self, own_hps, active, adv_hp, action, depth, check_clock):
+        """Chance node: mean value of an action over the hits and misses of both sides"""
+        total = 0.0
+        for adv_hits, adv_probability in ((True, ACCURACY), (False, 1 - ACCURACY)):
+            for own_hits, own_probability in ((True, ACCURACY), (False, 1 - ACCURACY)):
+                total += adv_probability * own_probability * self._after_turn(
+                    own_hps, active, adv_hp, action, adv_hits, own_hits, depth, check_clock)
+        return total
+
+    def _after_turn(self, own_hps, active, adv_hp, action, adv_hits, own_hits, depth, check_clock):
+        """Play one turn with the given hits, then evaluate or search deeper"""
+        hps = list(own_hps)
+
+        if action != active:
+            # The change is made first, the adversary attacks the new Pokemon
+            active = action
+            if adv_hits:
+                hps[active] = max(0, hps[active] - self._damage_taken[active])
+        elif self._attacks_first[active]:
+            if own_hits:
+                adv_hp = max(0, adv_hp - self._damage_dealt[active])
+            if adv_hp > 0 and adv_hits:
+                hps[active] = max(0, hps[active] - self._damage_taken[active])
+        else:
+            if adv_hits:
+                hps[active] = max(0, hps[active] - self._damage_taken[active])
+            if hps[active] > 0 and own_hits:
+                adv_hp = max(0, adv_hp - self._damage_dealt[active])
+
+        if adv_hp == 0:
+            return WIN + self._own_ratio(hps)
+
+        if hps[active] == 0:
+            # The first Pokemon able to fight replaces the KO one
+            alive = [slot for slot, hp in enumerate(hps) if hp > 0]
+            if not alive:
+                return LOSS - adv_hp / self._adv_hp_max
+            active = alive[0]
+
+        hps = tuple(hps)
+        if depth <= 1:
+            return self._evaluate(hps, adv_hp)
+        return self._value(hps, active, adv_hp, depth - 1, check_clock)
+
+    def _own_ratio(self, hps):
+        return sum(hp / hp_max for hp, hp_max in zip(hps, self._hp_max))
+
+    def _evaluate(self, hps, adv_hp):
+        """Remaining HP of the team minus the (weighted) HP of the adversary"""
+        return self._own_ratio(hps) - 2.0 * adv_hp / self._adv_hp_max
+
+    @staticmethod
+    def _key(own_hps, active, adv_hp):
+        """Pack the state in one integer: 16 bits per HP, 3 bits for the active slot"""
+        key = adv_hp << 3 | active
+        for hp in own_hps:
+            key = key << 16 | hp
+        return key
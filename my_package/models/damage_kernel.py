@@ -0,0 +1,210 @@
+"""
+my_package/models/damage_kernel.py
+Batched version of Pokemon.attack_pokemon computing millions of hits at once
+
+The kernel applies exactly the scalar formula on NumPy arrays. Given the
+same random draws it returns the same damages, bit for bit, as calling
+attack_pokemon hit after hit.
+"""
+
+from my_package.models.type_chart import TYPE_CHART
+
+try:
+    import numpy as np
+except ImportError:  # numpy is optional, only this module needs it
+    np = None
+
+
+# Accuracy of an attack (see Pokemon.attack_pokemon)
+ACCURACY = 0.95
+
+# Bounds of the random variability of the damage
+VARIABILITY_MIN = 0.85
+VARIABILITY_MAX = 1.0
+
+
+def _require_numpy():
+    if np is None:
+        raise ImportError("The damage kernel requires numpy (pip install numpy)")
+
+
+def type_matrix():
+    """
+    Get the type multipliers as a NumPy matrix
+
+    Returns:
+        numpy.ndarray: matrix[attacker type id, defender type id], see TYPE_CHART
+    """
+    _require_numpy()
+    return np.array(TYPE_CHART, dtype=np.float64)
+
+
+def pokemon_arrays(pokemon_list):
+    """
+    Gather the stats used by the kernel from a list of Pokemon
+
+    Args:
+        pokemon_list (list): Pokemon to convert
+
+    Returns:
+        dict: Arrays 'attack', 'level', 'defense', 'hp' and 'type'
+    """
+    _require_numpy()
+    return {
+        'attack': np.array([p.attack for p in pokemon_list], dtype=np.int64),
+        'level': np.array([p.level for p in pokemon_list], dtype=np.int64),
+        'defense': np.array([p.defense for p in pokemon_list], dtype=np.int64),
+        'hp': np.array([p.hp_actuals for p in pokemon_list], dtype=np.int64),
+        'type': np.array([p.type_id for p in pokemon_list], dtype=np.intp)
+    }
+
+
+def compute_damage(attack, level, defense, hp, attacker_type, defender_type,
+                   accuracy_rolls, variability_rolls, matrix=None):
+    """
+    Compute a batch of hits
+
+    All the arguments are arrays of the same length (or scalars), one
+    element per hit. The rolls are uniform draws in [0, 1) as returned by
+    random.random(): accuracy_rolls decides if the hit lands,
+    variability_rolls gives random.uniform(0.85, 1.0).
+
+    Args:
+        attack, level: Attack and level of the attackers
+        defense, hp: Defense and current HP of the defenders
+        attacker_type, defender_type: Type ids (see PokemonType)
+        accuracy_rolls: Draws of the accuracy test
+        variability_rolls: Draws of the variability (ignored for a miss)
+        matrix (numpy.ndarray): Type multipliers (default: type_matrix())
+
+    Returns:
+        dict: Arrays 'hit' (bool), 'damage' (int, 0 for a miss),
+              'type_multiplier' (float) and 'knocked_out' (bool)
+    """
+    _require_numpy()
+    if matrix is None:
+        matrix = type_matrix()
+
+    attack = np.asarray(attack, dtype=np.int64)
+    level = np.asarray(level, dtype=np.int64)
+    defense = np.asarray(defense, dtype=np.int64)
+    hp = np.asarray(hp, dtype=np.int64)
+    accuracy_rolls = np.asarray(accuracy_rolls, dtype=np.float64)
+    variability_rolls = np.asarray(variability_rolls, dtype=np.float64)
+
+    hit = accuracy_rolls <= ACCURACY
+
+    base_damage = (attack * level / 5) - (defense / 2)
+    base_damage = np.maximum(base_damage, 1.0)  # Minimum 1 damage
+
+    type_multiplier = matrix[attacker_type, defender_type]
+    variability = VARIABILITY_MIN + (VARIABILITY_MAX - VARIABILITY_MIN) * variability_rolls
+
+    final_damage = np.trunc(base_damage * type_multiplier * variability).astype(np.int64)
+    final_damage = np.maximum(final_damage, 1)  # Minimum 1 damage
+    final_damage = np.where(hit, final_damage, 0)
+
+    return {
+        'hit': hit,
+        'damage': final_damage,
+        'type_multiplier': type_multiplier,
+        'knocked_out': hit & (hp - final_damage <= 0)
+    }
+
+
+def _hit_positions(draws, n_hits):
+    """
+    Position in the stream of the accuracy draw of each hit
+
+    A hit consumes one draw when it misses, two when it lands (accuracy
+    then variability), so hit k starts where hit k-1 ended. The chain is
+    followed with pointer doubling: log2(n_hits) vectorized passes.
+
+    Args:
+        draws (numpy.ndarray): 2 * n_hits uniform draws
+        n_hits (int): Number of hits
+
+    Returns:
+        tuple: (positions array, number of draws consumed)
+    """
+    size = len(draws)
+    step = np.where(draws > ACCURACY, 1, 2)
+
+    # jump[j] = start of the hit following a hit starting at j (size = sentinel)
+    jump = np.minimum(np.arange(size) + step, size)
+    jump = np.append(jump, size)
+
+    hits = np.arange(n_hits)
+    positions = np.zeros(n_hits, dtype=np.int64)
+    bit = 0
+    while (n_hits - 1) >> bit:
+        mask = ((hits >> bit) & 1).astype(bool)
+        positions[mask] = jump[positions[mask]]
+        jump = jump[jump]
+        bit += 1
+
+    last = positions[-1]
+    return positions, int(last + step[last])
+
+
+def draw_rolls(random_state, n_hits):
+    """
+    Draw the rolls of n_hits consecutive attacks from a MT19937 stream
+
+    The rolls are the ones attack_pokemon would draw from the same stream
+    and the stream is left exactly where the n_hits scalar calls would
+    leave it.
+
+    Args:
+        random_state (numpy.random.RandomState): Stream to draw from
+        n_hits (int): Number of attacks
+
+    Returns:
+        tuple: (accuracy_rolls, variability_rolls) arrays
+    """
+    _require_numpy()
+    if n_hits == 0:
+        return np.empty(0), np.empty(0)
+
+    state = random_state.get_state()
+    draws = random_state.random_sample(2 * n_hits + 1)
+    positions, consumed = _hit_positions(draws, n_hits)
+
+    # Rewind, then consume only the draws the scalar calls would use
+    random_state.set_state(state)
+    random_state.random_sample(consumed)
+
+    return draws[positions], draws[positions + 1]
+
+
+def random_state_from(rng):
+    """
+    Create a NumPy RandomState continuing a Python random stream
+
+    Python's random and NumPy's RandomState share the MT19937 generator
+    and the 53-bit float conversion, so the copy yields the same floats.
+
+    Args:
+        rng (random.Random): Python generator (or the random module)
+
+    Returns:
+        numpy.random.RandomState: Stream in the same state
+    """
+    _require_numpy()
+    _, internal_state, _ = rng.getstate()
+    random_state = np.random.RandomState()
+    random_state.set_state(('MT19937', np.array(internal_state[:-1], dtype=np.uint32), internal_state[-1]))
+    return random_state
+
+
+def sync_random(rng, random_state):
+    """
+    Move a Python random stream to the state of a NumPy RandomState
+
+    Args:
+        rng (random.Random): Python generator to update
+        random_state (numpy.random.RandomState): Source stream
+    """
+    _, keys, position, _, _ = random_state.get_state()
+    version, _, gauss = rng.getstate()
+    rng.setstate((version, tuple(int(key) for key in keys) + (int(position),), gauss))
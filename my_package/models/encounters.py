@@ -0,0 +1,223 @@
+"""
+my_package/models/encounters.py
+Weighted tables of wild encounters, sampled in constant time
+"""
+
+import random
+from collections import namedtuple
+
+from my_package.models.pokemon import PokemonFactory
+from my_package.models.species import get_catalog
+
+
+class AliasTable:
+    """
+    Weighted choice in O(1) per draw (alias method of Vose)
+
+    Every column of the table holds one outcome with probability prob[i]
+    and its alias otherwise: a draw picks a column and flips one biased coin.
+
+    Attributes:
+        outcomes (list): Outcomes of the table
+    """
+
+    __slots__ = ('outcomes', '_prob', '_alias', '_size')
+
+    def __init__(self, outcomes, weights):
+        """
+        Args:
+            outcomes (list): Outcomes to draw
+            weights (list): Weight of each outcome (same length, >= 0)
+
+        Raises:
+            ValueError: If the lists differ in length or no weight is positive
+        """
+        if len(outcomes) != len(weights):
+            raise ValueError("One weight is needed per outcome")
+        total = float(sum(weights))
+        if not outcomes or total <= 0 or min(weights) < 0:
+            raise ValueError("The weights must be positive")
+
+        size = len(outcomes)
+        scaled = [weight * size / total for weight in weights]
+        prob = [1.0] * size
+        alias = list(range(size))
+
+        small = [i for i, value in enumerate(scaled) if value < 1.0]
+        large = [i for i, value in enumerate(scaled) if value >= 1.0]
+        while small and large:
+            less = small.pop()
+            more = large.pop()
+            prob[less] = scaled[less]
+            alias[less] = more
+            scaled[more] -= 1.0 - scaled[less]
+            (small if scaled[more] < 1.0 else large).append(more)
+        # Leftovers are 1.0 up to rounding errors: keep prob = 1.0
+
+        self.outcomes = list(outcomes)
+        self._prob = prob
+        self._alias = alias
+        self._size = size
+
+    def sample(self, rng=random):
+        """
+        Draw one outcome (one random number)
+
+        Args:
+            rng (random.Random): Random generator
+
+        Returns:
+            Outcome drawn
+        """
+        draw = rng.random() * self._size
+        column = int(draw)
+        if draw - column < self._prob[column]:
+            return self.outcomes[column]
+        return self.outcomes[self._alias[column]]
+
+
+class Candidate(namedtuple('Candidate', ('species', 'level'))):
+    """
+    A wild Pokemon not created yet: its species and level
+
+    The stats shown to the player come from the species, the Pokemon is
+    only built (to_pokemon) when the player picks it.
+    """
+
+    __slots__ = ()
+
+    @property
+    def name(self):
+        return self.species.name
+
+    @property
+    def type_pokemon(self):
+        return self.species.type_pokemon
+
+    @property
+    def stats(self):
+        """Stats at the level of the candidate (hp, attack, defense, speed)"""
+        return self.species.stats_at(self.level)
+
+    @property
+    def hp_max(self):
+        return self.stats['hp']
+
+    @property
+    def attack(self):
+        return self.stats['attack']
+
+    @property
+    def defense(self):
+        return self.stats['defense']
+
+    def to_pokemon(self, pool=None):
+        """
+        Create the Pokemon of the candidate
+
+        Args:
+            pool (PokemonPool): Pool recycling the Pokemon, None to create a new one
+
+        Returns:
+            Pokemon: Same Pokemon as PokemonFactory.create_pokemon with the species type
+        """
+        if pool is not None:
+            return pool.acquire_candidate(self)
+        return PokemonFactory.create_pokemon(self.species.name, self.species.type_pokemon, self.level)
+
+
+class EncounterTable:
+    """
+    Wild encounters of a route: weighted species and level offsets
+
+    A level is drawn first (player level minus an offset), then a species
+    among the species of the route met in the wild at that level. The
+    alias table of each level is built on first use and kept.
+
+    Attributes:
+        route (str): Name of the route
+    """
+
+    def __init__(self, route='default', catalog=None):
+        """
+        Args:
+            route (str): Route of the data file (see 'routes' in data/pokemon_data.json)
+            catalog (SpeciesCatalog): Catalog of the species (default: the game catalog)
+
+        Raises:
+            ValueError: If the route is unknown
+        """
+        catalog = catalog or get_catalog()
+        if route not in catalog.routes:
+            raise ValueError(f"Route '{route}' unknown")
+
+        self.route = route
+        definition = catalog.routes[route]
+        self._weights = {catalog.get(name): weight for name, weight in definition['species'].items()}
+        offsets = definition['level_offsets']
+        self._offsets = AliasTable(list(offsets), list(offsets.values()))
+        self._species_tables = {}
+
+    def _species_table(self, level):
+        table = self._species_tables.get(level)
+        if table is None:
+            species = [species for species in self._weights
+                       if species.min_level <= level <= species.max_level and self._weights[species] > 0]
+            if not species:
+                # No species of the route at this level: the whole route
+                species = [species for species in self._weights if self._weights[species] > 0]
+            table = AliasTable(species, [self._weights[s] for s in species])
+            self._species_tables[level] = table
+        return table
+
+    def sample(self, player_level, rng=random):
+        """
+        Draw one encounter
+
+        Args:
+            player_level (int): Level of the player
+            rng (random.Random): Random generator
+
+        Returns:
+            Candidate: Species and level of the wild Pokemon
+        """
+        level = max(1, player_level - self._offsets.sample(rng))
+        return Candidate(self._species_table(level).sample(rng), level)
+
+    def sample_many(self, n, player_level, rng=random):
+        """
+        Draw several encounters
+
+        Args:
+            n (int): Number of encounters
+            player_level (int): Level of the player
+            rng (random.Random): Random generator
+
+        Returns:
+            list: Candidates
+        """
+        offsets = self._offsets
+        candidates = []
+        for _ in range(n):
+            level = max(1, player_level - offsets.sample(rng))
+            candidates.append(Candidate(self._species_table(level).sample(rng), level))
+        return candidates
+
+
+_tables = {}
+
+
+def get_encounter_table(route='default'):
+    """
+    Encounter table of a route of the game catalog, built once
+
+    Args:
+        route (str): Name of the route
+
+    Returns:
+        EncounterTable: The table
+    """
+    table = _tables.get(route)
+    if table is None:
+        table = _tables[route] = EncounterTable(route)
+    return table
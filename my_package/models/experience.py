@@ -0,0 +1,127 @@
+"""
+my_package/models/experience.py
+Experience curves and growth tables of the species
+"""
+
+from bisect import bisect_right
+
+from my_package.models.species import STATS, Species, get_catalog
+
+
+MAX_LEVEL = 100
+
+# Total experience needed to reach a level, by growth rate of the species
+GROWTH_RATES = {
+    'fast': lambda level: 4 * level ** 3 // 5,
+    'medium_fast': lambda level: level ** 3,
+    'medium_slow': lambda level: 6 * level ** 3 // 5 - 15 * level ** 2 + 100 * level - 140,
+    'slow': lambda level: 5 * level ** 3 // 4
+}
+
+
+class GrowthTable:
+    """
+    Experience thresholds and stats of a species for every level
+
+    The table is computed once per species: finding the level reached with
+    some experience is a binary search in the thresholds and the stats of
+    the new level are read from the table, nothing is computed again when
+    a Pokemon levels up.
+
+    Attributes:
+        growth_rate (str): Experience curve of the species
+        thresholds (tuple): Total experience needed for each level (index = level)
+        stats (tuple): Tuples (hp, attack, defense, speed) for each level (index = level)
+    """
+
+    __slots__ = ('growth_rate', 'thresholds', 'stats')
+
+    def __init__(self, species, max_level=MAX_LEVEL):
+        """
+        Args:
+            species (Species): Species of the table
+            max_level (int): Highest level of the table
+
+        Raises:
+            ValueError: If the growth rate of the species is unknown
+        """
+        curve = GROWTH_RATES.get(species.growth_rate)
+        if curve is None:
+            raise ValueError(f"Species '{species.name}': growth rate '{species.growth_rate}' unknown")
+
+        self.growth_rate = species.growth_rate
+        # Level 0 does not exist and level 1 needs no experience
+        self.thresholds = (0, 0) + tuple(max(0, curve(level)) for level in range(2, max_level + 1))
+        self.stats = tuple(tuple(species.base[stat] + species.growth[stat] * level for stat in STATS)
+                           for level in range(max_level + 1))
+
+    @property
+    def max_level(self):
+        return len(self.thresholds) - 1
+
+    def experience_for(self, level):
+        """
+        Total experience of a Pokemon reaching a level
+
+        Args:
+            level (int): Level
+
+        Returns:
+            int: Experience threshold of the level
+        """
+        return self.thresholds[max(1, min(level, self.max_level))]
+
+    def level_for(self, experience):
+        """
+        Level reached with some experience
+
+        Args:
+            experience (int): Total experience
+
+        Returns:
+            int: Highest level whose threshold is reached (1 to max_level)
+        """
+        return bisect_right(self.thresholds, experience, 2) - 1
+
+
+_tables = {}
+_type_tables = {}
+
+
+def _type_table(type_pokemon):
+    """Table of the Pokemon of a type not in the catalog (stats of the Pokemon classes)"""
+    table = _type_tables.get(type_pokemon)
+    if table is None:
+        from my_package.models.pokemon import PokemonFactory
+
+        at_0 = PokemonFactory.create_pokemon(type_pokemon, type_pokemon, 0)
+        at_1 = PokemonFactory.create_pokemon(type_pokemon, type_pokemon, 1)
+        base = {stat: getattr(at_0, 'hp_max' if stat == 'hp' else stat) for stat in STATS}
+        growth = {stat: getattr(at_1, 'hp_max' if stat == 'hp' else stat) - base[stat] for stat in STATS}
+        table = _type_tables[type_pokemon] = GrowthTable(Species(type_pokemon, type_pokemon, base, growth))
+    return table
+
+
+def growth_table(name, type_pokemon):
+    """
+    Growth table of a Pokemon
+
+    The tables of all the species of the catalog are built on the first
+    call. A Pokemon whose name is not a species of its type uses the
+    table of its type.
+
+    Args:
+        name (str): Name of the Pokemon
+        type_pokemon (str): 'Fire', 'Water' or 'Plant'
+
+    Returns:
+        GrowthTable: The table
+    """
+    if not _tables:
+        _tables.update((species.name, (species.type_pokemon, GrowthTable(species)))
+                       for species in get_catalog().species)
+
+    entry = _tables.get(name)
+    if entry is not None and entry[0] == type_pokemon:
+        return entry[1]
+    return _type_table(type_pokemon)
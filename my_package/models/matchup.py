@@ -0,0 +1,105 @@
+"""
+my_package/models/matchup.py
+Precomputed matchups of a team against each adversary type
+"""
+
+from my_package.models.type_chart import TYPE_CHART, TYPE_NAMES
+
+
+class MatchupIndex:
+    """
+    Index answering "which Pokemon of the team to send against this type"
+
+    Champion._find_best_pokemon scores every Pokemon with its HP ratio
+    (0-100), +200 with a type advantage and -100 with a type disadvantage.
+    The type bonus separates the scores in three tiers that never overlap,
+    so the team is sorted once per adversary type (advantage, neutral,
+    disadvantage) and only the HP decides inside a tier. The answers are
+    cached per adversary type and keyed on the version of the TeamState of
+    the team, which the Pokemon increment when their HP, KO state or stats
+    change: a cached answer is found in O(1), without reading the team.
+
+    Attributes:
+        team (list): Team indexed
+        state (TeamState): Live state of the team (see Trainer.state)
+    """
+
+    ADVANTAGE_BONUS = 200
+    DISADVANTAGE_MALUS = -100
+
+    def __init__(self, team, state):
+        """
+        Args:
+            team (list): Team of the trainer (the list itself, not a copy)
+            state (TeamState): Live state of the team
+        """
+        self.team = team
+        self.state = state
+        self._layout = -1
+        self._version = -1
+        self._tiers = None
+        self._best = {}
+
+    def _build_tiers(self):
+        """Sort the slots of the team in tiers for every adversary type"""
+        self._tiers = []
+        for defender_type in range(len(TYPE_NAMES)):
+            advantage, neutral, disadvantage = [], [], []
+            for slot, pokemon in enumerate(self.team):
+                if TYPE_CHART[pokemon.type_id][defender_type] > 1.0:
+                    advantage.append(slot)
+                elif TYPE_CHART[pokemon.type_id][defender_type] < 1.0:
+                    disadvantage.append(slot)
+                else:
+                    neutral.append(slot)
+            self._tiers.append(((advantage, self.ADVANTAGE_BONUS),
+                                (neutral, 0),
+                                (disadvantage, self.DISADVANTAGE_MALUS)))
+
+    def best_slot(self, adversary_type_id):
+        """
+        Find the slot of the best Pokemon to send against an adversary type
+
+        Args:
+            adversary_type_id (int): Type id of the adversary Pokemon
+
+        Returns:
+            int: Slot of the best Pokemon available, None if all are KO
+        """
+        state = self.state
+        if state.version == self._version:
+            best = self._best.get(adversary_type_id, -1)
+            if best != -1:
+                return best
+        else:
+            if state.layout != self._layout:
+                # Other Pokemon in the slots: their types changed
+                self._build_tiers()
+                self._layout = state.layout
+            self._version = state.version
+            self._best = {}
+
+        best = self._search(adversary_type_id)
+        self._best[adversary_type_id] = best
+        return best
+
+    def _search(self, adversary_type_id):
+        """Best slot of the first tier having a Pokemon able to fight"""
+        team = self.team
+        for slots, bonus in self._tiers[adversary_type_id]:
+            best = None
+            best_score = -1
+            for slot in slots:
+                pokemon = team[slot]
+                if pokemon.ko:
+                    continue
+
+                score = (pokemon.hp_actuals / pokemon.hp_max) * 100 + bonus
+                if score > best_score:
+                    best_score = score
+                    best = slot
+
+            if best is not None:
+                return best
+
+        return None
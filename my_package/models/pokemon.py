@@ -1,20 +1,28 @@
 import random
 
+from my_package.models.attack_result import AttackEvent, AttackResult
+from my_package.models.experience import growth_table
+from my_package.models.species import get_catalog
+from my_package.models.type_chart import TYPE_CHART, type_id
+
 class Pokemon:
 
     """Basis class for Pokémon"""
-    
-    # Efficiency Table
-    EFFICIENCY = {
-        'Fire': {'Plant': 2.0, 'Water': 0.5, 'Fire': 1.0},
-        'Eau': {'Fire': 2.0, 'Plant': 0.5, 'Water': 1.0},
-        'Plant': {'Water': 2.0, 'Fire': 0.5, 'Plant': 1.0}
-    }
+
+    # No __dict__: simulations keep millions of Pokemon in memory
+    __slots__ = ('name', 'type_pokemon', 'type_id', 'level', 'experience',
+                 '_hp_max', '_hp_actuals', 'attack', 'defense', 'speed', '_ko', '_state', '_slot')
 
     def __init__(self, name, type_pokemon,level=5):
+        # TeamState of the team of the Pokemon and its slot (see Trainer), None outside a team
+        self._state = None
+        self._slot = 0
         self.name = name
         self.type_pokemon = type_pokemon
+        self.type_id = type_id(type_pokemon)
         self.level = level
+        # Experience gained since the Pokemon reached its level
+        self.experience = 0
         
         self.hp_max     = 20 + (level *5)
         self.hp_actuals = self.hp_max
@@ -25,6 +33,36 @@ class Pokemon:
         self.ko = False
       
         
+    @property
+    def hp_actuals(self):
+        return self._hp_actuals
+
+    @hp_actuals.setter
+    def hp_actuals(self, hp):
+        self._hp_actuals = hp
+        if self._state is not None:
+            self._state.set_hp(self._slot, hp)
+
+    @property
+    def hp_max(self):
+        return self._hp_max
+
+    @hp_max.setter
+    def hp_max(self, hp_max):
+        self._hp_max = hp_max
+        if self._state is not None:
+            self._state.update(self._slot, self)
+
+    @property
+    def ko(self):
+        return self._ko
+
+    @ko.setter
+    def ko(self, ko):
+        self._ko = ko
+        if self._state is not None:
+            self._state.set_ko(self._slot, ko)
+
     def __str__(self):
         return f"{self.name} ({self.type_pokemon}) - HP: {self.hp_actuals}, Attack: {self.attack}, Defense: {self.defense}, Speed: {self.speed}, Level: {self.level}"
     
@@ -32,90 +70,65 @@ class Pokemon:
         return f"Pokemon({self.name}, {self.type_pokemon}, {self.hp_actuals}, {self.attack}, {self.defense}, {self.speed}, {self.level})"
 
 
-    def attack_pokemon(self, target):
+    def attack_pokemon(self, target, rng=None):
 
         """
         Attacks a target Pokémon and calculates the damage inflicted.
         
         Args:
             target (Pokemon): The Pokémon receiving the attack
+            rng (random.Random): Random generator of the fight (default: random module)
             
         Returns:
-            dict: Information about the attack (damage, effectiveness)
+            AttackResult: Information about the attack (damage, effectiveness),
+                the message is only built when it is read
         """
 
-       # 1. Check if the attacker is KO
-        if self.ko:
-            return {
-                'success': False,
-                'message': f"{self.name} is KO and cannot attack!"
-            }
+       # 1. Check if the attacker is KO (the slots are read directly, the
+       # properties are only needed to write the HP and KO state)
+        if self._ko:
+            return AttackResult(AttackEvent.ATTACKER_KO, self, target)
         
         # 2. Check if the target is KO
-        if target.ko:
-            return {
-                'success': False,
-                'message': f"{target.name} is already KO!"
-            }
+        if target._ko:
+            return AttackResult(AttackEvent.TARGET_ALREADY_KO, self, target)
         
+        if rng is None:
+            rng = random
+
         # 3. Calculate accuracy (95% chance of hitting)
-        if random.random() > 0.95:
-            return {
-                'success': False,
-                'message': f"{self.name} missed their attack!",
-                'damage': 0
-            }
+        accuracy_roll = rng.random()
+        if accuracy_roll > 0.95:
+            return AttackResult(AttackEvent.MISS, self, target, accuracy_roll=accuracy_roll)
 
         base_damage = (self.attack * self.level / 5) - (target.defense / 2)
         base_damage = max(1, base_damage)  # Minimum 1 damage
         
         # 4. Type multiplier (efficiency)
-        type_multiplier = self.EFFICIENCY.get(self.type_pokemon, {}).get(target.type_pokemon, 1.0)
+        type_multiplier = TYPE_CHART[self.type_id][target.type_id]
         # 4.5 On fait cela pour calculer les degat du multiplier en fonction de la cible et de l'attaquant
         
         # 5. Random variability (between 0.85 and 1.0)
-        variability = random.uniform(0.85, 1.0)
+        variability = rng.uniform(0.85, 1.0)
         
         # Calculate final damage
         final_damage = int(base_damage * type_multiplier * variability)
         final_damage = max(1, final_damage)  # Minimum 1 damage
         
         # Apply damage to target
-        target.hp_actuals -= final_damage
-        target_knocked_out = False
-        
-        if target.hp_actuals <= 0:
-            target.hp_actuals = 0
-            target.ko = True
-            target_knocked_out = True
-
-        # 6. Constructing the attack message
-        messages = []
-        main_message = f"{self.name} attacks {target.name}!"
-        messages.append(main_message)
-        
-        # Determine effectiveness message
-        if type_multiplier > 1.0:
-            effectiveness_message = "It's super effective!"
-        elif type_multiplier < 1.0:
-            effectiveness_message = "It's not very effective..."
-        else:
-            effectiveness_message = ""
+        hp = target._hp_actuals - final_damage
+        target_knocked_out = hp <= 0
         
-        damage_message = f"→ {final_damage} damage points inflicted"
-        
-        if effectiveness_message:
-            messages.append(f"   {effectiveness_message}")
-        messages.append(damage_message)
-        
-        # 7. Return attack information
-        return {
-            'success': True,
-            'message': '\n'.join(messages),
-            'damage': final_damage,
-            'type_multiplier': type_multiplier,
-            'target_knocked_out': target_knocked_out
-        }
+        if target_knocked_out:
+            hp = 0
+            target._ko = True
+        target._hp_actuals = hp
+        if target._state is not None:
+            target._state.set_hp_ko(target._slot, hp, target_knocked_out)
+
+        # 6. Return attack information (the message is built on demand)
+        return AttackResult(AttackEvent.HIT, self, target, final_damage, type_multiplier, target_knocked_out,
+                            accuracy_roll, variability)
 
     def receive_damage(self, damage):
         """
@@ -124,11 +137,14 @@ class Pokemon:
         Args:
             damage (int): Number of damage points received
         """
-        self.hp_actuals -= damage
+        hp = self._hp_actuals - damage
         
-        if self.hp_actuals <= 0:
-            self.hp_actuals = 0
-            self.ko = True
+        if hp <= 0:
+            hp = 0
+            self._ko = True
+        self._hp_actuals = hp
+        if self._state is not None:
+            self._state.set_hp_ko(self._slot, hp, self._ko)
 
     def is_knockout(self):
         """Checks if the Pokémon is knocked out"""
@@ -136,8 +152,73 @@ class Pokemon:
 
     def heal(self):
         """Restores all of the Pokémon's HP"""
-        self.hp_actuals = self.hp_max
-        self.ko = False
+        self._hp_actuals = self._hp_max
+        self._ko = False
+        if self._state is not None:
+            self._state.set_hp_ko(self._slot, self._hp_max, False)
+
+    def gain_experience(self, experience):
+        """
+        Add experience points and level up if a threshold is reached
+        
+        The thresholds and the stats of every level come from the growth
+        table of the species: the stats won are the difference between the
+        rows of the old and the new level.
+        
+        Args:
+            experience (int): Experience points gained
+            
+        Returns:
+            int: Number of levels gained
+        """
+        table = growth_table(self.name, self.type_pokemon)
+        total = table.experience_for(self.level) + self.experience + experience
+        level = table.level_for(total)
+        if level <= self.level:
+            self.experience += experience
+            return 0
+
+        old_stats = table.stats[self.level]
+        new_stats = table.stats[level]
+        hp_gained = new_stats[0] - old_stats[0]
+        self.hp_max += hp_gained
+        if not self.ko:
+            self.hp_actuals += hp_gained
+        self.attack += new_stats[1] - old_stats[1]
+        self.defense += new_stats[2] - old_stats[2]
+        self.speed += new_stats[3] - old_stats[3]
+
+        levels_gained = level - self.level
+        self.level = level
+        self.experience = total - table.experience_for(level)
+        if self._state is not None:
+            self._state.update(self._slot, self)
+        return levels_gained
+
+    def experience_to_next_level(self):
+        """
+        Experience points missing to reach the next level
+        
+        Returns:
+            int: Points missing, 0 at the highest level
+        """
+        table = growth_table(self.name, self.type_pokemon)
+        if self.level >= table.max_level:
+            return 0
+        return table.experience_for(self.level + 1) - table.experience_for(self.level) - self.experience
+
+    def reset(self, name, level):
+        """
+        Turn the Pokémon into a new Pokémon of the same type (used by PokemonPool)
+        
+        Args:
+            name (str): Name of the new Pokémon
+            level (int): Level of the new Pokémon
+        """
+        if type(self) is Pokemon:
+            Pokemon.__init__(self, name, self.type_pokemon, level)
+        else:
+            type(self).__init__(self, name, level)
 
     def __str__(self):
         status = "KO" if self.ko else f"  {self.hp_actuals}/{self.hp_max} HP"
@@ -148,6 +229,8 @@ class Pokemon:
 class FirePokemon(Pokemon):
     """Pokemon fire type"""
 
+    __slots__ = ()
+
     def __init__(self, name, level=5):
         super().__init__(name, 'Fire', level)
         self.attack += 1
@@ -155,6 +238,8 @@ class FirePokemon(Pokemon):
 class WaterPokemon(Pokemon):
     """Pokemon water type"""
 
+    __slots__ = ()
+
     def __init__(self, name, level=5):
         super().__init__(name,'Water', level)
         self.defense += 1
@@ -162,6 +247,8 @@ class WaterPokemon(Pokemon):
 class PlantPokemon(Pokemon):
     """Pokemon plant type """
 
+    __slots__ = ()
+
     def __init__(self, name, level=5):
         super().__init__(name, "Plant", level)
         self.hp_max += 2
@@ -197,6 +284,30 @@ class PokemonFactory:
         
         return pokemon_class(name, level)
     
+    @staticmethod
+    def create_species(name, level=5):
+        """
+        Create a Pokemon of a species of the catalog, with the stats of the species
+        
+        Args:
+            name (str): Name of the species (see data/pokemon_data.json)
+            level (int): Level of the Pokemon
+            
+        Returns:
+            Pokemon: Instance of the created Pokemon, at full HP
+        """
+        species = get_catalog().get(name)
+        if species is None:
+            raise ValueError(f"Species '{name}' unknown")
+        
+        pokemon = PokemonFactory.create_pokemon(name, species.type_pokemon, level)
+        stats = species.stats_at(level)
+        pokemon.hp_max = pokemon.hp_actuals = stats['hp']
+        pokemon.attack = stats['attack']
+        pokemon.defense = stats['defense']
+        pokemon.speed = stats['speed']
+        return pokemon
+    
     @staticmethod
     def create_team(list_pokemon):
         """
@@ -215,27 +326,41 @@ class PokemonFactory:
         return team
 
 class PokemonGenerator:
-    """Generator of random Pokémon"""
-    
-    NAMES_BY_TYPE = {
-        'Fire': ["Ponyta", "Goupix", "Caninos", "Magmar"],
-        'Water': ["Psykokwak", "Poissirène", "Tentacool", "Krabby"],
-        'Plant': ["Mystherbe", "Chétiflor", "Saquedeneu", "Boustiflor"]
-    }
+    """Generator of random Pokémon (wild encounters of the routes of data/pokemon_data.json)"""
     
     @staticmethod
-    def generate_wild_pokemon(player_level):
+    def generate_wild_pokemon(player_level, rng=None, route='default', pool=None):
         """
         Generate a random wild Pokemon
         
         Args:
             player_level (int): Level of the player
+            rng (random.Random): Random generator to use (default: random module)
+            route (str): Route of the encounter (weights of the species and levels)
+            pool (PokemonPool): Pool recycling the Pokemon, None to create a new one
             
         Returns:
             Pokemon: Instance of the generated Pokemon
         """
-        type_pokemon = random.choice(['Fire', 'Water', 'Plant'])
-        name = random.choice(PokemonGenerator.NAMES_BY_TYPE[type_pokemon])
-        level = max(1, player_level - random.randint(1, 3))
+        from my_package.models.encounters import get_encounter_table
+
+        return get_encounter_table(route).sample(player_level, rng or random).to_pokemon(pool)
+    
+    @staticmethod
+    def generate_many(n, player_level, rng=None, route='default'):
+        """
+        Generate several wild encounters without creating the Pokemon
         
-        return PokemonFactory.create_pokemon(name, type_pokemon, level)
\ No newline at end of file
+        Args:
+            n (int): Number of encounters
+            player_level (int): Level of the player
+            rng (random.Random): Random generator to use (default: random module)
+            route (str): Route of the encounters
+            
+        Returns:
+            list: Candidates (name, type_pokemon, level, stats), create the
+                chosen one with candidate.to_pokemon()
+        """
+        from my_package.models.encounters import get_encounter_table
+
+        return get_encounter_table(route).sample_many(n, player_level, rng or random)
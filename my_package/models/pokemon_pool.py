@@ -0,0 +1,97 @@
+"""
+my_package/models/pokemon_pool.py
+Recycling of short-lived Pokemon (wild and training opponents)
+"""
+
+from my_package.models.pokemon import PokemonFactory
+
+
+class PokemonPool:
+    """
+    Pool of Pokemon instances reused instead of created
+
+    Released Pokemon are kept in a free list per Pokemon class and turned
+    into the next requested Pokemon with Pokemon.reset, so long training
+    loops stop allocating (and collecting) a Pokemon per encounter. Only
+    give back Pokemon that are not referenced any more (not in a team).
+
+    Attributes:
+        max_free (int): Maximum number of free Pokemon kept per class
+        created (int): Pokemon created by the pool
+        reused (int): Pokemon recycled by the pool
+    """
+
+    def __init__(self, max_free=256):
+        """
+        Args:
+            max_free (int): Maximum number of free Pokemon kept per class
+        """
+        self.max_free = max_free
+        self.created = 0
+        self.reused = 0
+        self._free = {pokemon_class: [] for pokemon_class in PokemonFactory.POKEMON_TYPES.values()}
+
+    def acquire(self, name, type_pokemon, level=5):
+        """
+        Get a Pokemon, recycled if possible
+
+        Args:
+            name (str): Name of the Pokemon
+            type_pokemon (str): 'Fire', 'Water', or 'Plant'
+            level (int): Level of the Pokemon
+
+        Returns:
+            Pokemon: Same Pokemon as PokemonFactory.create_pokemon(name, type_pokemon, level)
+        """
+        pokemon_class = PokemonFactory.POKEMON_TYPES.get(type_pokemon)
+        if pokemon_class is None:
+            raise ValueError(f"Type '{type_pokemon}' unknown")
+
+        free = self._free[pokemon_class]
+        if free:
+            pokemon = free.pop()
+            pokemon.reset(name, level)
+            self.reused += 1
+            return pokemon
+
+        self.created += 1
+        return pokemon_class(name, level)
+
+    def acquire_candidate(self, candidate):
+        """
+        Get the Pokemon of a wild encounter (see encounters.Candidate)
+
+        Args:
+            candidate (Candidate): Species and level of the Pokemon
+
+        Returns:
+            Pokemon: The Pokemon of the candidate
+        """
+        return self.acquire(candidate.species.name, candidate.species.type_pokemon, candidate.level)
+
+    def release(self, pokemon):
+        """
+        Give back a Pokemon not used any more
+
+        Args:
+            pokemon (Pokemon): Pokemon to recycle
+        """
+        free = self._free.get(type(pokemon))
+        if free is not None and len(free) < self.max_free:
+            free.append(pokemon)
+
+    def release_team(self, trainer):
+        """
+        Give back all the Pokemon of a trainer and empty its team
+
+        Args:
+            trainer (Trainer): Trainer whose team is recycled
+        """
+        for pokemon in trainer.team:
+            self.release(pokemon)
+        trainer.team = []
+        trainer.active_pokemon = None
+
+    def __len__(self):
+        """Number of free Pokemon in the pool"""
+        return sum(len(free) for free in self._free.values())
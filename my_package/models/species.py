@@ -0,0 +1,307 @@
+"""
+my_package/models/species.py
+Catalog of the Pokemon species, loaded from data/pokemon_data.json
+"""
+
+import json
+import os
+import pickle
+from types import MappingProxyType
+
+from my_package.models.type_chart import TYPE_IDS
+
+
+DATA_FILE = os.path.join(os.path.dirname(__file__), '..', '..', 'data', 'pokemon_data.json')
+
+# Width of the level bands of the index (levels 1-5, 6-10...)
+LEVEL_BAND = 5
+
+# Changed when the pickled catalog is not compatible any more
+CACHE_VERSION = 3
+
+STATS = ('hp', 'attack', 'defense', 'speed')
+
+
+class Species:
+    """
+    A species of Pokemon: type and stats by level
+
+    A stat at a level is: base + growth * level. Species are immutable and
+    shared by every Pokemon and candidate of the species (flyweights).
+
+    Attributes:
+        name (str): Name of the species
+        type_pokemon (str): 'Fire', 'Water' or 'Plant'
+        type_id (int): Type id (index in TYPE_CHART)
+        base (dict): Stats at level 0 (hp, attack, defense, speed)
+        growth (dict): Stats gained per level
+        growth_rate (str): Experience curve of the species
+        rarity (float): Relative weight of the species in wild encounters
+        min_level (int): Lowest level of the species in the wild
+        max_level (int): Highest level of the species in the wild
+        wild (bool): True if the species can be met in the wild
+    """
+
+    __slots__ = ('name', 'type_pokemon', 'type_id', 'base', 'growth', 'growth_rate', 'rarity',
+                 'min_level', 'max_level', 'wild')
+
+    def __init__(self, name, type_pokemon, base, growth, growth_rate='medium_fast', rarity=1.0,
+                 min_level=1, max_level=100, wild=True):
+        set_field = object.__setattr__
+        set_field(self, 'name', name)
+        set_field(self, 'type_pokemon', type_pokemon)
+        set_field(self, 'type_id', TYPE_IDS[type_pokemon])
+        set_field(self, 'base', MappingProxyType(dict(base)))
+        set_field(self, 'growth', MappingProxyType(dict(growth)))
+        set_field(self, 'growth_rate', growth_rate)
+        set_field(self, 'rarity', rarity)
+        set_field(self, 'min_level', min_level)
+        set_field(self, 'max_level', max_level)
+        set_field(self, 'wild', wild)
+
+    def __setattr__(self, name, value):
+        raise AttributeError(f"Species are immutable (cannot set '{name}')")
+
+    def __delattr__(self, name):
+        raise AttributeError(f"Species are immutable (cannot delete '{name}')")
+
+    def __reduce__(self):
+        return (Species, (self.name, self.type_pokemon, dict(self.base), dict(self.growth), self.growth_rate,
+                          self.rarity, self.min_level, self.max_level, self.wild))
+
+    def stats_at(self, level):
+        """
+        Stats of the species at a level
+
+        Args:
+            level (int): Level of the Pokemon
+
+        Returns:
+            dict: hp, attack, defense, speed
+        """
+        return {stat: self.base[stat] + self.growth[stat] * level for stat in STATS}
+
+    def __repr__(self):
+        return f"Species({self.name}, {self.type_pokemon}, levels {self.min_level}-{self.max_level})"
+
+
+def _parse_species(entry):
+    """Build a Species from an entry of the data file, raise ValueError if invalid"""
+    name = entry.get('name')
+    if not isinstance(name, str) or not name:
+        raise ValueError(f"Species without a name: {entry!r}")
+
+    if entry.get('type') not in TYPE_IDS:
+        raise ValueError(f"Species '{name}': type {entry.get('type')!r} unknown")
+
+    base = entry.get('base', {})
+    growth = entry.get('growth', {})
+    for stat in STATS:
+        if not isinstance(base.get(stat), int) or not isinstance(growth.get(stat), int):
+            raise ValueError(f"Species '{name}': base and growth of '{stat}' must be integers")
+
+    min_level, max_level = entry.get('levels', [1, 100])
+    if not 1 <= min_level <= max_level:
+        raise ValueError(f"Species '{name}': invalid levels {min_level}-{max_level}")
+
+    rarity = float(entry.get('rarity', 1.0))
+    if rarity < 0:
+        raise ValueError(f"Species '{name}': negative rarity")
+
+    return Species(name, entry['type'], {stat: base[stat] for stat in STATS},
+                   {stat: growth[stat] for stat in STATS}, entry.get('growth_rate', 'medium_fast'),
+                   rarity, min_level, max_level, bool(entry.get('wild', True)))
+
+
+class SpeciesCatalog:
+    """
+    All the species, indexed by name, by type and by level band
+
+    Attributes:
+        species (list): Species in the order of the data file
+        routes (dict): Wild encounters by route: {'species': {name: weight}, 'level_offsets': {offset: weight}}
+    """
+
+    def __init__(self, species, routes=None):
+        """
+        Args:
+            species (list): Species of the catalog
+            routes (dict): Routes of the data file (see _parse_routes), None for a 'default' route only
+
+        Raises:
+            ValueError: If two species have the same name or a route is not valid
+        """
+        self.species = list(species)
+
+        self._by_name = {}
+        self._by_type = {type_name: [] for type_name in TYPE_IDS}
+        self._wild_by_type = {type_name: [] for type_name in TYPE_IDS}
+        self._by_band = {}
+
+        for species in self.species:
+            if species.name in self._by_name:
+                raise ValueError(f"Species '{species.name}' defined twice")
+            self._by_name[species.name] = species
+            self._by_type[species.type_pokemon].append(species)
+
+            if species.wild:
+                self._wild_by_type[species.type_pokemon].append(species)
+                for band in range(species.min_level // LEVEL_BAND, species.max_level // LEVEL_BAND + 1):
+                    self._by_band.setdefault(band, []).append(species)
+
+        self.routes = self._parse_routes(routes or {'default': {}})
+
+    def _parse_routes(self, routes):
+        """
+        Complete and check the routes
+
+        A route without 'species' has every wild species, weighted by its
+        rarity. Without 'level_offsets', the level is the level of the
+        player minus 1, 2 or 3.
+        """
+        parsed = {}
+        for route, definition in routes.items():
+            weights = definition.get('species')
+            if weights is None:
+                weights = {species.name: species.rarity for species in self.species if species.wild}
+
+            unknown = [name for name in weights if name not in self._by_name]
+            if unknown:
+                raise ValueError(f"Route '{route}': species {unknown} unknown")
+            if not any(weight > 0 for weight in weights.values()):
+                raise ValueError(f"Route '{route}' has no species")
+
+            offsets = {int(offset): weight for offset, weight in
+                       definition.get('level_offsets', {1: 1, 2: 1, 3: 1}).items()}
+            parsed[route] = {'species': dict(weights), 'level_offsets': offsets}
+        return parsed
+
+    @classmethod
+    def from_data(cls, data):
+        """
+        Build a catalog from the content of the data file
+
+        Args:
+            data (dict): {'species': [entries], 'routes': {name: definition}}
+
+        Returns:
+            SpeciesCatalog: The catalog
+
+        Raises:
+            ValueError: If an entry is not valid
+        """
+        return cls((_parse_species(entry) for entry in data.get('species', [])), data.get('routes'))
+
+    def __len__(self):
+        return len(self.species)
+
+    def __contains__(self, name):
+        return name in self._by_name
+
+    def get(self, name):
+        """
+        Find a species by name
+
+        Args:
+            name (str): Name of the species
+
+        Returns:
+            Species: The species, None if unknown
+        """
+        return self._by_name.get(name)
+
+    def by_type(self, type_pokemon, wild_only=False):
+        """
+        Species of a type, in the order of the data file
+
+        Args:
+            type_pokemon (str): 'Fire', 'Water' or 'Plant'
+            wild_only (bool): Keep only the species met in the wild
+
+        Returns:
+            list: Species of the type
+        """
+        index = self._wild_by_type if wild_only else self._by_type
+        return index.get(type_pokemon, [])
+
+    def wild_at_level(self, level):
+        """
+        Wild species that can be met at a level
+
+        Args:
+            level (int): Level of the encounter
+
+        Returns:
+            list: Species whose levels include the level
+        """
+        return [species for species in self._by_band.get(level // LEVEL_BAND, [])
+                if species.min_level <= level <= species.max_level]
+
+
+def _cache_file(path):
+    """Pickled catalog of a data file, in a __pycache__ directory next to it"""
+    directory, file_name = os.path.split(os.path.abspath(path))
+    return os.path.join(directory, '__pycache__', os.path.splitext(file_name)[0] + '.catalog.pickle')
+
+
+def load_catalog(path=DATA_FILE, use_cache=True):
+    """
+    Load the species catalog of a data file
+
+    The parsed and indexed catalog is pickled next to the data file, keyed
+    on its modification time and size: following loads read the pickle
+    and never parse the JSON again until the file changes.
+
+    Args:
+        path (str): JSON data file
+        use_cache (bool): Read and write the pickled catalog
+
+    Returns:
+        SpeciesCatalog: The catalog
+
+    Raises:
+        ValueError: If the data file is not valid
+    """
+    stat = os.stat(path)
+    key = (CACHE_VERSION, stat.st_mtime_ns, stat.st_size)
+    cache_file = _cache_file(path)
+
+    if use_cache and os.path.exists(cache_file):
+        try:
+            with open(cache_file, 'rb') as f:
+                cached_key, catalog = pickle.load(f)
+            if cached_key == key:
+                return catalog
+        except (OSError, pickle.UnpicklingError, EOFError, AttributeError, ValueError):
+            pass
+
+    with open(path, 'r', encoding='utf-8') as f:
+        catalog = SpeciesCatalog.from_data(json.load(f))
+
+    if use_cache:
+        try:
+            os.makedirs(os.path.dirname(cache_file), exist_ok=True)
+            temp_file = f"{cache_file}.{os.getpid()}.tmp"
+            with open(temp_file, 'wb') as f:
+                pickle.dump((key, catalog), f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(temp_file, cache_file)
+        except OSError:
+            pass  # Read-only install: parse the JSON each time
+
+    return catalog
+
+
+_catalog = None
+
+
+def get_catalog():
+    """
+    Catalog of the game data file, loaded on first use
+
+    Returns:
+        SpeciesCatalog: The catalog of data/pokemon_data.json
+    """
+    global _catalog
+    if _catalog is None:
+        _catalog = load_catalog()
+    return _catalog
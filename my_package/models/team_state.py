@@ -0,0 +1,250 @@
+"""
+my_package/models/team_state.py
+Compact array-backed state of a team for simulations
+"""
+
+from array import array
+
+
+# A team has 6 Pokemon max (see Trainer.add_pokemon)
+MAX_TEAM_SIZE = 6
+
+# Fields of the stats array, each one is a block of MAX_TEAM_SIZE slots
+HP = 0
+HP_MAX = 1
+ATTACK = 2
+DEFENSE = 3
+SPEED = 4
+LEVEL = 5
+TYPE_ID = 6
+NB_FIELDS = 7
+
+
+class TeamState:
+    """
+    State of a team stored as a struct of arrays in a single buffer
+
+    The stats of slot i for field f are at stats[f * MAX_TEAM_SIZE + i]:
+    a whole team fits in one array of unsigned shorts instead of one
+    object per Pokemon. The KO Pokemon are kept in a bitmask: bit i is set
+    when the Pokemon of slot i is KO, so the team is KO when every bit is set.
+
+    A state is either a detached snapshot of a team (from_team), played
+    on its own by receive_damage and heal, or the live state of the team of
+    a Trainer: the Pokemon attached to it write their HP and KO changes
+    through (see Pokemon.hp_actuals and Pokemon.ko), so the queries of the
+    trainer (team_ko, count_available_pokemon, choose_available_pokemon)
+    are bit operations on ko_mask instead of scans of the team.
+
+    Attributes:
+        stats (array): Stats of the slots, field by field
+        size (int): Number of Pokemon in the team
+        ko_mask (int): Bitmask of the KO slots
+        version (int): Incremented at every change of the HP, KO or stats of a slot
+        layout (int): Incremented when the Pokemon of the slots change
+    """
+
+    __slots__ = ('stats', 'size', 'ko_mask', 'version', 'layout')
+
+    def __init__(self):
+        self.stats = array('H', bytes(2 * NB_FIELDS * MAX_TEAM_SIZE))
+        self.size = 0
+        self.ko_mask = 0
+        self.version = 0
+        self.layout = 0
+
+    @classmethod
+    def from_team(cls, team):
+        """
+        Create the state of a list of Pokemon
+
+        Args:
+            team (list): Pokemon of the team (6 max)
+
+        Returns:
+            TeamState: State of the team
+        """
+        state = cls()
+        for pokemon in team:
+            state.add(pokemon)
+        return state
+
+    def add(self, pokemon):
+        """
+        Add a Pokemon in the next slot
+
+        Args:
+            pokemon (Pokemon): Pokemon to add
+
+        Returns:
+            bool: True if the Pokemon was added, False if the team is full
+        """
+        slot = self.size
+        if slot >= MAX_TEAM_SIZE:
+            return False
+
+        self.size += 1
+        self.layout += 1
+        self.update(slot, pokemon)
+        return True
+
+    def attach(self, pokemon):
+        """
+        Add a Pokemon in the next slot and keep the slot up to date with it
+
+        Args:
+            pokemon (Pokemon): Pokemon joining the team
+
+        Returns:
+            bool: True if the Pokemon was attached, False if the team is full
+        """
+        if not self.add(pokemon):
+            return False
+        pokemon._state = self
+        pokemon._slot = self.size - 1
+        return True
+
+    def clear(self, team=()):
+        """
+        Empty the state and detach the Pokemon of the team
+
+        Args:
+            team (list): Pokemon attached to this state
+        """
+        for pokemon in team:
+            if pokemon._state is self:
+                pokemon._state = None
+        self.size = 0
+        self.ko_mask = 0
+        self.version += 1
+        self.layout += 1
+
+    def update(self, slot, pokemon):
+        """
+        Copy all the stats of a Pokemon in its slot (after a level up...)
+
+        Args:
+            slot (int): Slot of the Pokemon
+            pokemon (Pokemon): Pokemon of the slot
+        """
+        stats = self.stats
+        stats[HP * MAX_TEAM_SIZE + slot] = max(0, pokemon.hp_actuals)
+        stats[HP_MAX * MAX_TEAM_SIZE + slot] = pokemon.hp_max
+        stats[ATTACK * MAX_TEAM_SIZE + slot] = pokemon.attack
+        stats[DEFENSE * MAX_TEAM_SIZE + slot] = pokemon.defense
+        stats[SPEED * MAX_TEAM_SIZE + slot] = pokemon.speed
+        stats[LEVEL * MAX_TEAM_SIZE + slot] = pokemon.level
+        stats[TYPE_ID * MAX_TEAM_SIZE + slot] = pokemon.type_id
+        self.set_ko(slot, pokemon.ko)
+
+    def set_hp(self, slot, hp):
+        """Write the HP of the Pokemon of a slot (called by Pokemon.hp_actuals)"""
+        self.stats[HP * MAX_TEAM_SIZE + slot] = hp if hp > 0 else 0
+        self.version += 1
+
+    def set_hp_ko(self, slot, hp, ko):
+        """Write the HP and the KO state of the Pokemon of a slot in one call (attacks, heal)"""
+        self.stats[HP * MAX_TEAM_SIZE + slot] = hp
+        if ko:
+            self.ko_mask |= 1 << slot
+        else:
+            self.ko_mask &= ~(1 << slot)
+        self.version += 1
+
+    def set_ko(self, slot, ko):
+        """Write the KO state of the Pokemon of a slot (called by Pokemon.ko)"""
+        if ko:
+            self.ko_mask |= 1 << slot
+        else:
+            self.ko_mask &= ~(1 << slot)
+        self.version += 1
+
+    def __len__(self):
+        return self.size
+
+    def get(self, field, slot):
+        """
+        Read a stat of a slot
+
+        Args:
+            field (int): HP, HP_MAX, ATTACK, DEFENSE, SPEED, LEVEL or TYPE_ID
+            slot (int): Slot of the Pokemon
+
+        Returns:
+            int: Value of the stat
+        """
+        return self.stats[field * MAX_TEAM_SIZE + slot]
+
+    def is_ko(self, slot):
+        """Check if the Pokemon of a slot is KO"""
+        return bool(self.ko_mask >> slot & 1)
+
+    def team_ko(self):
+        """
+        Check if the team is KO
+
+        Returns:
+            bool: True if all the Pokemon are KO
+        """
+        return self.ko_mask == (1 << self.size) - 1
+
+    def count_available_pokemon(self):
+        """
+        Count the number of Pokemon still able to fight
+
+        Returns:
+            int: Number of Pokemon not KO
+        """
+        return self.size - bin(self.ko_mask).count('1')
+
+    def choose_available_pokemon(self):
+        """
+        Find the first Pokemon able to fight
+
+        Returns:
+            int: Slot of the Pokemon, None if all are KO
+        """
+        available = ~self.ko_mask & ((1 << self.size) - 1)
+        if not available:
+            return None
+        return (available & -available).bit_length() - 1
+
+    def receive_damage(self, slot, damage):
+        """
+        Apply damage to the Pokemon of a slot of a detached snapshot
+
+        Args:
+            slot (int): Slot of the Pokemon
+            damage (int): Number of damage points received
+
+        Returns:
+            bool: True if the Pokemon is KO after the damage
+        """
+        index = HP * MAX_TEAM_SIZE + slot
+        hp = self.stats[index] - damage
+        self.version += 1
+        if hp <= 0:
+            self.stats[index] = 0
+            self.ko_mask |= 1 << slot
+            return True
+
+        self.stats[index] = hp
+        return False
+
+    def heal(self):
+        """Restore the HP of every Pokemon of a detached snapshot"""
+        self.stats[HP * MAX_TEAM_SIZE:(HP + 1) * MAX_TEAM_SIZE] = \
+            self.stats[HP_MAX * MAX_TEAM_SIZE:(HP_MAX + 1) * MAX_TEAM_SIZE]
+        self.ko_mask = 0
+        self.version += 1
+
+    def apply_to(self, team):
+        """
+        Copy the HP and KO state back to the Pokemon objects
+
+        Args:
+            team (list): Pokemon of the team, in slot order
+        """
+        for slot, pokemon in enumerate(team):
+            pokemon.hp_actuals = self.stats[HP * MAX_TEAM_SIZE + slot]
+            pokemon.ko = self.is_ko(slot)
@@ -1,3 +1,8 @@
+from my_package.models.matchup import MatchupIndex
+from my_package.models.team_state import TeamState
+from my_package.models.type_chart import TYPE_CHART
+
+
 class Trainer:
     def __init__(self, name):
         
@@ -7,9 +12,30 @@ class Trainer:
             name (str) : Trainer name
         """
         self.name = name
-        self.team = []
+        # Live HP and KO state of the team, kept up to date by its Pokemon
+        self.state = TeamState()
+        self._team = []
         self.active_pokemon = None
 
+    @property
+    def team(self):
+        """Pokemon of the team (add them with add_pokemon, or assign a whole list)"""
+        return self._team
+
+    @team.setter
+    def team(self, team):
+        self.state.clear(self._team)
+        self._team = team
+        for pokemon in team:
+            self.state.attach(pokemon)
+
+    def _synced_state(self):
+        """The TeamState of the team, rebuilt if the list was changed in place"""
+        state = self.state
+        if state.size != len(self._team):
+            self.team = self._team
+        return state
+
 
     def add_pokemon(self, pokemon):
         # limited to 6 Pokemon max
@@ -17,7 +43,8 @@ class Trainer:
             print(f"NOPE {self.name} team are fully complete with 6 Pokemon !")
             return False
         
-        self.team.append(pokemon)
+        self._team.append(pokemon)
+        self._synced_state()
         
         #  1st pokemon become active
         if len(self.team) == 1:
@@ -25,37 +52,42 @@ class Trainer:
         
         return True
         
-    def choose_pokemon(self, index):
+    def choose_pokemon(self, index, verbose=True):
         """
         Choose a Pokemon for the fight
         
         Args:
             index (int): Index of the Pokemon in the team (0-5)
+            verbose (bool): Display the result of the change
             
         Returns:
             bool: True if change is successful, False otherwise
         """
         # check if the index is valid
         if index < 0 or index >= len(self.team):
-            print(f"Pokemon #{index + 1} doesn't exist !")
+            if verbose:
+                print(f"Pokemon #{index + 1} doesn't exist !")
             return False
         
         pokemon_chosen = self.team[index]
         
         # check if the Pokemon is not KO
         if pokemon_chosen.ko:
-            print(f"{pokemon_chosen.name} is KO and can't fight !")
+            if verbose:
+                print(f"{pokemon_chosen.name} is KO and can't fight !")
             return False
         
         # check if the Pokemon is not already active
         if pokemon_chosen == self.active_pokemon:
-            print(f" !! {pokemon_chosen.name} is already in combat !")
+            if verbose:
+                print(f" !! {pokemon_chosen.name} is already in combat !")
             return False
         
         # change the Pokemon
-        previous = self.active_pokemon.name if self.active_pokemon else "None"
+        if verbose:
+            previous = self.active_pokemon.name if self.active_pokemon else "None"
+            print(f" {self.name} recall {previous} and send {pokemon_chosen.name} !")
         self.active_pokemon = pokemon_chosen
-        print(f" {self.name} recall {previous} and send {pokemon_chosen.name} !")
         
         return True
 
@@ -68,12 +100,12 @@ class Trainer:
         Returns:
             bool: True if a Pokemon has been found, False if all are KO
         """
-        for pokemon in self.team:
-            if not pokemon.ko:
-                self.active_pokemon = pokemon
-                return True
-        
-        return False
+        slot = self._synced_state().choose_available_pokemon()
+        if slot is None:
+            return False
+
+        self.active_pokemon = self._team[slot]
+        return True
     
     def team_ko(self):
         """
@@ -82,7 +114,7 @@ class Trainer:
         Returns:
             bool: True if all the Pokemon are KO
         """
-        return all(pokemon.ko for pokemon in self.team)
+        return self._synced_state().team_ko()
     
     def count_available_pokemon(self):
         """
@@ -91,8 +123,17 @@ class Trainer:
         Returns:
             int: Number of Pokemon not KO
         """
-        return sum(1 for pokemon in self.team if not pokemon.ko)
+        return self._synced_state().count_available_pokemon()
     
+    def team_state(self):
+        """
+        Snapshot the team in a detached TeamState (for simulations)
+
+        Returns:
+            TeamState: State of the team, slots in the order of the team
+        """
+        return TeamState.from_team(self.team)
+
     def heal_team(self):
         """
         Heal all the Pokemon of the team
@@ -135,18 +176,23 @@ class Champion(Trainer):
     
     Attributes:
         specialty_type (str): Champion's elemental type
+        ai: Search IA deciding the actions (see battle_ai), None for the simple IA
     """
 
-    def __init__(self, name, type_affinity):
+    def __init__(self, name, type_affinity, ai=None):
 
         """
         Initiate a champion
         Args:
             name (str): champion name
             type_affinity (str): champion elemental type
+            ai: IA with a choose_action(champion, adversary_pokemon) method,
+                e.g. ExpectimaxAI for the harder floors (default: simple IA)
         """
         super().__init__(name)
         self.type_affinity = type_affinity
+        self.ai = ai
+        self._matchups = None
 
     def choose_action_ia(self, adversary_pokemon):
         """
@@ -158,24 +204,43 @@ class Champion(Trainer):
         Returns:
             dict: Action to perform {'action': 'attack'/'change', 'index': int}
         """
+        if self.ai is not None:
+            return self.ai.choose_action(self, adversary_pokemon)
+
         # Strategy 1 : If the active Pokemon is in bad shape, try to change
         if self.active_pokemon.hp_actuals < self.active_pokemon.hp_max * 0.3:
             # Search for a Pokemon in better shape
-            best_pokemon = self._find_best_pokemon(adversary_pokemon)
-            if best_pokemon and best_pokemon != self.active_pokemon:
-                index = self.team.index(best_pokemon)
+            index = self._find_best_slot(adversary_pokemon)
+            if index is not None and self.team[index] != self.active_pokemon:
                 return {'action': 'change', 'index': index}
         
         # Strategy 2 : If disadvantaged by the type, try to change
         if self._has_type_disadvantage(self.active_pokemon, adversary_pokemon):
-            best_pokemon = self._find_best_pokemon(adversary_pokemon)
-            if best_pokemon and best_pokemon != self.active_pokemon:
-                index = self.team.index(best_pokemon)
+            index = self._find_best_slot(adversary_pokemon)
+            if index is not None and self.team[index] != self.active_pokemon:
                 return {'action': 'change', 'index': index}
         
         # Default : Attack
         return {'action': 'attack'}
 
+    def _find_best_slot(self, adversary_pokemon):
+        """
+        Find the slot of the best Pokemon to send against the adversary
+
+        The answer comes from the matchup index of the team, recomputed
+        only when the version of the TeamState of the team changes.
+        
+        Args:
+            adversary_pokemon (Pokemon): Adversary Pokemon
+            
+        Returns:
+            int: Index of the best Pokemon available or None
+        """
+        state = self._synced_state()
+        if self._matchups is None or self._matchups.team is not self.team:
+            self._matchups = MatchupIndex(self.team, state)
+        return self._matchups.best_slot(adversary_pokemon.type_id)
+
     def _find_best_pokemon(self, adversary_pokemon):
         """
         Find the best Pokemon to send against the adversary
@@ -186,31 +251,8 @@ class Champion(Trainer):
         Returns:
             Pokemon: Best Pokemon available or None
         """
-        best = None
-        best_score = -1
-        
-        for pokemon in self.team:
-            if pokemon.ko:
-                continue
-            
-            score = 0
-            
-            # Score based on remaining HP (0-100)
-            score += (pokemon.hp_actuals / pokemon.hp_max) * 100
-            
-            # Bonus if type advantage (+200)
-            if self._has_type_advantage(pokemon, adversary_pokemon):
-                score += 200
-            
-            # Malus if type disadvantage (-100)
-            if self._has_type_disadvantage(pokemon, adversary_pokemon):
-                score -= 100
-            
-            if score > best_score:
-                best_score = score
-                best = pokemon
-        
-        return best
+        index = self._find_best_slot(adversary_pokemon)
+        return self.team[index] if index is not None else None
     
 
     def _has_type_advantage(self, attacker, defender):
@@ -224,9 +266,7 @@ class Champion(Trainer):
         Returns:
             bool: True if the attacker has a type advantage
         """
-        from my_package.models.pokemon import Pokemon
-        
-        effectiveness = Pokemon.EFFICIENCY.get(attacker.type_pokemon, {}).get(defender.type_pokemon, 1.0)
+        effectiveness = TYPE_CHART[attacker.type_id][defender.type_id]
         return effectiveness > 1.0
     
     def _has_type_disadvantage(self, attacker, defender):
@@ -240,7 +280,5 @@ class Champion(Trainer):
         Returns:
             bool: True if the attacker has a type disadvantage
         """
-        from my_package.models.pokemon import Pokemon
-        
-        effectiveness = Pokemon.EFFICIENCY.get(attacker.type_pokemon, {}).get(defender.type_pokemon, 1.0)
+        effectiveness = TYPE_CHART[attacker.type_id][defender.type_id]
         return effectiveness < 1.0
\ No newline at end of file
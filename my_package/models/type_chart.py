@@ -0,0 +1,97 @@
+"""
+my_package/models/type_chart.py
+Pokemon types and the dense table of the type multipliers
+"""
+
+from enum import IntEnum
+
+
+class PokemonType(IntEnum):
+    """Identifier of a Pokemon type, used as index in TYPE_CHART"""
+
+    FIRE = 0
+    WATER = 1
+    PLANT = 2
+
+
+# Name of each type, indexed by PokemonType
+TYPE_NAMES = ('Fire', 'Water', 'Plant')
+
+# Type name -> type id
+TYPE_IDS = {name: int(type_id) for type_id, name in zip(PokemonType, TYPE_NAMES)}
+
+# Efficiency Table: multiplier of an attacker type against a defender type
+EFFICIENCY = {
+    'Fire': {'Plant': 2.0, 'Water': 0.5, 'Fire': 1.0},
+    'Water': {'Fire': 2.0, 'Plant': 0.5, 'Water': 1.0},
+    'Plant': {'Water': 2.0, 'Fire': 0.5, 'Plant': 1.0}
+}
+
+
+def load_type_chart(table):
+    """
+    Build the dense multiplier matrix from an efficiency table
+
+    Every attacker type must give a multiplier against every defender type,
+    a missing or unknown pair is an error.
+
+    Args:
+        table (dict): {attacker type name: {defender type name: multiplier}}
+
+    Returns:
+        tuple: chart[attacker type id][defender type id] -> multiplier
+
+    Raises:
+        ValueError: If the table does not cover exactly every pair of types
+    """
+    unknown = set(table) - set(TYPE_IDS)
+    if unknown:
+        raise ValueError(f"Unknown attacker types in the efficiency table: {sorted(unknown)}")
+
+    chart = []
+    for attacker_type in TYPE_NAMES:
+        if attacker_type not in table:
+            raise ValueError(f"Type '{attacker_type}' missing from the efficiency table")
+
+        row = table[attacker_type]
+        unknown = set(row) - set(TYPE_IDS)
+        if unknown:
+            raise ValueError(f"Unknown defender types for '{attacker_type}': {sorted(unknown)}")
+
+        multipliers = []
+        for defender_type in TYPE_NAMES:
+            if defender_type not in row:
+                raise ValueError(f"Multiplier '{attacker_type}' -> '{defender_type}' missing")
+
+            multiplier = float(row[defender_type])
+            if multiplier < 0:
+                raise ValueError(f"Negative multiplier '{attacker_type}' -> '{defender_type}'")
+            multipliers.append(multiplier)
+
+        chart.append(tuple(multipliers))
+
+    return tuple(chart)
+
+
+# Dense table validated at import: TYPE_CHART[attacker.type_id][defender.type_id]
+TYPE_CHART = load_type_chart(EFFICIENCY)
+
+
+def type_id(type_pokemon):
+    """
+    Get the id of a type from its name
+
+    Args:
+        type_pokemon (str): 'Fire', 'Water', or 'Plant'
+
+    Returns:
+        int: Type id (value of PokemonType)
+
+    Raises:
+        ValueError: If the type is unknown
+    """
+    try:
+        return TYPE_IDS[type_pokemon]
+    except KeyError:
+        raise ValueError(f"Type '{type_pokemon}' unknown") from None
+
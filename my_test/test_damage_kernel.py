@@ -0,0 +1,61 @@
+import random
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from my_package.models import damage_kernel
+from my_package.models.pokemon import PokemonFactory
+
+SPECIES = ("Salamèche", "Carapuce", "Bulbizarre", "Stari", "Goupix", "Mystherbe")
+
+
+def make_hits(n_hits, seed):
+    """Attacker and target of each hit, the target with random HP"""
+    rng = random.Random(seed)
+    hits = []
+    for _ in range(n_hits):
+        attacker = PokemonFactory.create_species(rng.choice(SPECIES), rng.randint(2, 40))
+        target = PokemonFactory.create_species(rng.choice(SPECIES), rng.randint(2, 40))
+        target.hp_actuals = rng.randint(1, target.hp_max)
+        hits.append((attacker, target))
+    return hits
+
+
+@pytest.mark.parametrize('n_hits', [1, 2, 3000])
+def test_kernel_matches_attack_pokemon(n_hits):
+    hits = make_hits(n_hits, seed=n_hits)
+    attackers = damage_kernel.pokemon_arrays([attacker for attacker, _ in hits])
+    targets = damage_kernel.pokemon_arrays([target for _, target in hits])
+
+    for seed in range(5):
+        random_state = damage_kernel.random_state_from(random.Random(seed))
+        accuracy_rolls, variability_rolls = damage_kernel.draw_rolls(random_state, n_hits)
+        batch = damage_kernel.compute_damage(attackers['attack'], attackers['level'], targets['defense'],
+                                             targets['hp'], attackers['type'], targets['type'],
+                                             accuracy_rolls, variability_rolls)
+
+        rng = random.Random(seed)
+        for i, (attacker, target) in enumerate(hits):
+            hp, ko = target.hp_actuals, target.ko
+            result = attacker.attack_pokemon(target, rng)
+            target.hp_actuals, target.ko = hp, ko
+
+            assert bool(batch['hit'][i]) == result.success
+            assert int(batch['damage'][i]) == result.damage
+            assert bool(batch['knocked_out'][i]) == result.target_knocked_out
+            assert accuracy_rolls[i] == result.accuracy_roll
+
+        # The stream continues where the scalar calls stopped
+        synced = random.Random()
+        damage_kernel.sync_random(synced, random_state)
+        assert [synced.random() for _ in range(3)] == [rng.random() for _ in range(3)]
+
+
+def test_no_hit():
+    random_state = damage_kernel.random_state_from(random.Random(1))
+    accuracy_rolls, variability_rolls = damage_kernel.draw_rolls(random_state, 0)
+    assert len(accuracy_rolls) == len(variability_rolls) == 0
+    synced = random.Random()
+    damage_kernel.sync_random(synced, random_state)
+    assert synced.random() == random.Random(1).random()
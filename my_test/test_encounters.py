@@ -0,0 +1,84 @@
+import random
+from collections import Counter
+
+import pytest
+
+from my_package.models.encounters import AliasTable, EncounterTable, get_encounter_table
+from my_package.models.pokemon_pool import PokemonPool
+from my_package.models.species import SpeciesCatalog
+
+DRAWS = 60000
+
+
+def make_catalog():
+    def entry(name, levels):
+        return {'name': name, 'type': "Fire", 'base': {'hp': 20, 'attack': 6, 'defense': 3, 'speed': 3},
+                'growth': {'hp': 5, 'attack': 2, 'defense': 1, 'speed': 1}, 'levels': levels}
+
+    return SpeciesCatalog.from_data({
+        'species': [entry("Low", [1, 10]), entry("Common", [1, 10]), entry("High", [20, 30]),
+                    entry("Never", [1, 100])],
+        'routes': {'test': {'species': {"Low": 1, "Common": 3, "High": 2, "Never": 0},
+                            'level_offsets': {0: 1}}}
+    })
+
+
+def frequencies(samples):
+    counts = Counter(samples)
+    return {outcome: count / len(samples) for outcome, count in counts.items()}
+
+
+def assert_close(samples, weights):
+    total = sum(weights.values())
+    assert frequencies(samples) == pytest.approx({outcome: weight / total for outcome, weight in weights.items()
+                                                  if weight}, abs=0.01)
+
+
+def test_alias_table_follows_the_weights():
+    weights = {'a': 1, 'b': 2, 'c': 3, 'd': 4, 'e': 0}
+    table = AliasTable(list(weights), list(weights.values()))
+    rng = random.Random(5)
+    assert_close([table.sample(rng) for _ in range(DRAWS)], weights)
+
+
+def test_alias_table_rejects_invalid_weights():
+    for outcomes, weights in ((['a', 'b'], [1]), ([], []), (['a'], [0]), (['a', 'b'], [2, -1])):
+        with pytest.raises(ValueError):
+            AliasTable(outcomes, weights)
+
+
+def test_species_of_the_route_met_at_the_level():
+    table = EncounterTable('test', make_catalog())
+    rng = random.Random(8)
+
+    low = table.sample_many(DRAWS, 5, rng)
+    assert {candidate.level for candidate in low} == {5}
+    assert_close([candidate.name for candidate in low], {"Low": 1, "Common": 3})
+
+    assert {candidate.name for candidate in table.sample_many(500, 25, rng)} == {"High"}
+
+
+def test_level_without_species_uses_the_whole_route():
+    table = EncounterTable('test', make_catalog())
+    samples = [table.sample(15, random.Random(seed)).name for seed in range(DRAWS // 10)]
+    assert_close(samples, {"Low": 1, "Common": 3, "High": 2})
+
+
+def test_unknown_route_is_rejected():
+    with pytest.raises(ValueError):
+        EncounterTable('nowhere', make_catalog())
+
+
+def test_candidate_stats_are_the_stats_of_its_pokemon():
+    rng = random.Random(4)
+    pool = PokemonPool()
+    for route in ('default', 'volcano', 'lake', 'forest'):
+        for candidate in get_encounter_table(route).sample_many(100, 20, rng):
+            for pokemon in (candidate.to_pokemon(), candidate.to_pokemon(pool)):
+                assert (pokemon.name, pokemon.type_pokemon, pokemon.level) == (
+                    candidate.name, candidate.type_pokemon, candidate.level)
+                assert (pokemon.hp_max, pokemon.attack, pokemon.defense, pokemon.speed) == tuple(
+                    candidate.stats.values())
+                assert not pokemon.ko
+                pool.release(pokemon)
+    assert pool.reused > 0
@@ -0,0 +1,138 @@
+import contextlib
+import hashlib
+import io
+import random
+
+from fighting import simulation
+from fighting.events import ExperienceCalculator
+from fighting.fighting_system import FightingSystem
+from fighting.policies import AttackPolicy
+from fighting.renderers import ConsoleRenderer
+from fighting.replay import BattleRecorder, read_fights
+from my_package.models.pokemon import PokemonFactory
+from my_package.models.trainer import Champion, Trainer
+
+# Golden values of the fight played by seeded_fight(SEED)
+SEED = 3
+
+
+class QuietRenderer(ConsoleRenderer):
+    """Console renderer without the pauses"""
+
+    def wait_player(self, prompt):
+        pass
+
+    def pause(self, seconds=0.5):
+        pass
+
+
+class KOLog:
+    def __init__(self):
+        self.knockouts = []
+
+    def on_ko(self, fight, event):
+        self.knockouts.append((event.attacker, event.pokemon))
+
+
+def make_trainers():
+    player = Trainer("Sacha")
+    for pokemon in PokemonFactory.create_team([("Salamèche", "Fire", 12), ("Carapuce", "Water", 10),
+                                               ("Bulbizarre", "Plant", 11)]):
+        player.add_pokemon(pokemon)
+    champion = Champion("Ondine", "Water")
+    for pokemon in PokemonFactory.create_team([("Stari", "Water", 12), ("Psykokwak", "Water", 11)]):
+        champion.add_pokemon(pokemon)
+    return player, champion
+
+
+def seeded_fight(seed=SEED, **options):
+    player, champion = make_trainers()
+    fight = FightingSystem.headless(player, champion, rng=random.Random(seed), statistics=True, **options)
+    fight.start()
+    return fight
+
+
+def test_statistics_of_a_seeded_fight():
+    fight = seeded_fight()
+
+    assert fight.winner is fight.trainer1
+    assert fight.current_turn == 5
+    assert (fight.total_damage_trainer1, fight.total_damage_trainer2) == (244, 228)
+    assert fight.statistics.hits == [5, 3]
+    assert fight.statistics.misses == [0, 1]
+    assert fight.statistics.knockouts == [2, 2]
+
+
+def test_experience_of_a_seeded_fight():
+    player, champion = make_trainers()
+    fight = FightingSystem.headless(player, champion, rng=random.Random(SEED))
+    knockouts = KOLog()
+    fight.subscribe(knockouts)
+    fight.start()
+
+    assert {pokemon.name: xp for pokemon, xp in fight.experience_gained.items()} == {
+        "Bulbizarre": 120, "Carapuce": 110, "Stari": 220}
+    expected = {}
+    for attacker, defeated in knockouts.knockouts:
+        expected[attacker] = expected.get(attacker, 0) + ExperienceCalculator.experience_for(defeated)
+    assert fight.experience_gained == expected
+
+    # Only the team of trainer1 receives its experience
+    assert [(pokemon.level, pokemon.experience) for pokemon in player.team] == [(12, 0), (10, 110), (11, 120)]
+    assert [pokemon.experience for pokemon in champion.team] == [0, 0]
+
+
+def test_recorded_fights_replay_the_statistics(tmp_path):
+    path = str(tmp_path / "fights.log")
+    fights = []
+    with BattleRecorder(path) as recorder:
+        for seed in range(1, 6):
+            fights.append(seeded_fight(seed, recorder=recorder, apply_experience=False))
+
+    recorded = list(read_fights(path))
+    assert len(recorded) == len(fights)
+    for fight, replay in zip(fights, recorded):
+        state = replay.state_at()
+        assert state.finished and state.winner == 0
+        assert state.turn == replay.turns == fight.current_turn
+        assert state.trainers == ["Sacha", "Ondine"]
+        assert state.total_damage == [fight.total_damage_trainer1, fight.total_damage_trainer2]
+        for side, trainer in enumerate((fight.trainer1, fight.trainer2)):
+            assert [(pokemon['hp'], pokemon['ko']) for pokemon in state.teams[side]] == [
+                (pokemon.hp_actuals, pokemon.ko) for pokemon in trainer.team]
+
+        start = replay.state_at(0)
+        assert start.total_damage == [0, 0]
+        assert [[(pokemon['name'], pokemon['hp']) for pokemon in team] for team in start.teams] == [
+            [(pokemon.name, pokemon.hp_actuals) for pokemon in trainer.team] for trainer in make_trainers()]
+
+
+def test_console_fight_matches_the_headless_fight():
+    player, champion = make_trainers()
+    output = io.StringIO()
+    with contextlib.redirect_stdout(output):
+        fight = FightingSystem(player, champion, player_policy=AttackPolicy(), renderer=QuietRenderer(),
+                               rng=random.Random(SEED))
+        fight.start()
+    text = output.getvalue()
+
+    headless = seeded_fight()
+    assert fight.winner.name == headless.winner.name
+    assert (fight.total_damage_trainer1, fight.total_damage_trainer2) == (244, 228)
+    assert [(p.hp_actuals, p.experience) for p in player.team] == [
+        (p.hp_actuals, p.experience) for p in headless.trainer1.team]
+
+    assert "Stari attacks Salamèche!\n   It's super effective!\n→ 116 damage points inflicted" in text
+    assert " Ondine recall Stari and send Psykokwak !" in text
+    # Golden output of the whole fight
+    assert (len(text), hashlib.sha256(text.encode('utf-8')).hexdigest()[:16]) == (3509, "8e2dcaa3602cf5bd")
+
+
+def test_simulation_does_not_depend_on_the_processes():
+    player = [("Salamèche", "Fire", 12), ("Carapuce", "Water", 10)]
+    champion = make_trainers()[1]
+
+    reports = [simulation.simulate_fights(player, champion, 200, seed=9, processes=processes, chunk_size=50)
+               for processes in (1, 2)]
+    assert reports[0].to_dict() == reports[1].to_dict()
+    assert (reports[0].fights, reports[0].wins, reports[0].draws) == (200, 5, 0)
@@ -0,0 +1,72 @@
+from my_package.models.experience import MAX_LEVEL, growth_table
+from my_package.models.pokemon import PokemonFactory
+from my_package.models.trainer import Trainer
+from utils import snapshot_codec
+from utils.game_serializer import GameSerializer
+from utils.save_store import SaveStore
+
+
+def stats(pokemon):
+    return pokemon.hp_max, pokemon.attack, pokemon.defense, pokemon.speed
+
+
+def test_threshold_is_reached_at_the_exact_experience():
+    pokemon = PokemonFactory.create_species("Salamèche", 10)
+    missing = pokemon.experience_to_next_level()
+    table = growth_table(pokemon.name, pokemon.type_pokemon)
+    assert missing == table.experience_for(11) - table.experience_for(10)
+
+    assert pokemon.gain_experience(missing - 1) == 0
+    assert (pokemon.level, pokemon.experience, pokemon.experience_to_next_level()) == (10, missing - 1, 1)
+
+    assert pokemon.gain_experience(1) == 1
+    assert (pokemon.level, pokemon.experience) == (11, 0)
+
+
+def test_several_levels_at_once_read_the_growth_table():
+    pokemon = PokemonFactory.create_species("Carapuce", 10)
+    table = growth_table(pokemon.name, pokemon.type_pokemon)
+    pokemon.receive_damage(7)
+    hp_before = pokemon.hp_actuals
+
+    assert pokemon.gain_experience(table.experience_for(13) - table.experience_for(10) + 5) == 3
+    assert (pokemon.level, pokemon.experience) == (13, 5)
+    assert stats(pokemon) == table.stats[13]
+    assert stats(pokemon) == stats(PokemonFactory.create_species("Carapuce", 13))
+    # The HP won are added to the current HP, the damage stays
+    assert pokemon.hp_actuals == hp_before + table.stats[13][0] - table.stats[10][0]
+
+
+def test_knocked_out_pokemon_levels_up_without_hp():
+    pokemon = PokemonFactory.create_species("Bulbizarre", 8)
+    pokemon.receive_damage(pokemon.hp_max)
+    hp_max = pokemon.hp_max
+
+    assert pokemon.gain_experience(5000) > 0
+    assert pokemon.ko and pokemon.hp_actuals == 0
+    assert pokemon.hp_max > hp_max
+
+
+def test_level_stops_at_the_end_of_the_table():
+    pokemon = PokemonFactory.create_species("Goupix", 99)
+    assert pokemon.gain_experience(10 ** 8) == 1
+    assert pokemon.level == MAX_LEVEL
+
+
+def test_experience_is_saved():
+    player = Trainer("Sacha")
+    player.add_pokemon(PokemonFactory.create_species("Salamèche", 10))
+    player.add_pokemon(PokemonFactory.create_species("Stari", 7))
+    player.team[0].gain_experience(player.team[0].experience_to_next_level() + 40)
+    player.team[1].gain_experience(25)
+    expected = [(pokemon.level, pokemon.experience) + stats(pokemon) for pokemon in player.team]
+
+    save_data = GameSerializer.serialize(player, [], [])
+    decoded = snapshot_codec.decode(snapshot_codec.encode(save_data))
+    with SaveStore(":memory:") as store:
+        store.save_data_many([decoded])
+        stored = store.load_many(["Sacha"])["Sacha"]
+
+    restored, _ = GameSerializer.deserialize(stored, [])
+    assert [(pokemon.level, pokemon.experience) + stats(pokemon) for pokemon in restored.team] == expected
+    assert [pokemon.experience for pokemon in restored.team] == [40, 25]
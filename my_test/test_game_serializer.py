@@ -0,0 +1,90 @@
+import pytest
+
+from my_package.models.arena_data import load_arenas
+from my_package.models.pokemon import PokemonFactory
+from my_package.models.trainer import Trainer
+from utils.game_serializer import GameSerializer
+
+
+def without_timestamp(save_data):
+    return {key: value for key, value in save_data.items() if key != 'timestamp'}
+
+
+def make_game():
+    player = Trainer("Sacha")
+    for name, level in (("Salamèche", 14), ("Carapuce", 9), ("Bulbizarre", 11)):
+        player.add_pokemon(PokemonFactory.create_species(name, level))
+    player.team[0].gain_experience(35)
+    player.team[1].receive_damage(player.team[1].hp_max)
+    player.team[2].receive_damage(6)
+    player.active_pokemon = player.team[2]
+
+    arenas = load_arenas()
+    won, ongoing = arenas[0], arenas[1]
+    won.defeated = True
+    won.nb_attempts, won.nb_victories = 2, 1
+    for floor in won.floors:
+        floor.defeated = True
+    ongoing.nb_attempts = 1
+    ongoing.floors[0].defeated = True
+    return player, [won], arenas
+
+
+@pytest.mark.parametrize('trusted', [False, True])
+def test_round_trip(trusted):
+    player, defeated_arenas, arenas = make_game()
+    save_data = GameSerializer.serialize(player, defeated_arenas, arenas)
+    assert [arena['name'] for arena in save_data['arenas']] == [arena.name for arena in arenas[:2]]
+
+    fresh_arenas = load_arenas()
+    restored, restored_defeated = GameSerializer.deserialize(save_data, fresh_arenas, trusted=trusted)
+
+    assert restored.active_pokemon is restored.team[2]
+    assert [(p.name, p.level, p.experience, p.hp_actuals, p.hp_max, p.ko) for p in restored.team] == [
+        (p.name, p.level, p.experience, p.hp_actuals, p.hp_max, p.ko) for p in player.team]
+    assert restored.team[1].ko and restored.team[0].experience > 0
+    assert restored_defeated == [fresh_arenas[0]]
+    ongoing = fresh_arenas[1]
+    assert (ongoing.nb_attempts, ongoing.nb_victories) == (1, 0)
+    assert [floor.defeated for floor in ongoing.floors] == [True, False, False]
+    assert not fresh_arenas[2].is_loaded
+
+    again = GameSerializer.serialize(restored, restored_defeated, fresh_arenas)
+    assert without_timestamp(again) == without_timestamp(save_data)
+
+
+def test_upgrade_of_the_first_save_format():
+    # Save written before the versions: no version, active Pokemon, experience or arena progression
+    arena_name = load_arenas()[0].name
+    first_format = {
+        'player_name': "Sacha",
+        'badges_count': 1,
+        'defeated_arenas': [arena_name],
+        'team': [{'name': "Salamèche", 'type': "Fire", 'level': 12, 'hp_max': 80, 'hp_actuals': 0,
+                  'attack': 20, 'defense': 14, 'speed': 18, 'ko': True},
+                 {'name': "Carapuce", 'type': "Water", 'level': 10, 'hp_max': 70, 'hp_actuals': 52,
+                  'attack': 15, 'defense': 19, 'speed': 12, 'ko': False}],
+        'timestamp': "2025-06-01 10:00:00"
+    }
+
+    upgraded = GameSerializer.upgrade(first_format)
+    assert upgraded['version'] == GameSerializer.SCHEMA_VERSION
+    assert upgraded['active'] == 1
+    assert [pokemon['experience'] for pokemon in upgraded['team']] == [0, 0]
+    assert upgraded['arenas'] == [{'name': arena_name, 'defeated': True, 'nb_attempts': 1, 'nb_victories': 1,
+                                   'floors': [True, True, True]}]
+    assert 'version' not in first_format
+
+    arenas = load_arenas()
+    player, defeated_arenas = GameSerializer.deserialize(first_format, arenas, trusted=True)
+    assert player.active_pokemon is player.team[1]
+    assert defeated_arenas == [arenas[0]] and arenas[0].defeated
+    assert all(floor.defeated for floor in arenas[0].floors)
+
+
+def test_invalid_save_is_rejected():
+    player, defeated_arenas, arenas = make_game()
+    save_data = GameSerializer.serialize(player, defeated_arenas, arenas)
+    save_data['team'][0]['hp_actuals'] = save_data['team'][0]['hp_max'] + 1
+    with pytest.raises(ValueError):
+        GameSerializer.deserialize(save_data, load_arenas())
@@ -0,0 +1,77 @@
+import random
+
+from my_package.models.pokemon import PokemonFactory
+from my_package.models.trainer import Champion
+from my_package.models.type_chart import TYPE_CHART, TYPE_NAMES
+
+
+def make_champion(*names):
+    champion = Champion("Ondine", "Water")
+    for name in names or ("Carapuce", "Salamèche", "Bulbizarre"):
+        champion.add_pokemon(PokemonFactory.create_species(name, 10))
+    return champion
+
+
+def expected_slot(champion, adversary_type_id):
+    """Scores of Champion._find_best_pokemon computed on the whole team"""
+    best, best_score = None, -1
+    for slot, pokemon in enumerate(champion.team):
+        if pokemon.ko:
+            continue
+        score = (pokemon.hp_actuals / pokemon.hp_max) * 100
+        multiplier = TYPE_CHART[pokemon.type_id][adversary_type_id]
+        score += 200 if multiplier > 1.0 else -100 if multiplier < 1.0 else 0
+        if score > best_score:
+            best, best_score = slot, score
+    return best
+
+
+def best_slot(champion, adversary_type_id):
+    adversary = PokemonFactory.create_pokemon("Adversary", TYPE_NAMES[adversary_type_id], 5)
+    return champion._find_best_slot(adversary)
+
+
+def test_cached_answer_does_not_read_the_team():
+    champion = make_champion()
+    first = best_slot(champion, 0)
+
+    index = champion._matchups
+    searches = []
+    search = index._search
+    index._search = lambda adversary_type_id: searches.append(adversary_type_id) or search(adversary_type_id)
+
+    assert best_slot(champion, 0) == first
+    assert searches == []
+
+
+def test_answers_follow_hp_ko_and_hp_max_changes():
+    rng = random.Random(3)
+    champion = make_champion("Carapuce", "Salamèche", "Bulbizarre", "Stari", "Goupix")
+
+    for _ in range(2000):
+        pokemon = rng.choice(champion.team)
+        change = rng.random()
+        if change < 0.3:
+            pokemon.receive_damage(rng.randint(1, pokemon.hp_max))
+        elif change < 0.5:
+            pokemon.heal()
+        elif change < 0.8:
+            pokemon.hp_actuals = rng.randint(1, pokemon.hp_max)
+            pokemon.ko = False
+        else:
+            # Same HP, same KO state, only the HP ratio changes
+            pokemon.hp_max = max(pokemon.hp_actuals, 1) + rng.randint(0, 60)
+
+        adversary_type_id = rng.randrange(len(TYPE_NAMES))
+        assert best_slot(champion, adversary_type_id) == expected_slot(champion, adversary_type_id)
+
+
+def test_replaced_slot_rebuilds_the_tiers():
+    champion = make_champion("Carapuce", "Salamèche")
+    fire = TYPE_NAMES.index('Fire')
+    assert best_slot(champion, fire) == 0
+
+    # Same team size, other types in the slots
+    champion.team = [PokemonFactory.create_species("Salamèche", 10),
+                     PokemonFactory.create_species("Carapuce", 10)]
+    assert best_slot(champion, fire) == 1
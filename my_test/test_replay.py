@@ -0,0 +1,51 @@
+import os
+import random
+
+from fighting.fighting_system import FightingSystem
+from fighting.replay import HEADER, RECORD_SIZE, BattleRecorder, read_fights
+from my_package.models.pokemon import PokemonFactory
+from my_package.models.trainer import Champion, Trainer
+
+
+def record_fights(path, seeds):
+    with BattleRecorder(path) as recorder:
+        for seed in seeds:
+            player = Trainer("Sacha")
+            for pokemon in PokemonFactory.create_team([("Salamèche", "Fire", 12), ("Carapuce", "Water", 10)]):
+                player.add_pokemon(pokemon)
+            champion = Champion("Ondine", "Water")
+            for pokemon in PokemonFactory.create_team([("Stari", "Water", 11), ("Psykokwak", "Water", 10)]):
+                champion.add_pokemon(pokemon)
+            FightingSystem.headless(player, champion, rng=random.Random(seed), recorder=recorder).start()
+
+
+def test_stray_bytes_are_removed_before_appending(tmp_path):
+    path = str(tmp_path / "fights.log")
+    record_fights(path, [1])
+    with open(path, 'ab') as f:
+        f.write(b'\x07' * 10)
+
+    record_fights(path, [2, 3])
+
+    fights = list(read_fights(path))
+    assert len(fights) == 3
+    assert all(fight.state_at().finished for fight in fights)
+    assert (os.path.getsize(path) - HEADER.size) % RECORD_SIZE == 0
+
+
+def test_fight_cut_by_a_crash_is_removed(tmp_path):
+    path = str(tmp_path / "fights.log")
+    record_fights(path, [1])
+    size = os.path.getsize(path)
+    record_fights(path, [2])
+    # Only the start of the second fight reached the disk
+    with open(path, 'rb+') as f:
+        f.truncate(size + 3 * RECORD_SIZE + 5)
+
+    record_fights(path, [3])
+
+    expected = str(tmp_path / "expected.log")
+    record_fights(expected, [1, 3])
+    with open(path, 'rb') as f, open(expected, 'rb') as g:
+        assert f.read() == g.read()
+    assert len(list(read_fights(path))) == 2
@@ -0,0 +1,39 @@
+from utils.save_store import SaveStore
+
+
+def make_save(name, level=5):
+    return {
+        'version': 2,
+        'player_name': name,
+        'badges_count': 0,
+        'defeated_arenas': [],
+        'team': [{'name': "Salamèche", 'type': "Fire", 'level': level, 'experience': 0, 'hp_max': 45,
+                  'hp_actuals': 45, 'attack': 12, 'defense': 9, 'speed': 11, 'ko': False}],
+        'active': 0,
+        'arenas': [],
+        'timestamp': "2026-01-01T00:00:00"
+    }
+
+
+def test_load_many_returns_the_wanted_players():
+    with SaveStore(":memory:") as store:
+        store.save_data_many([make_save("Sacha"), make_save("Ondine", 12), make_save("Pierre")])
+
+        saves = store.load_many(["Ondine", "Sacha", "Ondine", "Régis"])
+        assert sorted(saves) == ["Ondine", "Sacha"]
+        assert saves["Ondine"]['team'][0]['level'] == 12
+        assert saves["Sacha"]['team'][0]['ko'] is False
+        assert sorted(store.load_many()) == ["Ondine", "Pierre", "Sacha"]
+
+
+def test_load_many_sees_the_saves_of_another_connection(tmp_path):
+    path = str(tmp_path / "saves.db")
+    with SaveStore(path) as reader, SaveStore(path) as writer:
+        writer.save_data_many([make_save("Sacha")])
+        assert reader.load_many(["Sacha", "Ondine"]).keys() == {"Sacha"}
+        assert not reader._connection.in_transaction
+
+        writer.save_data_many([make_save("Ondine"), make_save("Sacha", 6)])
+        saves = reader.load_many(["Sacha", "Ondine"])
+        assert saves.keys() == {"Sacha", "Ondine"}
+        assert saves["Sacha"]['team'][0]['level'] == 6
@@ -0,0 +1,141 @@
+import os
+
+import pytest
+
+import main
+from my_package.models.pokemon import PokemonFactory
+from my_package.models.trainer import Trainer
+from utils import save_system
+from utils.save_system import SaveSystem
+
+
+@pytest.fixture
+def save_dir(tmp_path, monkeypatch):
+    monkeypatch.setattr(SaveSystem, 'SAVE_DIR', str(tmp_path))
+    monkeypatch.setattr(SaveSystem, 'SAVE_FILE', str(tmp_path / "game_save.json"))
+    monkeypatch.setattr(SaveSystem, 'JOURNAL_FILE', str(tmp_path / "game_save.journal"))
+    monkeypatch.setattr(SaveSystem, '_last_saved', None)
+    monkeypatch.setattr(SaveSystem, '_journal_entries', 0)
+    monkeypatch.setattr(SaveSystem, '_snapshot_id', None)
+    return tmp_path
+
+
+def restart():
+    """Forget the state kept in memory, like a new process"""
+    SaveSystem._last_saved = None
+    SaveSystem._journal_entries = 0
+    SaveSystem._snapshot_id = None
+
+
+def test_journal_is_replayed_on_the_snapshot(save_dir, capsys):
+    player = Trainer("Sacha")
+    player.add_pokemon(PokemonFactory.create_species("Salamèche", 5))
+    assert SaveSystem.save_game(player, [])
+
+    player.add_pokemon(PokemonFactory.create_species("Carapuce", 3))
+    player.team[0].receive_damage(4)
+    assert SaveSystem.autosave(player, [])
+    restart()
+
+    save_data = SaveSystem._read_save()
+    assert [pokemon['name'] for pokemon in save_data['team']] == ["Salamèche", "Carapuce"]
+    assert save_data['team'][0]['hp_actuals'] == player.team[0].hp_actuals
+    assert 'snapshot_id' not in save_data
+
+
+def test_crash_before_journal_removal_does_not_replay_old_entries(save_dir, monkeypatch, capsys):
+    player = Trainer("Sacha")
+    player.add_pokemon(PokemonFactory.create_species("Salamèche", 5))
+    assert SaveSystem.save_game(player, [])
+
+    # Two catches in the journal of the first snapshot
+    for name in ("Carapuce", "Bulbizarre"):
+        player.add_pokemon(PokemonFactory.create_species(name, 3))
+        assert SaveSystem.autosave(player, [])
+
+    # The new snapshot is renamed in place, then the process dies
+    def crash(path):
+        raise KeyboardInterrupt("crash")
+
+    with monkeypatch.context() as patch, pytest.raises(KeyboardInterrupt):
+        patch.setattr(save_system.os, 'remove', crash)
+        SaveSystem._write_snapshot(SaveSystem._build_save_data(player, []))
+    assert os.path.exists(SaveSystem.JOURNAL_FILE)
+    restart()
+
+    save_data = SaveSystem._read_save()
+    assert [pokemon['name'] for pokemon in save_data['team']] == ["Salamèche", "Carapuce", "Bulbizarre"]
+    # The stale entries are removed, new ones are appended to an empty journal
+    assert os.path.getsize(SaveSystem.JOURNAL_FILE) == 0
+
+    player.team[1].receive_damage(2)
+    assert SaveSystem.autosave(player, [])
+    restart()
+    save_data = SaveSystem._read_save()
+    assert len(save_data['team']) == 3
+    assert save_data['team'][1]['hp_actuals'] == player.team[1].hp_actuals
+
+
+def make_player(name, *levels):
+    player = Trainer(name)
+    for level in levels:
+        player.add_pokemon(PokemonFactory.create_species("Salamèche", level))
+    return player
+
+
+def test_save_of_another_player_is_not_diffed(save_dir, capsys):
+    assert SaveSystem.save_game(make_player("Alice", 30, 30, 30), [])
+    restart()
+
+    assert SaveSystem.autosave(make_player("Bob", 5), [])
+    assert not os.path.exists(SaveSystem.JOURNAL_FILE)
+    restart()
+    save_data = SaveSystem._read_save()
+    assert save_data['player_name'] == "Bob"
+    assert [pokemon['level'] for pokemon in save_data['team']] == [5]
+
+
+def test_unreadable_save_is_reported(save_dir):
+    with open(SaveSystem.SAVE_FILE, 'w') as f:
+        f.write("{not json")
+    assert not SaveSystem.autosave(make_player("Bob", 5), [])
+
+
+def new_game(name, monkeypatch, answers):
+    monkeypatch.setattr(main, 'clear_screen', lambda: None)
+    replies = iter(answers)
+    monkeypatch.setattr('builtins.input', lambda prompt="": next(replies))
+    game = main.Game()
+    game.player = make_player(name, 5)
+    game.create_arenas()
+    return game
+
+
+def test_new_game_does_not_autosave_over_the_saved_game(save_dir, monkeypatch, capsys):
+    assert SaveSystem.save_game(make_player("Alice", 30, 30, 30, 30, 30, 30), [])
+    restart()
+
+    game = new_game("Bob", monkeypatch, ['n', 'n'])
+    game.owns_save = game.confirm_new_save()
+    game.player.team[0].receive_damage(3)
+    game.autosave()
+    game.quit_game()
+    assert "Progress not saved." in capsys.readouterr().out
+
+    restart()
+    save_data = SaveSystem._read_save()
+    assert save_data['player_name'] == "Alice"
+    assert len(save_data['team']) == 6
+
+
+def test_confirmed_new_game_replaces_the_saved_game(save_dir, monkeypatch, capsys):
+    assert SaveSystem.save_game(make_player("Alice", 30, 30, 30), [])
+    restart()
+
+    game = new_game("Bob", monkeypatch, ['y'])
+    game.owns_save = game.confirm_new_save()
+    game.autosave()
+
+    restart()
+    save_data = SaveSystem._read_save()
+    assert (save_data['player_name'], len(save_data['team'])) == ("Bob", 1)
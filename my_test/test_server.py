@@ -0,0 +1,158 @@
+import asyncio
+
+from fighting.client import BattleClient
+from fighting.server import BattleServer
+from utils.save_store import SaveStore
+
+
+def run(test, **server_options):
+    """Run test(server, client_factory) against a server listening on a free port"""
+    async def main():
+        server = await BattleServer(SaveStore(":memory:"), seed=1, **server_options).start(port=0)
+        host, port = server.address[:2]
+        try:
+            await asyncio.wait_for(test(server, lambda: BattleClient.connect(host, port)), 60)
+        finally:
+            await server.close()
+            server.store.close()
+
+    asyncio.run(main())
+
+
+async def prompt_of(client, kind, lines=None):
+    """Play the fights (attack, first Pokemon able to fight) until the server asks a prompt of this kind"""
+    while True:
+        prompt = await client.next_prompt()
+        if lines is not None:
+            lines.extend(client.messages)
+        assert prompt is not None, client.messages
+        if prompt.startswith(kind):
+            return prompt
+        if prompt.startswith('action'):
+            await client.answer('attack')
+        elif prompt.startswith('replacement'):
+            await client.answer('')
+        else:
+            raise AssertionError(f"unexpected prompt {prompt!r}")
+
+
+async def login(client, name):
+    await prompt_of(client, 'name')
+    await client.answer(name)
+
+
+def test_new_game_fight_errors_and_quit():
+    async def test(server, connect):
+        client = await connect()
+        await login(client, "Sacha")
+        await prompt_of(client, 'starter')
+        await client.answer('2')
+        lines = []
+        await prompt_of(client, 'menu', lines)
+        assert "MSG You have chosen Carapuce !" in lines
+        assert server.sessions.keys() == {"Sacha"}
+
+        await client.answer('dance')
+        await prompt_of(client, 'menu')
+        assert client.messages[0] == "ERR unknown command 'dance'"
+        await client.answer('challenge 9')
+        await prompt_of(client, 'menu')
+        assert client.messages[0] == "ERR expected: challenge <1-3>"
+
+        await client.answer('train')
+        await prompt_of(client, 'action')
+        await client.answer('change x')
+        await prompt_of(client, 'action')
+        assert "ERR expected: attack, change <n> or flee" in client.messages
+        await client.answer('attack')
+        await prompt_of(client, 'menu')
+
+        await client.answer('quit')
+        assert await client.next_prompt() is None
+        assert client.messages[-1] == "BYE See you soon !"
+        await client.close()
+
+        assert [row[0] for row in server.store.list_saves()] == ["Sacha"]
+        assert len(server.store.load_many(["Sacha"])["Sacha"]['team']) == 6
+
+        # The saved game is resumed
+        client = await connect()
+        await login(client, "Sacha")
+        lines = []
+        await prompt_of(client, 'menu', lines)
+        assert "MSG Welcome back, Sacha !" in lines
+        await client.close()
+
+    run(test)
+
+
+def test_name_already_playing_and_disconnect_saves():
+    async def test(server, connect):
+        first = await connect()
+        await login(first, "Sacha")
+        await prompt_of(first, 'starter')
+        await first.answer('1')
+        await prompt_of(first, 'menu')
+
+        second = await connect()
+        await login(second, "Sacha")
+        await prompt_of(second, 'name')
+        assert second.messages == ["ERR Sacha is already playing"]
+        await second.close()
+
+        # The player leaves in the middle of a fight: the session saves the game
+        assert server.store.delete_save("Sacha")
+        await first.answer('train')
+        await prompt_of(first, 'action')
+        await first.close()
+        for _ in range(100):
+            if not server.sessions:
+                break
+            await asyncio.sleep(0.01)
+        assert server.sessions == {}
+        assert [row[0] for row in server.store.list_saves()] == ["Sacha"]
+
+    run(test)
+
+
+def test_idle_session_is_closed():
+    async def test(server, connect):
+        client = await connect()
+        await prompt_of(client, 'name')
+        assert await client.next_prompt() is None
+        assert client.messages == ["BYE idle for too long"]
+        await client.close()
+
+    run(test, idle_timeout=0.2)
+
+
+def test_disconnect_during_login_starts_a_new_game_next_time():
+    async def test(server, connect):
+        client = await connect()
+        await login(client, "Sacha")
+        await prompt_of(client, 'starter')
+        await client.close()
+        for _ in range(100):
+            if not server.sessions:
+                break
+            await asyncio.sleep(0.01)
+        assert server.store.list_saves() == []
+
+        # A save without Pokemon left by an older server is replaced by a new game
+        server.store.save_data_many([{'version': 2, 'player_name': "Ondine", 'badges_count': 0,
+                                      'defeated_arenas': [], 'team': [], 'active': None, 'arenas': [],
+                                      'timestamp': "2026-01-01T00:00:00"}])
+        for name in ("Sacha", "Ondine"):
+            client = await connect()
+            await login(client, name)
+            await prompt_of(client, 'starter')
+            await client.answer('3')
+            await prompt_of(client, 'menu')
+            await client.answer('train')
+            await prompt_of(client, 'menu')
+            await client.answer('quit')
+            assert await client.next_prompt() is None
+            await client.close()
+            assert len(server.store.load_many([name])[name]['team']) == 6
+
+    run(test)
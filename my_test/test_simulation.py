@@ -0,0 +1,39 @@
+import pickle
+
+from fighting import simulation
+from my_package.models.arena_data import build_trainer
+from my_package.models.battle_ai import ExpectimaxAI
+
+
+DEFINITION = {'name': "Ondine", 'type': "Water", 'ai': {'max_depth': 2, 'time_budget': 30.0},
+              'team': [{'species': "Carapuce", 'level': 12}, {'species': "Stari", 'level': 12}]}
+
+
+def test_opponent_spec_keeps_the_ai_of_the_champion():
+    spec = pickle.loads(pickle.dumps(simulation.opponent_spec(build_trainer(DEFINITION, "Water"))))
+    name, type_affinity, list_pokemon, ai_config = spec
+    assert ai_config == {'max_depth': 2, 'time_budget': 30.0, 'max_table_size': 200000}
+
+    champion = simulation._build_trainer(name, list_pokemon, type_affinity, ai_config)
+    assert isinstance(champion.ai, ExpectimaxAI)
+    assert champion.ai.config() == ai_config
+
+    simple = dict(DEFINITION)
+    del simple['ai']
+    assert simulation.opponent_spec(build_trainer(simple, "Water"))[3] is None
+    assert simulation._build_trainer(name, list_pokemon, type_affinity).ai is None
+
+
+def test_simulated_champion_plays_with_its_ai(monkeypatch):
+    decisions = []
+    choose_action = ExpectimaxAI.choose_action
+
+    def counted(self, champion, adversary_pokemon):
+        decisions.append(self.max_depth)
+        return choose_action(self, champion, adversary_pokemon)
+
+    monkeypatch.setattr(ExpectimaxAI, 'choose_action', counted)
+    report = simulation.simulate_fights([("Salamèche", "Fire", 14)], build_trainer(DEFINITION, "Water"), 5,
+                                        seed=3, processes=1)
+    assert report.fights == 5
+    assert decisions and set(decisions) == {2}
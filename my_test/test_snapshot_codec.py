@@ -0,0 +1,49 @@
+import io
+
+import pytest
+
+from utils import snapshot_codec
+
+
+SAVE = {
+    'version': 2,
+    'player_name': "Sacha",
+    'badges_count': 1,
+    'defeated_arenas': ["Arène Argenta"],
+    'team': [{'name': "Salamèche", 'type': "Fire", 'level': 12, 'experience': 340, 'hp_max': 80,
+              'hp_actuals': 31, 'attack': 20, 'defense': 14, 'speed': 18, 'ko': False},
+             {'name': "Carapuce", 'type': "Water", 'level': 9, 'experience': 120, 'hp_max': 65,
+              'hp_actuals': 0, 'attack': 15, 'defense': 19, 'speed': 12, 'ko': True}],
+    'active': 0,
+    'arenas': [{'name': "Arène Argenta", 'defeated': True, 'nb_attempts': 2, 'nb_victories': 1,
+                'floors': [True, True, False]}],
+    'timestamp': "2026-01-01T12:00:00"
+}
+
+
+@pytest.mark.parametrize('compression', [None, 'zlib', 'lzma'])
+def test_round_trip(compression):
+    assert snapshot_codec.decode(snapshot_codec.encode(SAVE, compression)) == SAVE
+
+
+@pytest.mark.parametrize('compression', [None, 'zlib', 'lzma'])
+def test_damaged_snapshots_raise_value_error(compression):
+    data = snapshot_codec.encode(SAVE, compression)
+
+    for size in range(len(data)):
+        with pytest.raises(ValueError):
+            snapshot_codec.decode(data[:size])
+
+    for position in range(len(data)):
+        damaged = bytearray(data)
+        damaged[position] ^= 0xFF
+        try:
+            snapshot_codec.decode(bytes(damaged))
+        except ValueError:
+            pass
+
+
+def test_cut_header_raises_value_error():
+    data = snapshot_codec.encode(SAVE)
+    with pytest.raises(ValueError):
+        snapshot_codec.read_header(io.BytesIO(data[:snapshot_codec.PREFIX.size + 3]))
@@ -0,0 +1,85 @@
+import random
+
+from my_package.models.pokemon import PokemonFactory
+from my_package.models.team_state import HP, HP_MAX, LEVEL
+from my_package.models.trainer import Trainer
+
+
+def make_trainer(*levels):
+    trainer = Trainer("Ash")
+    for level in levels:
+        trainer.add_pokemon(PokemonFactory.create_species("Salamèche", level))
+    return trainer
+
+
+def test_ko_mask_follows_damage_and_heal():
+    trainer = make_trainer(10, 10, 10)
+    first, second, third = trainer.team
+
+    first.receive_damage(first.hp_max)
+    assert trainer.state.ko_mask == 0b001
+    assert trainer.count_available_pokemon() == 2
+    assert trainer.choose_available_pokemon() and trainer.active_pokemon is second
+
+    second.hp_actuals = 0
+    second.ko = True
+    third.receive_damage(third.hp_max + 5)
+    assert trainer.state.ko_mask == 0b111
+    assert trainer.team_ko()
+    assert not trainer.choose_available_pokemon()
+
+    second.heal()
+    assert trainer.state.ko_mask == 0b101
+    assert not trainer.team_ko()
+    assert trainer.state.get(HP, 1) == second.hp_max
+
+
+def test_attacks_update_the_state_of_the_target_team():
+    player = make_trainer(30)
+    adversary = make_trainer(5, 5)
+    rng = random.Random(1)
+    attacker, target = player.team[0], adversary.team[0]
+
+    while not target.ko:
+        version = adversary.state.version
+        result = attacker.attack_pokemon(target, rng)
+        if result.success:
+            assert adversary.state.version > version
+        assert adversary.state.get(HP, 0) == target.hp_actuals
+
+    assert adversary.state.is_ko(0) and not adversary.state.is_ko(1)
+    assert adversary.count_available_pokemon() == 1
+
+
+def test_assigned_team_is_attached_and_old_one_detached():
+    trainer = make_trainer(10, 10)
+    old_team = trainer.team
+
+    trainer.team = [PokemonFactory.create_species("Carapuce", 12)]
+    assert len(trainer.state) == 1
+
+    # The Pokemon of the old team do not write into the state any more
+    old_team[0].receive_damage(old_team[0].hp_max)
+    assert trainer.state.ko_mask == 0
+    assert not trainer.team_ko()
+
+
+def test_team_changed_in_place_is_resynced():
+    trainer = make_trainer(10)
+    extra = PokemonFactory.create_species("Bulbizarre", 10)
+    extra.receive_damage(extra.hp_max)
+    trainer.team.append(extra)
+
+    assert trainer.count_available_pokemon() == 1
+    trainer.team[0].receive_damage(trainer.team[0].hp_max)
+    assert trainer.team_ko()
+
+
+def test_level_up_updates_the_stats_of_the_slot():
+    trainer = make_trainer(5)
+    pokemon = trainer.team[0]
+
+    assert pokemon.gain_experience(100000) > 0
+    assert trainer.state.get(LEVEL, 0) == pokemon.level
+    assert trainer.state.get(HP_MAX, 0) == pokemon.hp_max
+    assert trainer.state.get(HP, 0) == pokemon.hp_actuals
@@ -0,0 +1,120 @@
+import random
+from collections import Counter
+
+import pytest
+
+from fighting.tournament import EloRatings, Match, Tournament, bracket_order, round_robin_rounds
+from my_package.models.pokemon import PokemonGenerator
+from my_package.models.trainer import Trainer
+
+
+def make_tournament(n_teams, processes=1, seed=5):
+    tournament = Tournament(seed=seed, processes=processes)
+    rng = random.Random(n_teams)
+    for number in range(n_teams):
+        trainer = Trainer(f"Team{number + 1}")
+        for candidate in PokemonGenerator.generate_many(3, 15, rng):
+            trainer.add_pokemon(candidate.to_pokemon())
+        tournament.register(trainer)
+    return tournament
+
+
+def without_elapsed(result):
+    data = result.to_dict()
+    del data['elapsed']
+    return data
+
+
+@pytest.mark.parametrize('n_teams', range(2, 10))
+def test_round_robin_pairs_every_team_once(n_teams):
+    rounds = round_robin_rounds(n_teams)
+    assert len(rounds) == (n_teams if n_teams % 2 else n_teams - 1)
+
+    pairs = Counter()
+    for pairing in rounds:
+        teams = [team for pair in pairing for team in pair]
+        assert len(teams) == len(set(teams))
+        pairs.update(frozenset(pair) for pair in pairing)
+    assert len(pairs) == n_teams * (n_teams - 1) // 2
+    assert set(pairs.values()) == {1}
+
+
+def test_bracket_order_keeps_the_best_seeds_apart():
+    assert bracket_order(8) == [0, 7, 3, 4, 1, 6, 2, 5]
+    order = bracket_order(16)
+    assert sorted(order) == list(range(16))
+    assert all(order[i] + order[i + 1] == 15 for i in range(0, 16, 2))
+    # Seeds 0 and 1 are in different halves
+    assert (order.index(0) < 8) != (order.index(1) < 8)
+
+
+def test_elo_update_against_known_values():
+    ratings = EloRatings()
+    ratings.record("A", "B", 1.0)
+    assert (ratings.rating("A"), ratings.rating("B")) == (1516.0, 1484.0)
+
+    ratings = EloRatings()
+    ratings.ratings.update({"A": 1600.0, "B": 1400.0})
+    assert ratings.expected("A", "B") == pytest.approx(0.759747, abs=1e-6)
+    ratings.record("A", "B", 0.5)
+    assert ratings.rating("A") == pytest.approx(1591.688, abs=1e-3)
+    assert ratings.rating("B") == pytest.approx(1408.312, abs=1e-3)
+    assert ratings.matches == {"A": 1, "B": 1}
+    assert EloRatings.from_dict(ratings.to_dict()).ratings == ratings.ratings
+
+
+def test_bye_and_tie_break():
+    bye = Match(0, "W1", ('team', 3), ('team', None))
+    assert not bye.prepare()
+    assert (bye.winner, bye.loser, bye.played) == (3, None, False)
+
+    match = Match(1, "W1", ('team', 0), ('team', 1))
+    assert match.prepare()
+    match.record(1, 1, 0, tie_break=True)
+    assert (match.winner, match.loser) == (0, 1)
+
+    match = Match(2, "R1", ('team', 0), ('team', 1))
+    match.prepare()
+    match.record(1, 1, 1)
+    assert (match.winner, match.loser, match.score) == (None, None, 0.5)
+
+
+@pytest.mark.parametrize('unbeaten_wins', [True, False])
+def test_grand_final_reset_only_after_a_loss_of_the_unbeaten_team(unbeaten_wins):
+    grand_final = Match(0, "GF", ('team', 0), ('team', 1))
+    grand_final.prepare()
+    grand_final.record(*((1, 0) if unbeaten_wins else (0, 1)), 0)
+
+    reset = Match(1, "GF2", ('winner', grand_final), ('loser', grand_final), reset=True)
+    assert reset.prepare() is not unbeaten_wins
+    if unbeaten_wins:
+        assert (reset.winner, reset.loser, reset.played) == (0, 1, False)
+    else:
+        assert reset.teams == [1, 0]
+
+
+def test_double_elimination_needs_two_losses():
+    result = make_tournament(13).double_elimination()
+
+    losses = Counter(match.loser for match in result.played)
+    champion = result.names.index(result.champion)
+    assert losses[champion] <= 1
+    assert all(losses[team] == 2 for team in range(13) if team != champion)
+
+
+def test_single_elimination_and_round_robin():
+    result = make_tournament(13).single_elimination()
+    assert len(result.played) == 12
+    losses = Counter(match.loser for match in result.played)
+    assert sorted(losses.values()) == [1] * 12 and result.names.index(result.champion) not in losses
+
+    result = make_tournament(6).round_robin()
+    assert len(result.played) == 15
+    assert all(row['played'] == 5 for row in result.table())
+
+
+def test_results_do_not_depend_on_the_processes():
+    tournaments = [make_tournament(13, processes) for processes in (1, 3)]
+    results = [tournament.double_elimination() for tournament in tournaments]
+    assert without_elapsed(results[0]) == without_elapsed(results[1])
+    assert tournaments[0].ratings.ratings == tournaments[1].ratings.ratings
@@ -0,0 +1,51 @@
+import random
+
+from fighting.training import auto_train
+from my_package.models.experience import growth_table
+from my_package.models.pokemon import PokemonFactory
+from my_package.models.pokemon_pool import PokemonPool
+from my_package.models.trainer import Trainer
+
+
+def make_player():
+    player = Trainer("Sacha")
+    for name, level in (("Salamèche", 6), ("Carapuce", 5)):
+        player.add_pokemon(PokemonFactory.create_species(name, level))
+    return player
+
+
+def total_experience(pokemon):
+    return growth_table(pokemon.name, pokemon.type_pokemon).experience_for(pokemon.level) + pokemon.experience
+
+
+def test_seeded_training_levels_the_team():
+    player = make_player()
+    before = [total_experience(pokemon) for pokemon in player.team]
+    pool = PokemonPool()
+
+    report = auto_train(player, 40, random.Random(1), pool=pool)
+
+    assert (report.fights, report.wins, report.losses, report.draws) == (40, 40, 0, 0)
+    assert dict(report.experience) == {0: 520, 1: 2620}
+    assert dict(report.levels) == {0: 4, 1: 11}
+    assert sum(report.opponents.values()) == 40
+
+    # The experience of the report is the one kept by the team
+    assert [total_experience(pokemon) - start for pokemon, start in zip(player.team, before)] == [520, 2620]
+    assert [(pokemon.level, pokemon.experience) for pokemon in player.team] == [(10, 139), (16, 220)]
+    assert all(pokemon.hp_actuals == pokemon.hp_max and not pokemon.ko for pokemon in player.team)
+    assert pool.reused > 0
+
+
+def test_training_without_heal_stops_when_the_team_is_ko():
+    player = make_player()
+    report = auto_train(player, 40, random.Random(1), heal=False)
+
+    assert (report.fights, report.wins, report.losses, report.draws) == (5, 4, 1, 0)
+    assert player.team_ko()
+    assert [(pokemon.level, pokemon.hp_actuals) for pokemon in player.team] == [(7, 0), (6, 0)]
+
+
+def test_fights_over_max_turns_are_draws():
+    report = auto_train(make_player(), 5, random.Random(1), max_turns=1)
+    assert (report.fights, report.wins, report.losses, report.draws) == (5, 0, 0, 5)
@@ -0,0 +1,227 @@
+"""
+utils/game_serializer.py
+Conversion of the game state (player, team, arenas) to save data and back
+"""
+
+from datetime import datetime
+
+from my_package.models.pokemon import PokemonFactory
+from my_package.models.trainer import Trainer
+
+
+class GameSerializer:
+    """
+    Versioned serializer of the game state
+
+    The save data keeps the keys of the first save format (player_name,
+    badges_count, defeated_arenas, team, timestamp) and adds the version of
+    the schema, the active Pokemon, the experience of every Pokemon and the
+    progression in every arena (attempts, victories, floors defeated).
+    Saves of older formats are upgraded when they are loaded.
+    """
+
+    SCHEMA_VERSION = 2
+
+    POKEMON_FIELDS = ('name', 'type', 'level', 'experience', 'hp_max', 'hp_actuals', 'attack', 'defense',
+                      'speed', 'ko')
+    INT_FIELDS = ('level', 'experience', 'hp_max', 'hp_actuals', 'attack', 'defense', 'speed')
+    MAX_TEAM_SIZE = 6
+
+    @staticmethod
+    def serialize_pokemon(pokemon):
+        """Data saved for a Pokemon"""
+        return {
+            'name': pokemon.name,
+            'type': pokemon.type_pokemon,
+            'level': pokemon.level,
+            'experience': pokemon.experience,
+            'hp_max': pokemon.hp_max,
+            'hp_actuals': pokemon.hp_actuals,
+            'attack': pokemon.attack,
+            'defense': pokemon.defense,
+            'speed': pokemon.speed,
+            'ko': pokemon.ko
+        }
+
+    @staticmethod
+    def serialize_arena(arena):
+        """Progression of the player in an arena"""
+        return {
+            'name': arena.name,
+            'defeated': arena.defeated,
+            'nb_attempts': arena.nb_attempts,
+            'nb_victories': arena.nb_victories,
+            'floors': [floor.defeated for floor in arena.floors]
+        }
+
+    @staticmethod
+    def serialize(player, defeated_arenas, arenas=None):
+        """
+        Build the save data of a game
+
+        Args:
+            player (Trainer): The player trainer
+            defeated_arenas (list): List of defeated arenas
+            arenas (list): All the arenas of the game (default: the defeated ones only)
+
+        Returns:
+            dict: Save data
+        """
+        team = player.team
+        active = team.index(player.active_pokemon) if player.active_pokemon in team else None
+
+        return {
+            'version': GameSerializer.SCHEMA_VERSION,
+            'player_name': player.name,
+            'badges_count': len(defeated_arenas),
+            'defeated_arenas': [arena.name for arena in defeated_arenas],
+            'team': [GameSerializer.serialize_pokemon(pokemon) for pokemon in team],
+            'active': active,
+            # Arenas never challenged are not built and have no progression to save
+            'arenas': [GameSerializer.serialize_arena(arena) for arena in (arenas or defeated_arenas)
+                       if arena.is_loaded],
+            'timestamp': datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        }
+
+    @staticmethod
+    def upgrade(save_data):
+        """
+        Convert save data of an older schema to the current one
+
+        Args:
+            save_data (dict): Save data of any version
+
+        Returns:
+            dict: Save data of SCHEMA_VERSION (the same dict if already current)
+
+        Raises:
+            ValueError: If the version is unknown
+        """
+        version = save_data.get('version', 1)
+        if version == GameSerializer.SCHEMA_VERSION:
+            return save_data
+
+        if version != 1:
+            raise ValueError(f"Unsupported save version {version}")
+
+        # Version 1: only the names of the defeated arenas were saved, and no experience
+        # (every Pokemon starts its level again)
+        upgraded = dict(save_data)
+        upgraded['active'] = next((slot for slot, pokemon in enumerate(save_data.get('team', []))
+                                   if not pokemon.get('ko')), None)
+        upgraded['arenas'] = [{'name': name, 'defeated': True, 'nb_attempts': 1, 'nb_victories': 1,
+                               'floors': [True, True, True]}
+                              for name in save_data.get('defeated_arenas', [])]
+        upgraded['team'] = [dict(pokemon, experience=0) for pokemon in save_data.get('team', [])]
+        upgraded['version'] = GameSerializer.SCHEMA_VERSION
+        return upgraded
+
+    @staticmethod
+    def validate(save_data):
+        """
+        Check the content of save data of the current schema
+
+        Args:
+            save_data (dict): Save data
+
+        Raises:
+            ValueError: If the save data is not valid
+        """
+        if not isinstance(save_data, dict):
+            raise ValueError("Save data must be a dict")
+
+        for key in ('player_name', 'defeated_arenas', 'team', 'arenas'):
+            if key not in save_data:
+                raise ValueError(f"Save data without '{key}'")
+
+        if not isinstance(save_data['player_name'], str) or not save_data['player_name']:
+            raise ValueError("Invalid player name")
+
+        team = save_data['team']
+        if not isinstance(team, list) or len(team) > GameSerializer.MAX_TEAM_SIZE:
+            raise ValueError(f"The team must be a list of at most {GameSerializer.MAX_TEAM_SIZE} Pokemon")
+
+        for slot, pokemon in enumerate(team):
+            missing = [field for field in GameSerializer.POKEMON_FIELDS if field not in pokemon]
+            if missing:
+                raise ValueError(f"Pokemon #{slot + 1} without {', '.join(missing)}")
+            if pokemon['type'] not in PokemonFactory.POKEMON_TYPES:
+                raise ValueError(f"Pokemon #{slot + 1}: type '{pokemon['type']}' unknown")
+            for field in GameSerializer.INT_FIELDS:
+                if not isinstance(pokemon[field], int) or pokemon[field] < 0:
+                    raise ValueError(f"Pokemon #{slot + 1}: invalid {field} {pokemon[field]!r}")
+            if pokemon['hp_actuals'] > pokemon['hp_max']:
+                raise ValueError(f"Pokemon #{slot + 1}: more HP than its maximum")
+
+        active = save_data.get('active')
+        if active is not None and not (isinstance(active, int) and 0 <= active < len(team)):
+            raise ValueError(f"Invalid active Pokemon {active!r}")
+
+        for arena in save_data['arenas']:
+            if not isinstance(arena.get('name'), str) or not isinstance(arena.get('floors'), list):
+                raise ValueError(f"Invalid arena {arena!r}")
+
+    @staticmethod
+    def deserialize_pokemon(data):
+        """
+        Rebuild a Pokemon from its data
+
+        Args:
+            data (dict): Data of the Pokemon (see serialize_pokemon)
+
+        Returns:
+            Pokemon: Pokemon with the saved stats and HP
+        """
+        pokemon = PokemonFactory.create_pokemon(data['name'], data['type'], data['level'])
+        pokemon.experience = data['experience']
+        pokemon.hp_max = data['hp_max']
+        pokemon.hp_actuals = data['hp_actuals']
+        pokemon.attack = data['attack']
+        pokemon.defense = data['defense']
+        pokemon.speed = data['speed']
+        pokemon.ko = data['ko']
+        return pokemon
+
+    @staticmethod
+    def deserialize(save_data, arenas=None, trusted=False):
+        """
+        Rebuild the player and restore the progression in the arenas
+
+        Saves of the current version marked as trusted (written by this
+        game) are not validated, which makes the resume of a game instant.
+
+        Args:
+            save_data (dict): Save data (any version)
+            arenas (list): Arenas of the game, updated in place with the saved progression
+            trusted (bool): Skip the validation of saves of the current version
+
+        Returns:
+            tuple: (player (Trainer), defeated_arenas (list of Arena))
+
+        Raises:
+            ValueError: If the save data is not valid
+        """
+        if not trusted or save_data.get('version') != GameSerializer.SCHEMA_VERSION:
+            save_data = GameSerializer.upgrade(save_data)
+            GameSerializer.validate(save_data)
+
+        player = Trainer(save_data['player_name'])
+        player.team = [GameSerializer.deserialize_pokemon(data) for data in save_data['team']]
+        active = save_data.get('active')
+        player.active_pokemon = player.team[active] if active is not None else None
+
+        arenas_by_name = {arena.name: arena for arena in arenas or []}
+        for arena_data in save_data['arenas']:
+            arena = arenas_by_name.get(arena_data['name'])
+            if arena is None:
+                continue
+
+            arena.defeated = arena_data['defeated']
+            arena.nb_attempts = arena_data['nb_attempts']
+            arena.nb_victories = arena_data['nb_victories']
+            for floor, defeated in zip(arena.floors, arena_data['floors']):
+                floor.defeated = defeated
+
+        defeated_arenas = [arenas_by_name[name] for name in save_data['defeated_arenas']
+                           if name in arenas_by_name]
+        return player, defeated_arenas
@@ -0,0 +1,93 @@
+"""
+utils/rng.py
+Random generators injected in fights and generators
+
+Every object drawing random numbers (FightingSystem, PokemonGenerator...)
+takes an rng argument. Any object with the methods of random.Random that
+the game uses (random, uniform, choice, randint) can be given, so a fight
+can be replayed from its seed, or run on a faster NumPy stream.
+"""
+
+import random
+
+try:
+    import numpy as np
+except ImportError:  # numpy is optional, only NumpyRandom needs it
+    np = None
+
+
+class NumpyRandom:
+    """
+    Random generator drawing blocks of floats from a NumPy Generator
+
+    Offers the methods of random.Random used by the game. The floats are
+    drawn by blocks, which is much faster than the random module for bulk
+    simulations. The stream is reproducible from its seed but differs from
+    the one of random.Random(seed).
+
+    Attributes:
+        generator (numpy.random.Generator): Source of the floats
+    """
+
+    def __init__(self, seed=None, block_size=4096):
+        """
+        Args:
+            seed (int): Seed of the stream, None for a random one
+            block_size (int): Number of floats drawn at once
+        """
+        if np is None:
+            raise ImportError("NumpyRandom requires numpy (pip install numpy)")
+
+        self.generator = np.random.default_rng(seed)
+        self._block_size = block_size
+        self._block = []
+
+    def random(self):
+        """Float in [0, 1)"""
+        if not self._block:
+            # Reversed so pop() returns the floats in the order they were drawn
+            self._block = self.generator.random(self._block_size).tolist()[::-1]
+        return self._block.pop()
+
+    def uniform(self, a, b):
+        """Float between a and b"""
+        return a + (b - a) * self.random()
+
+    def randint(self, a, b):
+        """Integer between a and b included"""
+        return a + int(self.random() * (b - a + 1))
+
+    def choice(self, seq):
+        """Random element of a non-empty sequence"""
+        return seq[int(self.random() * len(seq))]
+
+
+def make_rng(seed=None, use_numpy=False):
+    """
+    Create a random generator
+
+    Args:
+        seed (int): Seed of the stream, None for a random one
+        use_numpy (bool): Create a NumpyRandom instead of a random.Random
+
+    Returns:
+        random.Random or NumpyRandom: New independent generator
+    """
+    if use_numpy:
+        return NumpyRandom(seed)
+    return random.Random(seed)
+
+
+def spawn_seeds(seed, count):
+    """
+    Derive independent seeds from a master seed (one per fight, per worker...)
+
+    Args:
+        seed (int): Master seed, None for a random one
+        count (int): Number of seeds
+
+    Returns:
+        list: 64-bit seeds, always the same for the same master seed
+    """
+    seeder = random.Random(seed)
+    return [seeder.getrandbits(64) for _ in range(count)]
@@ -0,0 +1,292 @@
+"""
+utils/save_store.py
+Saves of many players in one SQLite database
+"""
+
+import json
+import os
+import sqlite3
+
+from utils.save_system import SaveSystem
+
+
+# Columns of a team member, in the order of the save data of SaveSystem
+POKEMON_COLUMNS = ('name', 'type', 'level', 'experience', 'hp_max', 'hp_actuals', 'attack', 'defense', 'speed',
+                   'ko')
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS players (
+    name TEXT PRIMARY KEY,
+    version INTEGER NOT NULL,
+    badges_count INTEGER NOT NULL,
+    defeated_arenas TEXT NOT NULL,
+    active INTEGER,
+    arenas TEXT NOT NULL,
+    timestamp TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS players_timestamp ON players (timestamp);
+CREATE TABLE IF NOT EXISTS team_members (
+    player_name TEXT NOT NULL REFERENCES players (name) ON DELETE CASCADE,
+    slot INTEGER NOT NULL,
+    name TEXT NOT NULL,
+    type TEXT NOT NULL,
+    level INTEGER NOT NULL,
+    experience INTEGER NOT NULL,
+    hp_max INTEGER NOT NULL,
+    hp_actuals INTEGER NOT NULL,
+    attack INTEGER NOT NULL,
+    defense INTEGER NOT NULL,
+    speed INTEGER NOT NULL,
+    ko INTEGER NOT NULL,
+    PRIMARY KEY (player_name, slot)
+) WITHOUT ROWID;
+"""
+
+_UPSERT_PLAYER = """
+INSERT INTO players (name, version, badges_count, defeated_arenas, active, arenas, timestamp)
+VALUES (?, ?, ?, ?, ?, ?, ?)
+ON CONFLICT (name) DO UPDATE SET
+    version = excluded.version,
+    badges_count = excluded.badges_count,
+    defeated_arenas = excluded.defeated_arenas,
+    active = excluded.active,
+    arenas = excluded.arenas,
+    timestamp = excluded.timestamp
+"""
+
+_INSERT_MEMBER = (f"INSERT INTO team_members (player_name, slot, {', '.join(POKEMON_COLUMNS)}) "
+                  f"VALUES ({', '.join('?' * (len(POKEMON_COLUMNS) + 2))})")
+
+_MEMBER_FIELDS = ', '.join('team_members.' + column for column in POKEMON_COLUMNS)
+
+
+class SaveStore:
+    """
+    Saves of many players, one row per player and per team member
+
+    The save data is the same dict as SaveSystem.load_game. The database
+    runs in WAL mode, so readers are never blocked by a save, and a batch of
+    saves is written in one transaction.
+
+    Attributes:
+        path (str): Path of the database
+    """
+
+    DEFAULT_FILE = os.path.join(SaveSystem.SAVE_DIR, "game_saves.db")
+
+    def __init__(self, path=DEFAULT_FILE):
+        """
+        Open (or create) a save database
+
+        Args:
+            path (str): Path of the database, ":memory:" for a temporary one
+        """
+        self.path = path
+
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        self._connection = sqlite3.connect(path)
+        self._connection.execute("PRAGMA journal_mode = WAL")
+        self._connection.execute("PRAGMA synchronous = NORMAL")
+        self._connection.execute("PRAGMA foreign_keys = ON")
+        self._connection.executescript(SCHEMA)
+
+    def close(self):
+        """Close the database"""
+        self._connection.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def save_data_many(self, saves):
+        """
+        Write save data of several players in one transaction
+
+        Args:
+            saves (iterable): Save data dicts (see SaveSystem.load_game)
+
+        Returns:
+            int: Number of players saved
+        """
+        players = []
+        members = []
+        for save_data in saves:
+            name = save_data['player_name']
+            players.append((name, save_data.get('version', 1), len(save_data['defeated_arenas']),
+                            json.dumps(save_data['defeated_arenas']), save_data.get('active'),
+                            json.dumps(save_data.get('arenas', [])), save_data['timestamp']))
+            for slot, pokemon in enumerate(save_data['team']):
+                members.append((name, slot) + tuple(pokemon[column] for column in POKEMON_COLUMNS))
+
+        with self._connection:
+            self._connection.executemany(_UPSERT_PLAYER, players)
+            self._connection.executemany("DELETE FROM team_members WHERE player_name = ?",
+                                         [(player[0],) for player in players])
+            self._connection.executemany(_INSERT_MEMBER, members)
+
+        return len(players)
+
+    def save_many(self, games):
+        """
+        Save several players in one transaction
+
+        Args:
+            games (iterable): Pairs (player, defeated_arenas) or triples (player, defeated_arenas, arenas)
+
+        Returns:
+            int: Number of players saved
+        """
+        return self.save_data_many(SaveSystem._build_save_data(*game) for game in games)
+
+    def save_game(self, player, defeated_arenas, arenas=None):
+        """
+        Save the progress of a player
+
+        Args:
+            player (Trainer): The player trainer
+            defeated_arenas (list): List of defeated arenas
+            arenas (list): All the arenas of the game (progression in the floors)
+
+        Returns:
+            bool: True if the game is saved
+        """
+        try:
+            self.save_many([(player, defeated_arenas, arenas)])
+            return True
+        except sqlite3.Error as e:
+            print(f"\n✗ Error saving game: {e}")
+            return False
+
+    def load_many(self, player_names=None):
+        """
+        Load the saves of several players
+
+        Args:
+            player_names (list): Names of the players, None for all the players
+
+        Returns:
+            dict: Save data by player name (players without save are missing)
+        """
+        if player_names is None:
+            players_query = "SELECT * FROM players"
+            members_query = f"SELECT player_name, {_MEMBER_FIELDS} FROM team_members ORDER BY player_name, slot"
+            parameters = ()
+        else:
+            # The names are passed as one JSON array: no temporary table to fill (and no write
+            # transaction left open), one index lookup per name
+            players_query = ("SELECT players.* FROM json_each(?) AS wanted "
+                             "CROSS JOIN players ON players.name = wanted.value")
+            members_query = (f"SELECT player_name, {_MEMBER_FIELDS} FROM json_each(?) AS wanted "
+                             f"CROSS JOIN team_members ON team_members.player_name = wanted.value "
+                             f"ORDER BY player_name, slot")
+            parameters = (json.dumps(list(dict.fromkeys(player_names))),)
+
+        # Both queries read the same snapshot of the database, and the read transaction
+        # is ended before returning so the next call sees the saves written since
+        self._connection.execute("BEGIN")
+        try:
+            player_rows = self._connection.execute(players_query, parameters).fetchall()
+            member_rows = self._connection.execute(members_query, parameters).fetchall()
+        finally:
+            self._connection.commit()
+
+        saves = {}
+        for name, version, badges_count, defeated_arenas, active, arenas, timestamp in player_rows:
+            saves[name] = {
+                'version': version,
+                'player_name': name,
+                'badges_count': badges_count,
+                'defeated_arenas': json.loads(defeated_arenas),
+                'team': [],
+                'active': active,
+                'arenas': json.loads(arenas),
+                'timestamp': timestamp
+            }
+
+        for row in member_rows:
+            pokemon = dict(zip(POKEMON_COLUMNS, row[1:]))
+            pokemon['ko'] = bool(pokemon['ko'])
+            saves[row[0]]['team'].append(pokemon)
+
+        return saves
+
+    def load_game(self, player_name):
+        """
+        Load the save of a player
+
+        Args:
+            player_name (str): Name of the player
+
+        Returns:
+            dict: Game data or None if no save found
+        """
+        save_data = self.load_many([player_name]).get(player_name)
+        if save_data is None:
+            print("No save file found.")
+            return None
+
+        print(f"\n✓ Save found!")
+        print(f"  Player: {save_data['player_name']}")
+        print(f"  Badges: {save_data['badges_count']}/3")
+        print(f"  Saved: {save_data['timestamp']}")
+        return save_data
+
+    def display_save_info(self, player_name):
+        """
+        Display information about the save of a player
+
+        Args:
+            player_name (str): Name of the player
+        """
+        save_data = self.load_many([player_name]).get(player_name)
+        if save_data is None:
+            print("\nNo save file found.")
+            return False
+
+        print(f"\n{'='*60}")
+        print(f"SAVE FILE INFORMATION")
+        print(f"{'='*60}")
+        print(f"Player: {save_data['player_name']}")
+        print(f"Badges: {save_data['badges_count']}/3")
+        print(f"Team Size: {len(save_data['team'])}")
+        print(f"Last Saved: {save_data['timestamp']}")
+        print(f"\nTeam:")
+        for i, pokemon in enumerate(save_data['team'], 1):
+            status = "KO" if pokemon['ko'] else f"{pokemon['hp_actuals']}/{pokemon['hp_max']} HP"
+            print(f"  {i}. {pokemon['name']} ({pokemon['type']}) Lvl.{pokemon['level']} - {status}")
+        print(f"{'='*60}\n")
+        return True
+
+    def list_saves(self, limit=None):
+        """
+        List the saves, most recent first (without the teams)
+
+        Args:
+            limit (int): Maximum number of saves, None for all
+
+        Returns:
+            list: Tuples (player_name, badges_count, timestamp)
+        """
+        query = "SELECT name, badges_count, timestamp FROM players ORDER BY timestamp DESC"
+        if limit is None:
+            return self._connection.execute(query).fetchall()
+        return self._connection.execute(query + " LIMIT ?", (limit,)).fetchall()
+
+    def delete_save(self, player_name):
+        """
+        Delete the save of a player
+
+        Args:
+            player_name (str): Name of the player
+
+        Returns:
+            bool: True if a save was deleted
+        """
+        with self._connection:
+            cursor = self._connection.execute("DELETE FROM players WHERE name = ?", (player_name,))
+        return cursor.rowcount > 0
@@ -1,59 +1,116 @@
 import json
 import os
-from datetime import datetime
+import tempfile
+import uuid
+
+from utils import snapshot_codec
+from utils.game_serializer import GameSerializer
 
 
 class SaveSystem:
-    """System for saving and loading game progress"""
-    
+    """
+    System for saving and loading game progress
+
+    The save is a full JSON snapshot (SAVE_FILE) plus a write-ahead journal
+    (JOURNAL_FILE) of the changes made since the snapshot. save_game writes a
+    new snapshot, autosave only appends the changes to the journal. The
+    snapshot is always replaced atomically (temporary file + rename), so a
+    crash never leaves a half-written save.
+
+    Every snapshot has a random identifier (snapshot_id) copied in each
+    journal entry written after it. A crash between the rename of a new
+    snapshot and the removal of the journal leaves entries of the previous
+    snapshot: they do not match the identifier and are dropped instead of
+    being applied twice.
+    """
+
     SAVE_DIR = "saves"
     SAVE_FILE = os.path.join(SAVE_DIR, "game_save.json")
-    
+    JOURNAL_FILE = os.path.join(SAVE_DIR, "game_save.journal")
+
+    # Number of journal entries before autosave compacts them in a new snapshot
+    COMPACT_THRESHOLD = 50
+
+    # State of the save after the last write (snapshot + journal)
+    _last_saved = None
+    _journal_entries = 0
+    _snapshot_id = None
+
     @staticmethod
     def ensure_save_directory():
         """Create the save directory if it doesn't exist"""
         if not os.path.exists(SaveSystem.SAVE_DIR):
             os.makedirs(SaveSystem.SAVE_DIR)
-    
+
     @staticmethod
-    def save_game(player, defeated_arenas):
+    def _build_save_data(player, defeated_arenas, arenas=None):
         """
-        Save the game progress to JSON
-        
+        Prepare the data to save
+
         Args:
             player (Trainer): The player trainer
             defeated_arenas (list): List of defeated arenas
+            arenas (list): All the arenas of the game (progression in the floors)
+
+        Returns:
+            dict: Data of the save (see GameSerializer.serialize)
+        """
+        return GameSerializer.serialize(player, defeated_arenas, arenas)
+
+    @staticmethod
+    def _atomic_write(path, content):
+        """
+        Replace a file atomically: write a temporary file, then rename it
+
+        Args:
+            path (str): File to replace
+            content (str or bytes): New content
         """
+        directory = os.path.dirname(path) or "."
+        fd, temp_path = tempfile.mkstemp(dir=directory, prefix=".tmp_")
+        try:
+            with os.fdopen(fd, 'wb' if isinstance(content, bytes) else 'w') as f:
+                f.write(content)
+                f.flush()
+                os.fsync(f.fileno())
+            # mkstemp creates the file readable by its owner only
+            os.chmod(temp_path, 0o644)
+            os.replace(temp_path, path)
+        except BaseException:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+            raise
+
+    @staticmethod
+    def _write_snapshot(save_data):
+        """Write a full snapshot with a new identifier and empty the journal"""
         SaveSystem.ensure_save_directory()
-        
-        # Prepare data to save
-        save_data = {
-            'player_name': player.name,
-            'badges_count': len(defeated_arenas),
-            'defeated_arenas': [arena.name for arena in defeated_arenas],
-            'team': [],
-            'timestamp': datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-        }
-        
-        # Save team data
-        for pokemon in player.team:
-            pokemon_data = {
-                'name': pokemon.name,
-                'type': pokemon.type_pokemon,
-                'level': pokemon.level,
-                'hp_max': pokemon.hp_max,
-                'hp_actuals': pokemon.hp_actuals,
-                'attack': pokemon.attack,
-                'defense': pokemon.defense,
-                'speed': pokemon.speed,
-                'ko': pokemon.ko
-            }
-            save_data['team'].append(pokemon_data)
-        
+        snapshot_id = uuid.uuid4().hex
+        SaveSystem._atomic_write(SaveSystem.SAVE_FILE, json.dumps(dict(save_data, snapshot_id=snapshot_id), indent=4))
+
+        # Entries left by a crash here belong to the previous snapshot and are dropped by _read_save
+        if os.path.exists(SaveSystem.JOURNAL_FILE):
+            os.remove(SaveSystem.JOURNAL_FILE)
+
+        SaveSystem._last_saved = save_data
+        SaveSystem._journal_entries = 0
+        SaveSystem._snapshot_id = snapshot_id
+
+    @staticmethod
+    def save_game(player, defeated_arenas, arenas=None):
+        """
+        Save the game progress to JSON
+
+        Args:
+            player (Trainer): The player trainer
+            defeated_arenas (list): List of defeated arenas
+            arenas (list): All the arenas of the game (progression in the floors)
+        """
+        save_data = SaveSystem._build_save_data(player, defeated_arenas, arenas)
+
         # Write to JSON file
         try:
-            with open(SaveSystem.SAVE_FILE, 'w') as f:
-                json.dump(save_data, f, indent=4)
+            SaveSystem._write_snapshot(save_data)
             print(f"\n✓ Game saved successfully!")
             print(f"  Location: {SaveSystem.SAVE_FILE}")
             print(f"  Badges: {save_data['badges_count']}/3")
@@ -61,22 +118,219 @@ class SaveSystem:
         except Exception as e:
             print(f"\n✗ Error saving game: {e}")
             return False
-    
+
+    @staticmethod
+    def save_snapshot(path, player, defeated_arenas, arenas=None, compression='zlib'):
+        """
+        Save the game progress in a binary snapshot (see utils.snapshot_codec)
+
+        Much smaller and faster than the JSON save, for frequent checkpoints.
+
+        Args:
+            path (str): File of the snapshot
+            player (Trainer): The player trainer
+            defeated_arenas (list): List of defeated arenas
+            arenas (list): All the arenas of the game (progression in the floors)
+            compression (str): None, 'zlib' or 'lzma'
+        """
+        save_data = SaveSystem._build_save_data(player, defeated_arenas, arenas)
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        SaveSystem._atomic_write(path, snapshot_codec.encode(save_data, compression))
+
+    @staticmethod
+    def load_snapshot(path):
+        """
+        Load a binary snapshot
+
+        Args:
+            path (str): File of the snapshot
+
+        Returns:
+            dict: Game data (same keys as load_game)
+
+        Raises:
+            ValueError: If the file is not a valid snapshot
+        """
+        with open(path, 'rb') as f:
+            return snapshot_codec.decode(f.read())
+
+    @staticmethod
+    def _diff(previous, current):
+        """
+        Compute the changes between two saves
+
+        Args:
+            previous (dict): Save data already written
+            current (dict): New save data
+
+        Returns:
+            list: Operations of the journal
+        """
+        operations = []
+
+        if current['player_name'] != previous['player_name']:
+            operations.append({'op': 'player', 'name': current['player_name']})
+
+        for arena_name in current['defeated_arenas']:
+            if arena_name not in previous['defeated_arenas']:
+                operations.append({'op': 'badge', 'arena': arena_name})
+
+        previous_team = previous['team']
+        for slot, pokemon in enumerate(current['team']):
+            if slot >= len(previous_team):
+                operations.append({'op': 'catch', 'pokemon': pokemon})
+                continue
+
+            changes = {field: value for field, value in pokemon.items() if previous_team[slot].get(field) != value}
+            if changes:
+                operations.append({'op': 'pokemon', 'slot': slot, 'changes': changes})
+
+        if len(current['team']) < len(previous_team):
+            operations.append({'op': 'release', 'size': len(current['team'])})
+
+        if current.get('active') != previous.get('active'):
+            operations.append({'op': 'active', 'slot': current.get('active')})
+
+        if current.get('arenas') != previous.get('arenas'):
+            operations.append({'op': 'arenas', 'arenas': current.get('arenas')})
+
+        return operations
+
+    @staticmethod
+    def _apply(save_data, entry):
+        """Apply a journal entry on save data (in place)"""
+        for operation in entry['ops']:
+            op = operation['op']
+            if op == 'player':
+                save_data['player_name'] = operation['name']
+            elif op == 'badge':
+                save_data['defeated_arenas'].append(operation['arena'])
+                save_data['badges_count'] = len(save_data['defeated_arenas'])
+            elif op == 'catch':
+                save_data['team'].append(operation['pokemon'])
+            elif op == 'pokemon':
+                save_data['team'][operation['slot']].update(operation['changes'])
+            elif op == 'release':
+                del save_data['team'][operation['size']:]
+            elif op == 'active':
+                save_data['active'] = operation['slot']
+            elif op == 'arenas':
+                save_data['arenas'] = operation['arenas']
+
+        save_data['timestamp'] = entry['timestamp']
+
+    @staticmethod
+    def autosave(player, defeated_arenas, arenas=None):
+        """
+        Save the changes since the last save in the journal
+
+        Only the differences (HP, KO, badges, new Pokemon...) are appended,
+        the journal is compacted in a new snapshot every COMPACT_THRESHOLD
+        entries. A save of another player is never diffed: a new snapshot
+        replaces it, so the caller must only autosave a game that owns the
+        save (see Game.autosave). Nothing is displayed.
+
+        Args:
+            player (Trainer): The player trainer
+            defeated_arenas (list): List of defeated arenas
+            arenas (list): All the arenas of the game (progression in the floors)
+
+        Returns:
+            bool: True if the progress is saved, False if the save cannot be
+                read or written
+        """
+        current = SaveSystem._build_save_data(player, defeated_arenas, arenas)
+
+        try:
+            previous = SaveSystem._last_saved
+            if previous is None and os.path.exists(SaveSystem.SAVE_FILE):
+                previous = SaveSystem._read_save()
+
+            if (previous is None or previous.get('version') != current['version']
+                    or previous.get('player_name') != current['player_name']
+                    or SaveSystem._journal_entries >= SaveSystem.COMPACT_THRESHOLD):
+                SaveSystem._write_snapshot(current)
+                return True
+
+            operations = SaveSystem._diff(previous, current)
+            if not operations:
+                return True
+
+            entry = {'snapshot_id': SaveSystem._snapshot_id, 'ops': operations, 'timestamp': current['timestamp']}
+            with open(SaveSystem.JOURNAL_FILE, 'a') as f:
+                f.write(json.dumps(entry, separators=(',', ':')) + "\n")
+                f.flush()
+                os.fsync(f.fileno())
+
+            SaveSystem._last_saved = current
+            SaveSystem._journal_entries += 1
+            return True
+        except (OSError, ValueError, KeyError):
+            # Unreadable save on disk (bad JSON, missing keys) or disk error
+            return False
+
+    @staticmethod
+    def _read_save():
+        """
+        Read the snapshot and replay the journal
+
+        A last journal line cut by a crash is ignored and removed from the
+        journal, so the next entries are not appended after it. Entries
+        written for another snapshot (left by a crash in _write_snapshot)
+        are removed the same way.
+
+        Returns:
+            dict: Game data, None if no save found
+        """
+        if not os.path.exists(SaveSystem.SAVE_FILE):
+            return None
+
+        with open(SaveSystem.SAVE_FILE, 'r') as f:
+            save_data = json.load(f)
+        # Saves written before the identifier have none, like their journal entries
+        snapshot_id = save_data.pop('snapshot_id', None)
+
+        entries = 0
+        if os.path.exists(SaveSystem.JOURNAL_FILE):
+            with open(SaveSystem.JOURNAL_FILE, 'rb+') as f:
+                valid_size = 0
+                for line in f:
+                    try:
+                        if not line.endswith(b"\n"):
+                            raise ValueError("Incomplete journal entry")
+                        entry = json.loads(line)
+                        if entry.get('snapshot_id') != snapshot_id:
+                            raise ValueError("Journal entry of another snapshot")
+                    except ValueError:
+                        f.truncate(valid_size)
+                        break
+                    SaveSystem._apply(save_data, entry)
+                    valid_size += len(line)
+                    entries += 1
+
+        SaveSystem._last_saved = json.loads(json.dumps(save_data))
+        SaveSystem._journal_entries = entries
+        SaveSystem._snapshot_id = snapshot_id
+        return save_data
+
     @staticmethod
     def load_game():
         """
         Load game progress from JSON
-        
+
+        The data is turned back into objects with GameSerializer.deserialize.
+
         Returns:
             dict: Game data or None if no save found
         """
         if not os.path.exists(SaveSystem.SAVE_FILE):
             print("No save file found.")
             return None
-        
+
         try:
-            with open(SaveSystem.SAVE_FILE, 'r') as f:
-                save_data = json.load(f)
+            save_data = SaveSystem._read_save()
             print(f"\n✓ Save found!")
             print(f"  Player: {save_data['player_name']}")
             print(f"  Badges: {save_data['badges_count']}/3")
@@ -85,18 +339,17 @@ class SaveSystem:
         except Exception as e:
             print(f"\n✗ Error loading game: {e}")
             return None
-    
+
     @staticmethod
     def display_save_info():
         """Display information about the current save"""
         if not os.path.exists(SaveSystem.SAVE_FILE):
             print("\nNo save file found.")
             return False
-        
+
         try:
-            with open(SaveSystem.SAVE_FILE, 'r') as f:
-                save_data = json.load(f)
-            
+            save_data = SaveSystem._read_save()
+
             print(f"\n{'='*60}")
             print(f"SAVE FILE INFORMATION")
             print(f"{'='*60}")
@@ -113,13 +366,18 @@ class SaveSystem:
         except Exception as e:
             print(f"\n✗ Error: {e}")
             return False
-    
+
     @staticmethod
     def delete_save():
         """Delete the save file"""
         if os.path.exists(SaveSystem.SAVE_FILE):
             try:
                 os.remove(SaveSystem.SAVE_FILE)
+                if os.path.exists(SaveSystem.JOURNAL_FILE):
+                    os.remove(SaveSystem.JOURNAL_FILE)
+                SaveSystem._last_saved = None
+                SaveSystem._journal_entries = 0
+                SaveSystem._snapshot_id = None
                 print("\n✓ Save file deleted.")
                 return True
             except Exception as e:
@@ -0,0 +1,333 @@
+"""
+utils/snapshot_codec.py
+Compact binary format of the save data, with a reader of the header alone
+
+A snapshot is a header followed by the body:
+
+    header: magic, codec version, compression, schema version, badges,
+            player name, timestamp, size of the body
+    body:   defeated arenas, active slot, team, arenas (compressed or not)
+
+Strings are stored as a length byte + UTF-8. The header is never
+compressed, so a list of saves only reads a few dozen bytes per file.
+"""
+
+import json
+import lzma
+import os
+import struct
+import time
+import zlib
+
+from my_package.models.type_chart import TYPE_NAMES, type_id
+
+
+MAGIC = b'PKSV'
+VERSION = 2
+
+# magic, codec version, compression, schema version, badges
+PREFIX = struct.Struct('<4sBBBB')
+BODY_SIZE = struct.Struct('<I')
+COUNT = struct.Struct('<B')
+# type id, level, experience, hp_max, hp_actuals, attack, defense, speed, ko
+POKEMON = struct.Struct('<BHIHHHHHB')
+# defeated, nb_attempts, nb_victories, number of floors, floors defeated (bits)
+ARENA = struct.Struct('<BIIBB')
+NO_ACTIVE = 255
+
+COMPRESSIONS = {None: 0, 'zlib': 1, 'lzma': 2}
+_COMPRESS = {1: zlib.compress, 2: lzma.compress}
+_DECOMPRESS = {1: zlib.decompress, 2: lzma.decompress}
+
+EXTENSION = ".pksv"
+
+
+def _pack_string(text):
+    raw = text.encode('utf-8')
+    if len(raw) > 255:
+        raise ValueError(f"String too long for a snapshot: {text[:20]!r}...")
+    return COUNT.pack(len(raw)) + raw
+
+
+class _Reader:
+    """Read the fields of a buffer one after the other"""
+
+    def __init__(self, data):
+        self.data = data
+        self.offset = 0
+
+    def read(self, size):
+        chunk = bytes(self.data[self.offset:self.offset + size])
+        self.offset += size
+        return chunk
+
+    def unpack(self, layout):
+        values = layout.unpack_from(self.data, self.offset)
+        self.offset += layout.size
+        return values
+
+    def string(self):
+        (size,) = self.unpack(COUNT)
+        return self.read(size).decode('utf-8')
+
+
+def encode(save_data, compression='zlib'):
+    """
+    Encode save data in a binary snapshot
+
+    Args:
+        save_data (dict): Save data (see GameSerializer.serialize)
+        compression (str): None, 'zlib' or 'lzma'
+
+    Returns:
+        bytes: The snapshot
+
+    Raises:
+        ValueError: If the compression is unknown or a value does not fit the format
+    """
+    if compression not in COMPRESSIONS:
+        raise ValueError(f"Unknown compression {compression!r}")
+    method = COMPRESSIONS[compression]
+
+    try:
+        body = bytearray()
+        body += COUNT.pack(len(save_data['defeated_arenas']))
+        for name in save_data['defeated_arenas']:
+            body += _pack_string(name)
+
+        active = save_data.get('active')
+        body += COUNT.pack(NO_ACTIVE if active is None else active)
+
+        body += COUNT.pack(len(save_data['team']))
+        for pokemon in save_data['team']:
+            body += _pack_string(pokemon['name'])
+            body += POKEMON.pack(type_id(pokemon['type']), pokemon['level'], pokemon['experience'],
+                                 pokemon['hp_max'], pokemon['hp_actuals'], pokemon['attack'], pokemon['defense'],
+                                 pokemon['speed'], pokemon['ko'])
+
+        arenas = save_data.get('arenas', [])
+        body += COUNT.pack(len(arenas))
+        for arena in arenas:
+            floors = 0
+            for number, defeated in enumerate(arena['floors']):
+                floors |= defeated << number
+            body += _pack_string(arena['name'])
+            body += ARENA.pack(arena['defeated'], arena['nb_attempts'], arena['nb_victories'],
+                               len(arena['floors']), floors)
+    except struct.error as e:
+        raise ValueError(f"Value out of the range of the snapshot format: {e}") from e
+
+    if method:
+        body = _COMPRESS[method](bytes(body))
+
+    header = (PREFIX.pack(MAGIC, VERSION, method, save_data.get('version', 1), len(save_data['defeated_arenas']))
+              + _pack_string(save_data['player_name'])
+              + _pack_string(save_data['timestamp'])
+              + BODY_SIZE.pack(len(body)))
+    return header + body
+
+
+def _read_header(read):
+    """Read the header with a read(size) function, return the header dict"""
+    raw = read(PREFIX.size)
+    if len(raw) != PREFIX.size:
+        raise ValueError("Not a snapshot: file too short")
+
+    magic, version, method, schema_version, badges_count = PREFIX.unpack(raw)
+    if magic != MAGIC:
+        raise ValueError("Not a snapshot: bad magic")
+    if version != VERSION:
+        raise ValueError(f"Unsupported snapshot version {version}")
+    if method not in COMPRESSIONS.values():
+        raise ValueError(f"Unknown compression method {method}")
+
+    strings = []
+    try:
+        for _ in range(2):
+            (size,) = COUNT.unpack(read(COUNT.size))
+            strings.append(read(size).decode('utf-8'))
+        (body_size,) = BODY_SIZE.unpack(read(BODY_SIZE.size))
+    except struct.error as e:
+        raise ValueError(f"Not a snapshot: header cut ({e})") from e
+
+    return {
+        'version': schema_version,
+        'player_name': strings[0],
+        'badges_count': badges_count,
+        'timestamp': strings[1],
+        'compression': method,
+        'body_size': body_size,
+        'codec_version': version
+    }
+
+
+def read_header(f):
+    """
+    Read only the header of a snapshot (the team is not decoded)
+
+    Args:
+        f (file): Binary file positioned at the start of the snapshot
+
+    Returns:
+        dict: version, player_name, badges_count, timestamp, compression, body_size, codec_version
+
+    Raises:
+        ValueError: If the file does not start with a valid header
+    """
+    return _read_header(f.read)
+
+
+def decode(data):
+    """
+    Decode a binary snapshot
+
+    Args:
+        data (bytes): The snapshot
+
+    Returns:
+        dict: Save data (same keys as GameSerializer.serialize)
+
+    Raises:
+        ValueError: If the data is not a valid snapshot (bad header, truncated or corrupted body)
+    """
+    try:
+        return _decode(data)
+    except (zlib.error, lzma.LZMAError, struct.error, IndexError) as e:
+        raise ValueError(f"Corrupted snapshot: {e}") from e
+
+
+def _decode(data):
+    """Decode a snapshot, the errors of decompression and of the body are raised as they are"""
+    view = memoryview(data)
+    header_reader = _Reader(view)
+    header = _read_header(header_reader.read)
+    body = view[header_reader.offset:header_reader.offset + header['body_size']]
+    if len(body) != header['body_size']:
+        raise ValueError("Truncated snapshot")
+    if header['compression']:
+        body = _DECOMPRESS[header['compression']](body)
+
+    reader = _Reader(body)
+    defeated_arenas = [reader.string() for _ in range(reader.unpack(COUNT)[0])]
+    (active,) = reader.unpack(COUNT)
+
+    team = []
+    for _ in range(reader.unpack(COUNT)[0]):
+        name = reader.string()
+        type_index, level, experience, hp_max, hp_actuals, attack, defense, speed, ko = reader.unpack(POKEMON)
+        team.append({
+            'name': name,
+            'type': TYPE_NAMES[type_index],
+            'level': level,
+            'experience': experience,
+            'hp_max': hp_max,
+            'hp_actuals': hp_actuals,
+            'attack': attack,
+            'defense': defense,
+            'speed': speed,
+            'ko': bool(ko)
+        })
+
+    arenas = []
+    for _ in range(reader.unpack(COUNT)[0]):
+        name = reader.string()
+        defeated, nb_attempts, nb_victories, nb_floors, floors = reader.unpack(ARENA)
+        arenas.append({
+            'name': name,
+            'defeated': bool(defeated),
+            'nb_attempts': nb_attempts,
+            'nb_victories': nb_victories,
+            'floors': [bool(floors >> number & 1) for number in range(nb_floors)]
+        })
+
+    return {
+        'version': header['version'],
+        'player_name': header['player_name'],
+        'badges_count': header['badges_count'],
+        'defeated_arenas': defeated_arenas,
+        'team': team,
+        'active': None if active == NO_ACTIVE else active,
+        'arenas': arenas,
+        'timestamp': header['timestamp']
+    }
+
+
+def list_snapshots(directory):
+    """
+    Read the header of every snapshot of a directory
+
+    Args:
+        directory (str): Directory of the snapshots
+
+    Returns:
+        list: Tuples (path, header), most recent save first
+    """
+    snapshots = []
+    if not os.path.isdir(directory):
+        return snapshots
+
+    for entry in os.scandir(directory):
+        if not entry.name.endswith(EXTENSION):
+            continue
+        try:
+            with open(entry.path, 'rb') as f:
+                snapshots.append((entry.path, read_header(f)))
+        except (OSError, ValueError):
+            continue
+
+    snapshots.sort(key=lambda snapshot: snapshot[1]['timestamp'], reverse=True)
+    return snapshots
+
+
+def benchmark(save_data, repeat=2000):
+    """
+    Compare the size and speed of the JSON save and of the binary snapshots
+
+    Args:
+        save_data (dict): Save data to encode
+        repeat (int): Number of encodings/decodings timed
+
+    Returns:
+        list: Tuples (format, size in bytes, encode µs, decode µs, header µs)
+    """
+    formats = [('json indent=4', lambda: json.dumps(save_data, indent=4).encode('utf-8'),
+                lambda data: json.loads(data), lambda data: json.loads(data)['player_name'])]
+    for compression in COMPRESSIONS:
+        formats.append((f"binary {compression or 'raw'}",
+                        lambda compression=compression: encode(save_data, compression),
+                        decode, lambda data: _read_header(_Reader(data).read)))
+
+    results = []
+    for name, encoder, decoder, header_reader in formats:
+        data = encoder()
+        timings = []
+        for function, argument in ((encoder, ()), (decoder, (data,)), (header_reader, (data,))):
+            start = time.perf_counter()
+            for _ in range(repeat):
+                function(*argument)
+            timings.append((time.perf_counter() - start) / repeat * 1e6)
+        results.append((name, len(data)) + tuple(timings))
+    return results
+
+
+def main():
+    """Benchmark the snapshot codec on a full team"""
+    from main import Game
+    from my_package.models.pokemon import PokemonGenerator
+    from my_package.models.trainer import Trainer
+    from utils.game_serializer import GameSerializer
+
+    game = Game()
+    game.create_arenas()
+    player = Trainer("Sacha")
+    while len(player.team) < 6:
+        player.add_pokemon(PokemonGenerator.generate_wild_pokemon(5, game.rng))
+    save_data = GameSerializer.serialize(player, game.arenas[:1], game.arenas)
+
+    print(f"{'format':<16}{'bytes':>8}{'encode µs':>12}{'decode µs':>12}{'header µs':>12}")
+    for name, size, encode_time, decode_time, header_time in benchmark(save_data):
+        print(f"{name:<16}{size:>8}{encode_time:>12.1f}{decode_time:>12.1f}{header_time:>12.1f}")
+
+
+if __name__ == "__main__":
+    main()